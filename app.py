@@ -1,11 +1,28 @@
 from flask import Flask
+from flask.json.provider import DefaultJSONProvider
 from routes.formulario import formulario_bp
 from routes.api import api_bp
 from routes.dashboard import dashboard_bp
 from routes.auth import auth_bp
+from utils.blob_sob_demanda import BlobSobDemanda
+from utils.duplicatas import carregar_em_segundo_plano as carregar_indice_duplicatas
+from utils.bloom import carregar_em_segundo_plano as carregar_filtro_usuarios
+from utils.autocompletar import carregar_em_segundo_plano as carregar_autocompletar
+from utils.cache import iniciar_escopo_requisicao, encerrar_escopo_requisicao
+from utils.compressao import MiddlewareCompressao
 import os
 
+class JSONProviderSAOS(DefaultJSONProvider):
+    """Serializa os BLOBs lidos sob demanda pelos models como texto (objetos JSON decodificados)"""
+    
+    @staticmethod
+    def default(o):
+        if isinstance(o, BlobSobDemanda):
+            return o.valor_json()
+        return DefaultJSONProvider.default(o)
+
 app = Flask(__name__)
+app.json = JSONProviderSAOS(app)
 app.secret_key = 'segredo'
 app.config['UPLOAD_FOLDER'] = 'uploads'
 
@@ -13,16 +30,31 @@ app.config['UPLOAD_FOLDER'] = 'uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
 app.config['JSON_AS_ASCII'] = False  # Suporte a caracteres especiais no JSON
 
+# Compressão gzip/brotli das respostas e estáticos pré-comprimidos (scripts/precomprimir_estaticos.py)
+app.wsgi_app = MiddlewareCompressao(app.wsgi_app, app.static_folder, app.static_url_path + '/')
+
 # Registra os blueprints
 app.register_blueprint(formulario_bp)
 app.register_blueprint(api_bp)
 app.register_blueprint(dashboard_bp)
 app.register_blueprint(auth_bp)
 
+# Registros lidos por ID valem para toda a requisição (mapa de identidade dos models)
+app.before_request(iniciar_escopo_requisicao)
+
+@app.teardown_request
+def encerrar_escopo(exc):
+    encerrar_escopo_requisicao()
+
 # Cria diretórios necessários
 os.makedirs('uploads', exist_ok=True)
 os.makedirs('logs', exist_ok=True)
 
+# Estruturas em memória: duplicatas na abertura, filtro de emails/CPF cadastrados e autocompletar
+carregar_indice_duplicatas()
+carregar_filtro_usuarios()
+carregar_autocompletar()
+
 if __name__ == '__main__':
     app.run(debug=True, port=5001, host='0.0.0.0')
 
@@ -0,0 +1,227 @@
+"""
+Configurações da aplicação SAOS
+
+Os valores podem ser sobrescritos por variáveis de ambiente.
+"""
+
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# =====================================================
+# BASE ANALÍTICA (SNAPSHOT PARA RELATÓRIOS)
+# =====================================================
+
+# Arquivo SQLite local que recebe o snapshot incremental do Firebird
+BASE_ANALITICA = os.environ.get('SAOS_BASE_ANALITICA', os.path.join(BASE_DIR, 'database', 'analitico.sqlite3'))
+
+# Fonte padrão dos relatórios: 'analitico' (snapshot local) ou 'oltp' (Firebird)
+FONTE_RELATORIOS = os.environ.get('SAOS_FONTE_RELATORIOS', 'analitico')
+
+# Intervalo entre snapshots quando o exportador roda continuamente
+SNAPSHOT_INTERVALO_SEGUNDOS = int(os.environ.get('SAOS_SNAPSHOT_INTERVALO', '900'))
+
+# Folga relida a cada ciclo atrás da marca d'água: linhas de transações confirmadas depois
+# de outras mais novas (DTHR_ATUALIZACAO é o início da transação; IDs são gerados antes do commit)
+SNAPSHOT_MARGEM_SEGUNDOS = int(os.environ.get('SAOS_SNAPSHOT_MARGEM_SEGUNDOS', '300'))
+SNAPSHOT_MARGEM_IDS = int(os.environ.get('SAOS_SNAPSHOT_MARGEM_IDS', '1000'))
+
+# =====================================================
+# MANUTENÇÃO DO BANCO (ESTATÍSTICAS E SWEEP)
+# =====================================================
+
+# Dispara sweep quando OST - OIT ultrapassar este número de transações
+MANUTENCAO_LIMITE_GAP_TRANSACOES = int(os.environ.get('SAOS_LIMITE_GAP_TRANSACOES', '20000'))
+
+# Dispara sweep quando esta fração das leituras de uma tabela cair em versões antigas
+MANUTENCAO_LIMITE_PROPORCAO_VERSOES = float(os.environ.get('SAOS_LIMITE_PROPORCAO_VERSOES', '0.2'))
+
+# Intervalo entre execuções quando a manutenção roda continuamente
+MANUTENCAO_INTERVALO_SEGUNDOS = int(os.environ.get('SAOS_MANUTENCAO_INTERVALO', '86400'))
+
+# =====================================================
+# ARQUIVAMENTO DE SOLICITAÇÕES FINALIZADAS
+# =====================================================
+
+# Solicitações fechadas/canceladas sem alteração há mais dias que isto vão para o arquivo
+ARQUIVAMENTO_DIAS = int(os.environ.get('SAOS_ARQUIVAMENTO_DIAS', '180'))
+
+# Solicitações movidas por transação
+ARQUIVAMENTO_TAMANHO_LOTE = int(os.environ.get('SAOS_ARQUIVAMENTO_LOTE', '500'))
+
+# =====================================================
+# COMPRESSÃO DE COLUNAS BLOB
+# =====================================================
+
+# Valores menores que isto são gravados sem compressão
+COMPRESSAO_BLOB_LIMITE_BYTES = int(os.environ.get('SAOS_COMPRESSAO_LIMITE', '512'))
+
+# 'zstd' (requer o pacote zstandard; sem ele usa zlib) ou 'zlib'
+COMPRESSAO_BLOB_ALGORITMO = os.environ.get('SAOS_COMPRESSAO_ALGORITMO', 'zlib')
+
+# Nível de compressão (zlib aceita até 9)
+COMPRESSAO_BLOB_NIVEL = int(os.environ.get('SAOS_COMPRESSAO_NIVEL', '6'))
+
+# =====================================================
+# COMPRESSÃO DAS RESPOSTAS HTTP
+# =====================================================
+
+# Respostas menores que isto vão sem compressão (streaming é sempre comprimido)
+COMPRESSAO_HTTP_LIMITE_BYTES = int(os.environ.get('SAOS_COMPRESSAO_HTTP_LIMITE', '1024'))
+
+# Nível gzip por resposta (1-9; os estáticos pré-comprimidos usam 9)
+COMPRESSAO_HTTP_NIVEL_GZIP = int(os.environ.get('SAOS_COMPRESSAO_HTTP_GZIP', '6'))
+
+# Qualidade brotli por resposta (0-11; requer o pacote brotli; os estáticos usam 11)
+COMPRESSAO_HTTP_QUALIDADE_BROTLI = int(os.environ.get('SAOS_COMPRESSAO_HTTP_BROTLI', '5'))
+
+# Cache-Control max-age dos estáticos pré-comprimidos; 0 = revalidar sempre (ETag/Last-Modified, 304).
+# As URLs de static/ não têm versão: com max-age, um deploy pode manter o JS antigo no navegador
+COMPRESSAO_HTTP_CACHE_ESTATICOS = int(os.environ.get('SAOS_COMPRESSAO_HTTP_CACHE', '0'))
+
+# =====================================================
+# HISTÓRICO (GRAVAÇÃO EM SEGUNDO PLANO)
+# =====================================================
+
+# Desative ('0') para gravar cada entrada de histórico na hora
+AUDITORIA_BUFFER_ATIVO = os.environ.get('SAOS_AUDITORIA_BUFFER', '1') == '1'
+
+# O buffer é gravado a cada N milissegundos ou ao atingir M entradas
+AUDITORIA_INTERVALO_MS = int(os.environ.get('SAOS_AUDITORIA_INTERVALO_MS', '500'))
+AUDITORIA_MAX_LINHAS = int(os.environ.get('SAOS_AUDITORIA_MAX_LINHAS', '200'))
+
+# Pasta do spool local (entradas ainda não gravadas no banco)
+AUDITORIA_DIR_SPOOL = os.environ.get('SAOS_AUDITORIA_SPOOL', os.path.join(BASE_DIR, 'logs', 'auditoria'))
+
+# =====================================================
+# CONTADORES E ÚLTIMO ACESSO (GRAVAÇÃO AGREGADA)
+# =====================================================
+
+# Intervalo entre as gravações dos contadores acumulados em memória
+CONTADORES_INTERVALO_SEGUNDOS = float(os.environ.get('SAOS_CONTADORES_INTERVALO', '5'))
+
+# =====================================================
+# BUSCA TEXTUAL
+# =====================================================
+
+# Índice invertido local (SQLite FTS5) das solicitações e comentários
+BASE_BUSCA = os.environ.get('SAOS_BASE_BUSCA', os.path.join(BASE_DIR, 'database', 'busca.sqlite3'))
+
+# Intervalo da sincronização incremental quando o indexador roda continuamente
+BUSCA_INTERVALO_SEGUNDOS = int(os.environ.get('SAOS_BUSCA_INTERVALO', '60'))
+
+# =====================================================
+# BASE DE CONHECIMENTO
+# =====================================================
+
+# Consultas mantidas no cache LRU de buscas da base de conhecimento (por processo)
+KB_CACHE_TAMANHO = int(os.environ.get('SAOS_KB_CACHE_TAMANHO', '500'))
+
+# Validade de uma consulta em cache; limita o atraso para alterações feitas por outro processo
+KB_CACHE_TTL_SEGUNDOS = int(os.environ.get('SAOS_KB_CACHE_TTL', '300'))
+
+# =====================================================
+# DETECÇÃO DE DUPLICATAS
+# =====================================================
+
+# Similaridade estimada (Jaccard via MinHash) a partir da qual uma solicitação aberta é sugerida
+DUPLICATAS_LIMIAR = float(os.environ.get('SAOS_DUPLICATAS_LIMIAR', '0.5'))
+
+# Intervalo mínimo entre sincronizações do índice em memória com o banco
+DUPLICATAS_INTERVALO_SEGUNDOS = int(os.environ.get('SAOS_DUPLICATAS_INTERVALO', '30'))
+
+# Folga relida a cada sincronização: DTHR_ATUALIZACAO é a do início da transação,
+# então uma alteração confirmada depois da marca pode ter data anterior a ela
+DUPLICATAS_MARGEM_SEGUNDOS = int(os.environ.get('SAOS_DUPLICATAS_MARGEM_SEGUNDOS', '300'))
+
+# =====================================================
+# AUTOCOMPLETAR
+# =====================================================
+
+# Recarga completa dos índices de prefixo (SISTEMA, MODULO, usuários) a partir do banco
+AUTOCOMPLETAR_INTERVALO_SEGUNDOS = int(os.environ.get('SAOS_AUTOCOMPLETAR_INTERVALO', '300'))
+
+# =====================================================
+# FILTRO DE BLOOM DE USUÁRIOS (EMAIL E CPF/CNPJ)
+# =====================================================
+
+# Taxa de falsos positivos desejada (um falso positivo só custa a consulta ao banco)
+BLOOM_TAXA_FALSOS_POSITIVOS = float(os.environ.get('SAOS_BLOOM_TAXA_FP', '0.01'))
+
+# Capacidade mínima dos filtros (o dobro dos usuários existentes, se maior)
+BLOOM_CAPACIDADE_MINIMA = int(os.environ.get('SAOS_BLOOM_CAPACIDADE', '10000'))
+
+# Busca dos usuários criados por outros processos (por ID)
+BLOOM_SINCRONIZACAO_SEGUNDOS = int(os.environ.get('SAOS_BLOOM_SINCRONIZACAO', '5'))
+
+# IDs abaixo do último visto relidos a cada sincronização (IDs gerados antes do commit de outro cadastro)
+BLOOM_JANELA_IDS = int(os.environ.get('SAOS_BLOOM_JANELA_IDS', '100'))
+
+# Reconstrução completa (reflete emails/CPF alterados por outros processos)
+BLOOM_RECONSTRUCAO_SEGUNDOS = int(os.environ.get('SAOS_BLOOM_RECONSTRUCAO', '600'))
+
+# =====================================================
+# CACHE DE RESPOSTAS DA API
+# =====================================================
+
+# Validade das listas de categorias, prioridades e status (raramente alteradas)
+CACHE_RESPOSTAS_TTL_CADASTROS = int(os.environ.get('SAOS_CACHE_TTL_CADASTROS', '300'))
+
+# Validade do dashboard e das listas de urgentes/vencidas
+CACHE_RESPOSTAS_TTL_PAINEL = int(os.environ.get('SAOS_CACHE_TTL_PAINEL', '30'))
+
+# Por quanto tempo após vencer uma resposta ainda pode ser servida se o banco falhar ou
+# enquanto outra requisição a recalcula
+CACHE_RESPOSTAS_VENCIDA_SEGUNDOS = int(os.environ.get('SAOS_CACHE_VENCIDA', '120'))
+
+# Espera máxima pelo cálculo em andamento da mesma resposta antes de calcular de novo
+CACHE_RESPOSTAS_ESPERA_SEGUNDOS = float(os.environ.get('SAOS_CACHE_ESPERA', '10'))
+
+# Respostas mantidas por processo (as menos usadas saem primeiro)
+CACHE_RESPOSTAS_MAX_ITENS = int(os.environ.get('SAOS_CACHE_MAX_ITENS', '1000'))
+
+# =====================================================
+# MAPA DE IDENTIDADE (get_by_id)
+# =====================================================
+
+# Solicitações mantidas no mapa de identidade de get_by_id (por processo)
+IDENTIDADE_CACHE_TAMANHO = int(os.environ.get('SAOS_IDENTIDADE_TAMANHO', '2000'))
+
+# Validade de uma solicitação no mapa; limita o atraso para alterações feitas por outro processo
+IDENTIDADE_CACHE_TTL_SEGUNDOS = int(os.environ.get('SAOS_IDENTIDADE_TTL', '30'))
+
+# =====================================================
+# ATUALIZAÇÃO DE STATUS EM LOTE
+# =====================================================
+
+# Solicitações aceitas por chamada a PUT /api/v1/solicitacoes/status
+STATUS_LOTE_MAXIMO = int(os.environ.get('SAOS_STATUS_LOTE_MAXIMO', '500'))
+
+# Espera máxima, no encerramento do processo, pelo envio dos emails ainda na fila
+NOTIFICACOES_ESPERA_ENCERRAMENTO = int(os.environ.get('SAOS_NOTIFICACOES_ESPERA', '30'))
+
+# =====================================================
+# IMPORTAÇÃO DE SOLICITAÇÕES EM LOTE
+# =====================================================
+
+# Linhas gravadas por transação (executemany + histórico + commit)
+IMPORTACAO_TAMANHO_LOTE = int(os.environ.get('SAOS_IMPORTACAO_TAMANHO_LOTE', '500'))
+
+# Linhas rejeitadas detalhadas na saída (as demais são apenas contadas)
+IMPORTACAO_MAXIMO_ERROS = int(os.environ.get('SAOS_IMPORTACAO_MAXIMO_ERROS', '1000'))
+
+# Clientes/técnicos mantidos em memória durante uma importação (por ID e por email)
+IMPORTACAO_CACHE_USUARIOS = int(os.environ.get('SAOS_IMPORTACAO_CACHE_USUARIOS', '20000'))
+
+# =====================================================
+# SINCRONIZAÇÃO INCREMENTAL (GET /solicitacoes/mudancas)
+# =====================================================
+
+# Alterações mais recentes que isto ficam para a próxima consulta (transações ainda não confirmadas)
+MUDANCAS_MARGEM_SEGUNDOS = int(os.environ.get('SAOS_MUDANCAS_MARGEM_SEGUNDOS', '5'))
+
+# Solicitações (e exclusões) por resposta; o restante vem nas chamadas seguintes
+MUDANCAS_LIMITE = int(os.environ.get('SAOS_MUDANCAS_LIMITE', '500'))
+
+# Dias em que as exclusões ficam disponíveis; tokens mais antigos exigem sincronização completa
+MUDANCAS_RETENCAO_DIAS = int(os.environ.get('SAOS_MUDANCAS_RETENCAO_DIAS', '30'))
@@ -0,0 +1,27 @@
+from contextlib import contextmanager
+import sqlite3
+import os
+import config
+
+@contextmanager
+def analitico_connection():
+    """Abre a base analítica local (SQLite) alimentada pelo snapshot"""
+    pasta = os.path.dirname(config.BASE_ANALITICA)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    
+    con = sqlite3.connect(config.BASE_ANALITICA)
+    try:
+        yield con
+    finally:
+        con.close()
+
+def base_analitica_disponivel():
+    """Indica se o snapshot já foi gerado ao menos uma vez"""
+    if not os.path.exists(config.BASE_ANALITICA):
+        return False
+    
+    with analitico_connection() as con:
+        cur = con.cursor()
+        cur.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'table' AND name = 'MARCAS_SNAPSHOT'")
+        return cur.fetchone()[0] > 0
@@ -0,0 +1,19 @@
+from contextlib import contextmanager
+import sqlite3
+import os
+import config
+
+@contextmanager
+def busca_connection():
+    """Abre o índice de busca textual local (SQLite FTS5)"""
+    pasta = os.path.dirname(config.BASE_BUSCA)
+    if pasta:
+        os.makedirs(pasta, exist_ok=True)
+    
+    # WAL permite leituras durante a indexação feita por outros processos
+    con = sqlite3.connect(config.BASE_BUSCA, timeout=10)
+    con.execute("PRAGMA journal_mode=WAL")
+    try:
+        yield con
+    finally:
+        con.close()
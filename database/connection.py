@@ -1,13 +1,28 @@
 from contextlib import contextmanager
+from contextvars import ContextVar
 import firebird.driver as fbd
 
+# Servidor/arquivo do banco (servidor:caminho) e credenciais
+DSN = r'nayhan/3052:C:\Users\Nayhan.MEDWARE\Documents\PROJETOS AZURE\11 -AZURE - SISTEMA DE ABERTURA DE OS\SAOS\database\SAOS.FDB'
+USUARIO = 'SYSDBA'
+SENHA = 'masterkey'
+
+# Conexão usada por todos os db_connection() do contexto atual (ver conexao_compartilhada)
+_conexao_compartilhada = ContextVar('conexao_compartilhada', default=None)
+
 @contextmanager
-def db_connection():
+def db_connection(compartilhada=True):
+    """Conexão com o banco; compartilhada=False ignora a conexão de conexao_compartilhada (gravações)"""
+    compartilhada = _conexao_compartilhada.get() if compartilhada else None
+    if compartilhada is not None:
+        yield compartilhada
+        return
+    
     try:
         con = fbd.connect(
-            r'nayhan/3052:C:\Users\Nayhan.MEDWARE\Documents\PROJETOS AZURE\11 -AZURE - SISTEMA DE ABERTURA DE OS\SAOS\database\SAOS.FDB',
-            user='SYSDBA',
-            password='masterkey',
+            DSN,
+            user=USUARIO,
+            password=SENHA,
             charset='UTF8'
            
         )
@@ -21,4 +36,43 @@ def db_connection():
             con.close()
             print("Conexão com o banco de dados encerrada.")
         except:
-            pass
\ No newline at end of file
+            pass
+
+@contextmanager
+def db_snapshot():
+    """Abre uma transação SNAPSHOT somente leitura (visão consistente do banco)
+
+    Útil para leituras longas (exportações, relatórios) que precisam enxergar
+    o banco em um único instante sem bloquear as escritas concorrentes.
+    """
+    with db_connection() as con:
+        tra = con.transaction_manager(fbd.tpb(fbd.Isolation.SNAPSHOT, access_mode=fbd.TraAccessMode.READ))
+        tra.begin()
+        try:
+            yield tra
+        finally:
+            try:
+                tra.rollback()
+                tra.close()
+            except:
+                pass
+
+@contextmanager
+def conexao_compartilhada():
+    """Faz os db_connection() do contexto usarem uma única conexão, em transação SNAPSHOT somente leitura
+
+    Usado para executar várias consultas (ex.: as subrequisições de POST /batch)
+    com uma conexão e uma visão consistente do banco. Gravações nesse contexto falham;
+    quem precisa gravar (ex.: o buffer do histórico) usa db_connection(compartilhada=False).
+    """
+    with db_connection() as con:
+        con.main_transaction.default_tpb = fbd.tpb(fbd.Isolation.SNAPSHOT, access_mode=fbd.TraAccessMode.READ)
+        token = _conexao_compartilhada.set(con)
+        try:
+            yield con
+        finally:
+            _conexao_compartilhada.reset(token)
+            try:
+                con.rollback()
+            except:
+                pass
@@ -180,12 +180,103 @@ CREATE TABLE KNOWLEDGE_BASE (
     ID_AUTOR INTEGER NOT NULL,
     VISUALIZACOES INTEGER DEFAULT 0,
     AVALIACAO_MEDIA DECIMAL(3,2) DEFAULT 0,
+    TOTAL_AVALIACOES INTEGER DEFAULT 0, -- base para recalcular AVALIACAO_MEDIA
     ATIVO BOOLEAN DEFAULT TRUE,
     DTHR_CRIACAO TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     DTHR_ATUALIZACAO TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (ID_AUTOR) REFERENCES USUARIOS(ID)
 );
 
+-- Índice normalizado das tags (KNOWLEDGE_BASE.TAGS continua com o JSON original)
+CREATE TABLE KNOWLEDGE_BASE_TAGS (
+    TAG VARCHAR(50) NOT NULL, -- minúsculas, sem acentos
+    ID_ARTIGO INTEGER NOT NULL,
+    PRIMARY KEY (TAG, ID_ARTIGO),
+    FOREIGN KEY (ID_ARTIGO) REFERENCES KNOWLEDGE_BASE(ID) ON DELETE CASCADE
+);
+
+-- =====================================================
+-- TABELAS DE ARQUIVO (SOLICITAÇÕES FINALIZADAS)
+-- =====================================================
+-- Mesmas colunas das tabelas principais, sem identidade nem chaves
+-- estrangeiras. Recebem as solicitações fechadas/canceladas antigas
+-- (scripts/arquivar_solicitacoes.py) junto com histórico, comentários
+-- e metadados de anexos.
+
+CREATE TABLE SOLICITACOES_ARQUIVO (
+    ID INTEGER NOT NULL PRIMARY KEY,
+    CODIGO_REFERENCIA VARCHAR(20) NOT NULL,
+    TITULO VARCHAR(200) NOT NULL,
+    DESCRICAO TEXT NOT NULL,
+    ID_CLIENTE INTEGER NOT NULL,
+    ID_CATEGORIA INTEGER NOT NULL,
+    ID_PRIORIDADE INTEGER NOT NULL,
+    ID_STATUS INTEGER NOT NULL,
+    ID_TECNICO_RESPONSAVEL INTEGER,
+    ID_TECNICO_CRIADOR INTEGER,
+    SISTEMA VARCHAR(100),
+    MODULO VARCHAR(100),
+    PRAZO_RESOLUCAO TIMESTAMP,
+    PRAZO_ESCALONAMENTO TIMESTAMP,
+    DTHR_CRIACAO TIMESTAMP,
+    DTHR_ATUALIZACAO TIMESTAMP,
+    DTHR_RESOLUCAO TIMESTAMP,
+    DTHR_FECHAMENTO TIMESTAMP,
+    AVALIACAO_CLIENTE INTEGER,
+    COMENTARIO_AVALIACAO TEXT,
+    URGENTE BOOLEAN,
+    CONFIDENCIAL BOOLEAN
+);
+
+CREATE TABLE HISTORICO_ARQUIVO (
+    ID INTEGER NOT NULL PRIMARY KEY,
+    ID_SOLICITACAO INTEGER NOT NULL,
+    ID_USUARIO INTEGER NOT NULL,
+    TIPO_ACAO VARCHAR(50) NOT NULL,
+    DESCRICAO blob NOT NULL,
+    DADOS_ANTERIORES blob,
+    DADOS_NOVOS blob,
+    DTHR_ACAO TIMESTAMP,
+    IP_ADDRESS VARCHAR(45),
+    USER_AGENT blob
+);
+
+CREATE TABLE ANEXOS_ARQUIVO (
+    ID INTEGER NOT NULL PRIMARY KEY,
+    ID_SOLICITACAO INTEGER NOT NULL,
+    ID_USUARIO INTEGER NOT NULL,
+    NOME_ORIGINAL VARCHAR(255) NOT NULL,
+    NOME_ARQUIVO VARCHAR(255) NOT NULL,
+    CAMINHO_ARQUIVO VARCHAR(500) NOT NULL,
+    TIPO_MIME VARCHAR(100),
+    TAMANHO_BYTES BIGINT,
+    DESCRICAO blob,
+    DTHR_UPLOAD TIMESTAMP
+);
+
+CREATE TABLE COMENTARIOS_ARQUIVO (
+    ID INTEGER NOT NULL PRIMARY KEY,
+    ID_SOLICITACAO INTEGER NOT NULL,
+    ID_USUARIO INTEGER NOT NULL,
+    COMENTARIO blob NOT NULL,
+    INTERNO BOOLEAN,
+    DTHR_CRIACAO TIMESTAMP,
+    DTHR_EDICAO TIMESTAMP
+);
+
+-- Solicitações que saíram de SOLICITACOES (arquivadas ou excluídas), para a
+-- sincronização incremental (GET /api/v1/solicitacoes/mudancas)
+CREATE TABLE SOLICITACOES_EXCLUIDAS (
+    ID INTEGER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+    ID_SOLICITACAO INTEGER NOT NULL,
+    MOTIVO VARCHAR(20) NOT NULL,
+    DTHR_EXCLUSAO TIMESTAMP DEFAULT CURRENT_TIMESTAMP NOT NULL
+);
+
+-- Números dos códigos gerados na importação (IMAAAAMMDDNNNNNN); fora das
+-- transações, então importações simultâneas nunca recebem o mesmo número
+CREATE SEQUENCE SEQ_CODIGO_IMPORTACAO;
+
 -- =====================================================
 -- DADOS INICIAIS
 -- =====================================================
@@ -483,11 +574,19 @@ CREATE INDEX IDX_SOLICITACOES_PRIORIDADE ON SOLICITACOES(ID_PRIORIDADE);
 CREATE INDEX IDX_SOLICITACOES_TECNICO ON SOLICITACOES(ID_TECNICO_RESPONSAVEL);
 CREATE INDEX IDX_SOLICITACOES_CRIACAO ON SOLICITACOES(DTHR_CRIACAO);
 CREATE INDEX IDX_SOLICITACOES_PRAZO ON SOLICITACOES(PRAZO_RESOLUCAO);
+-- Snapshot analítico e sincronização incremental (posição DTHR_ATUALIZACAO, ID)
+CREATE INDEX IDX_SOLICITACOES_ATUALIZACAO ON SOLICITACOES(DTHR_ATUALIZACAO, ID);
+-- Listagens por cliente/técnico ordenadas da mais recente para a mais antiga
+CREATE DESCENDING INDEX IDX_SOLICITACOES_CLIENTE_DTHR ON SOLICITACOES(ID_CLIENTE, DTHR_CRIACAO);
+CREATE DESCENDING INDEX IDX_SOLICITACOES_TECNICO_DTHR ON SOLICITACOES(ID_TECNICO_RESPONSAVEL, DTHR_CRIACAO);
+CREATE DESCENDING INDEX IDX_SOLICITACOES_CRIACAO_DESC ON SOLICITACOES(DTHR_CRIACAO);
 
 -- Índices para HISTORICO
 CREATE INDEX IDX_HISTORICO_SOLICITACAO ON HISTORICO(ID_SOLICITACAO);
 CREATE INDEX IDX_HISTORICO_USUARIO ON HISTORICO(ID_USUARIO);
 CREATE INDEX IDX_HISTORICO_ACAO ON HISTORICO(DTHR_ACAO);
+CREATE INDEX IDX_HISTORICO_TIPO_ACAO ON HISTORICO(TIPO_ACAO);
+CREATE DESCENDING INDEX IDX_HISTORICO_SOLICITACAO_ACAO ON HISTORICO(ID_SOLICITACAO, DTHR_ACAO);
 
 -- Índices para NOTIFICACOES
 CREATE INDEX IDX_NOTIFICACOES_USUARIO ON NOTIFICACOES(ID_USUARIO);
@@ -501,6 +600,26 @@ CREATE INDEX IDX_ANEXOS_USUARIO ON ANEXOS(ID_USUARIO);
 -- Índices para COMENTARIOS
 CREATE INDEX IDX_COMENTARIOS_SOLICITACAO ON COMENTARIOS(ID_SOLICITACAO);
 CREATE INDEX IDX_COMENTARIOS_CRIACAO ON COMENTARIOS(DTHR_CRIACAO);
+CREATE DESCENDING INDEX IDX_COMENTARIOS_SOLICITACAO_CRI ON COMENTARIOS(ID_SOLICITACAO, DTHR_CRIACAO);
+
+-- Índices para TEMPLATES_EMAIL (busca por nome a cada envio de email)
+CREATE INDEX IDX_TEMPLATES_EMAIL_NOME ON TEMPLATES_EMAIL(NOME);
+
+-- Índices para as tabelas de arquivo
+CREATE INDEX IDX_SOLICITACOES_ARQ_CLIENTE ON SOLICITACOES_ARQUIVO(ID_CLIENTE);
+CREATE INDEX IDX_SOLICITACOES_ARQ_CODIGO ON SOLICITACOES_ARQUIVO(CODIGO_REFERENCIA);
+CREATE INDEX IDX_HISTORICO_ARQ_SOLICITACAO ON HISTORICO_ARQUIVO(ID_SOLICITACAO);
+CREATE INDEX IDX_ANEXOS_ARQ_SOLICITACAO ON ANEXOS_ARQUIVO(ID_SOLICITACAO);
+CREATE INDEX IDX_COMENTARIOS_ARQ_SOLICITACAO ON COMENTARIOS_ARQUIVO(ID_SOLICITACAO);
+
+-- Seleção das solicitações finalizadas a arquivar (idade pela última atualização)
+CREATE INDEX IDX_SOLICITACOES_STATUS_ATUALIZ ON SOLICITACOES(ID_STATUS, DTHR_ATUALIZACAO);
+
+-- Exclusões lidas pela sincronização incremental (posição DTHR_EXCLUSAO, ID)
+CREATE INDEX IDX_SOLICITACOES_EXCL_DTHR ON SOLICITACOES_EXCLUIDAS(DTHR_EXCLUSAO, ID);
+
+-- Base de conhecimento (listagens por categoria e mais vistos)
+CREATE INDEX IDX_KNOWLEDGE_BASE_CATEGORIA ON KNOWLEDGE_BASE(CATEGORIA);
 
 -- =====================================================
 -- TRIGGERS PARA AUTOMAÇÃO
@@ -536,9 +655,22 @@ BEGIN
 END;
 
 -- Trigger para atualizar timestamp de atualização
+-- (rotinas de manutenção que só regravam o armazenamento, como o backfill de
+-- compressão, definem SAOS_MANUTENCAO na transação para preservar a data)
 CREATE TRIGGER TR_SOLICITACOES_UPDATE_TIME
 ACTIVE BEFORE UPDATE ON SOLICITACOES
 AS
 BEGIN
-    NEW.DTHR_ATUALIZACAO = CURRENT_TIMESTAMP;
+    IF (RDB$GET_CONTEXT('USER_TRANSACTION', 'SAOS_MANUTENCAO') IS NULL) THEN
+        NEW.DTHR_ATUALIZACAO = CURRENT_TIMESTAMP;
+END;
+
+-- Trigger para registrar a saída de solicitações (o arquivamento define
+-- SAOS_MOTIVO_EXCLUSAO = 'ARQUIVADA' na transação)
+CREATE TRIGGER TR_SOLICITACOES_EXCLUSAO
+ACTIVE AFTER DELETE ON SOLICITACOES
+AS
+BEGIN
+    INSERT INTO SOLICITACOES_EXCLUIDAS (ID_SOLICITACAO, MOTIVO)
+    VALUES (OLD.ID, COALESCE(RDB$GET_CONTEXT('USER_TRANSACTION', 'SAOS_MOTIVO_EXCLUSAO'), 'EXCLUIDA'));
 END;
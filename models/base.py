@@ -1,43 +1,115 @@
 from database.connection import db_connection
+from utils.compressao_blob import COLUNAS_COMPRIMIDAS, comprimir, texto
+from utils.blob_sob_demanda import GrupoBlobs, decodificar_json
+from utils.cache import invalidar_respostas
 from datetime import datetime
+import hashlib
 import json
 
+# RDB$FIELD_TYPE das colunas BLOB
+TIPO_BLOB = 261
+
+def versao_linhas(linhas):
+    """Hash de linhas (chave, versão); datas como em _row_to_dict, para comparar com registros já lidos"""
+    normalizadas = [[valor.isoformat() if isinstance(valor, datetime) else valor for valor in linha] for linha in linhas]
+    return hashlib.sha1(json.dumps(normalizadas, default=str).encode('utf-8')).hexdigest()[:24]
+
 class BaseModel:
     """Classe base para todos os modelos do sistema"""
     
+    # Metadados das colunas por tabela, compartilhados entre as instâncias
+    _cache_colunas = {}
+    
     def __init__(self):
         self.table_name = None
         self.primary_key = 'ID'
+        # Tabela com os registros arquivados (mesmas colunas), se houver
+        self.archive_table_name = None
+        # MapaIdentidade opcional: get_by_id repetido não volta ao banco
+        self.mapa_identidade = None
+    
+    def get_by_id(self, id, incluir_arquivo=False, carregar_blobs=()):
+        """Busca um registro pelo ID (opcionalmente também no arquivo)"""
+        if self.mapa_identidade is None:
+            return self._buscar_por_id(id, incluir_arquivo, carregar_blobs)
+        
+        variante = (incluir_arquivo, carregar_blobs if carregar_blobs is True else tuple(sorted(carregar_blobs)))
+        return self.mapa_identidade.obter(
+            id, variante, lambda: self._buscar_por_id(id, incluir_arquivo, carregar_blobs)
+        )
     
-    def get_by_id(self, id):
-        """Busca um registro pelo ID"""
+    def _buscar_por_id(self, id, incluir_arquivo, carregar_blobs):
         with db_connection() as con:
             cur = con.cursor()
-            cur.execute(f"SELECT * FROM {self.table_name} WHERE {self.primary_key} = ?", (id,))
+            colunas = self._colunas_select(cur, carregar_blobs)
+            lista_colunas = ', '.join(nome for nome, _ in colunas)
+            
+            cur.execute(f"SELECT {lista_colunas} FROM {self.table_name} WHERE {self.primary_key} = ?", (id,))
             row = cur.fetchone()
-            return self._row_to_dict(row) if row else None
+            
+            if not row and incluir_arquivo and self.archive_table_name:
+                cur.execute(f"SELECT {lista_colunas} FROM {self.archive_table_name} WHERE {self.primary_key} = ?", (id,))
+                row = cur.fetchone()
+            
+            if not row:
+                return None
+            return self._row_to_dict(row, colunas, self._grupo_blobs(incluir_arquivo))
     
-    def get_all(self, where=None, params=None, order_by=None, limit=None):
+    def get_all(self, where=None, params=None, order_by=None, limit=None, incluir_arquivo=False, carregar_blobs=()):
         """Busca todos os registros com filtros opcionais"""
-        query = f"SELECT * FROM {self.table_name}"
+        with db_connection() as con:
+            cur = con.cursor()
+            colunas = self._colunas_select(cur, carregar_blobs)
+            lista_colunas = ', '.join(nome for nome, _ in colunas)
+            
+            cur.execute(*self._montar_select(lista_colunas, where, params, order_by, limit, incluir_arquivo))
+            rows = cur.fetchall()
         
-        if where:
-            query += f" WHERE {where}"
+        # Um único grupo por consulta: cada coluna BLOB é lida para todas as linhas de uma vez
+        grupo = self._grupo_blobs(incluir_arquivo)
+        return [self._row_to_dict(row, colunas, grupo) for row in rows]
+    
+    def versao(self, where=None, params=None, order_by=None, limit=None, incluir_arquivo=False, coluna_versao='DTHR_ATUALIZACAO'):
+        """Versão (hash) do resultado de get_all lendo só a chave e a coluna de versão das linhas"""
+        colunas = [self.primary_key] + ([coluna_versao] if coluna_versao else [])
+        if incluir_arquivo and self.archive_table_name and order_by:
+            # No UNION a ordenação é feita fora da subconsulta: as colunas precisam estar no SELECT
+            colunas += [parte.split()[0] for parte in order_by.split(',') if parte.split()[0] not in colunas]
+        
+        with db_connection() as con:
+            cur = con.cursor()
+            cur.execute(*self._montar_select(', '.join(colunas), where, params, order_by, limit, incluir_arquivo))
+            rows = cur.fetchall()
+        
+        return versao_linhas(row[:1 + bool(coluna_versao)] for row in rows)
+    
+    def _montar_select(self, lista_colunas, where, params, order_by, limit, incluir_arquivo):
+        """Query e parâmetros de get_all (com o UNION do arquivo, se pedido)"""
+        if incluir_arquivo and self.archive_table_name:
+            # Aplica o filtro em cada ramo para que os índices de ambas as tabelas sejam usados
+            filtro = f" WHERE {where}" if where else ""
+            query = (
+                f"SELECT * FROM (SELECT {lista_colunas} FROM {self.table_name}{filtro} "
+                f"UNION ALL SELECT {lista_colunas} FROM {self.archive_table_name}{filtro})"
+            )
+            params = list(params or ()) * 2
+        else:
+            query = f"SELECT {lista_colunas} FROM {self.table_name}"
+            
+            if where:
+                query += f" WHERE {where}"
         
         if order_by:
             query += f" ORDER BY {order_by}"
         
         if limit:
-            query += f" FIRST {limit}"
+            query += f" ROWS {int(limit)}"
         
-        with db_connection() as con:
-            cur = con.cursor()
-            cur.execute(query, params or ())
-            rows = cur.fetchall()
-            return [self._row_to_dict(row) for row in rows]
+        return query, params or ()
     
     def create(self, data):
         """Cria um novo registro"""
+        data = self._comprimir_colunas(data)
         fields = list(data.keys())
         placeholders = ', '.join(['?' for _ in fields])
         field_names = ', '.join(fields)
@@ -48,10 +120,12 @@ class BaseModel:
             cur = con.cursor()
             cur.execute(query, list(data.values()))
             con.commit()
+            invalidar_respostas(self.table_name)
             return cur.lastrowid
     
     def update(self, id, data):
         """Atualiza um registro existente"""
+        data = self._comprimir_colunas(data)
         fields = list(data.keys())
         set_clause = ', '.join([f"{field} = ?" for field in fields])
         
@@ -62,6 +136,7 @@ class BaseModel:
             values = list(data.values()) + [id]
             cur.execute(query, values)
             con.commit()
+            self._registro_alterado(id)
             return cur.rowcount > 0
     
     def delete(self, id):
@@ -72,6 +147,7 @@ class BaseModel:
             cur = con.cursor()
             cur.execute(query, (id,))
             con.commit()
+            self._registro_alterado(id)
             return cur.rowcount > 0
     
     def count(self, where=None, params=None):
@@ -86,35 +162,79 @@ class BaseModel:
             cur.execute(query, params or ())
             return cur.fetchone()[0]
     
-    def _row_to_dict(self, row):
+    def _registro_alterado(self, id):
+        """Descarta o registro do mapa de identidade e as respostas em cache da tabela"""
+        if self.mapa_identidade is not None:
+            self.mapa_identidade.invalidar(id)
+        invalidar_respostas(self.table_name)
+    
+    def _row_to_dict(self, row, colunas, grupo_blobs=None):
         """Converte uma linha do banco em dicionário"""
         if not row:
             return None
         
-        # Obtém os nomes das colunas
-        with db_connection() as con:
-            cur = con.cursor()
-            cur.execute(f"SELECT * FROM {self.table_name} WHERE 1=0")
-            columns = [description[0] for description in cur.description]
+        valores = dict(zip((nome for nome, _ in colunas), row))
         
-        # Cria o dicionário
+        # Cria o dicionário (na ordem das colunas da tabela)
         result = {}
-        for i, column in enumerate(columns):
-            value = row[i]
+        for column, _ in self._colunas(None):
+            if column not in valores:
+                # BLOB fora do SELECT: lido apenas se for acessado
+                result[column] = grupo_blobs.blob(column, valores[self.primary_key])
+                continue
+            
+            value = valores[column]
+            
+            # BLOBs carregados imediatamente (descomprime se necessário)
+            if hasattr(value, 'read') or isinstance(value, bytes):
+                value = texto(value)
             
             # Converte tipos especiais
             if isinstance(value, datetime):
                 value = value.isoformat()
-            elif isinstance(value, str) and value and value.startswith('{'):
-                try:
-                    value = json.loads(value)
-                except:
-                    pass
+            else:
+                value = decodificar_json(value)
             
             result[column] = value
         
         return result
     
+    def _colunas(self, cur):
+        """Colunas da tabela na ordem do SELECT *: [(nome, é_blob)], lidas uma vez por processo"""
+        if self.table_name not in BaseModel._cache_colunas:
+            cur.execute("""
+                SELECT TRIM(RF.RDB$FIELD_NAME), F.RDB$FIELD_TYPE
+                FROM RDB$RELATION_FIELDS RF
+                JOIN RDB$FIELDS F ON F.RDB$FIELD_NAME = RF.RDB$FIELD_SOURCE
+                WHERE RF.RDB$RELATION_NAME = ?
+                ORDER BY RF.RDB$FIELD_POSITION
+            """, (self.table_name,))
+            BaseModel._cache_colunas[self.table_name] = [
+                (nome, tipo == TIPO_BLOB) for nome, tipo in cur.fetchall()
+            ]
+        return BaseModel._cache_colunas[self.table_name]
+    
+    def _colunas_select(self, cur, carregar_blobs=()):
+        """Colunas a selecionar: todas, exceto BLOBs não pedidos em carregar_blobs (True = todos)"""
+        return [
+            (nome, blob) for nome, blob in self._colunas(cur)
+            if not blob or carregar_blobs is True or nome in carregar_blobs
+        ]
+    
+    def _grupo_blobs(self, incluir_arquivo=False):
+        tabelas = [self.table_name]
+        if incluir_arquivo and self.archive_table_name:
+            tabelas.append(self.archive_table_name)
+        return GrupoBlobs(tabelas, self.primary_key)
+    
+    def _comprimir_colunas(self, data):
+        """Aplica a compressão às colunas BLOB configuradas da tabela"""
+        comprimidas = COLUNAS_COMPRIMIDAS.get(self.table_name, ())
+        return {
+            key: comprimir(value) if key in comprimidas else value
+            for key, value in data.items()
+        }
+    
     def _dict_to_row(self, data):
         """Converte um dicionário em valores para inserção/atualização"""
         result = {}
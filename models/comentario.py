@@ -1,18 +1,28 @@
 from models.base import BaseModel
+from utils.busca import atualizar_indice_busca
 from datetime import datetime
 
 class ComentarioModel(BaseModel):
     def __init__(self):
         super().__init__()
         self.table_name = 'COMENTARIOS'
+        self.archive_table_name = 'COMENTARIOS_ARQUIVO'
     
-    def buscar_por_solicitacao(self, solicitacao_id, limit=None):
+    def create(self, data):
+        """Cria o comentário e reindexa a solicitação (apenas comentários públicos)"""
+        comentario_id = super().create(data)
+        if not data.get('INTERNO'):
+            atualizar_indice_busca(data.get('ID_SOLICITACAO'))
+        return comentario_id
+    
+    def buscar_por_solicitacao(self, solicitacao_id, limit=None, incluir_arquivo=False):
         """Busca comentários de uma solicitação específica"""
         return self.get_all(
             where="ID_SOLICITACAO = ?",
             params=(solicitacao_id,),
             order_by="DTHR_CRIACAO DESC",
-            limit=limit
+            limit=limit,
+            incluir_arquivo=incluir_arquivo
         )
     
     def buscar_por_usuario(self, usuario_id, limit=None):
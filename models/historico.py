@@ -1,18 +1,49 @@
 from models.base import BaseModel
+from utils.auditoria import registrar_historico, descarregar_historico
 from datetime import datetime
 
 class HistoricoModel(BaseModel):
     def __init__(self):
         super().__init__()
         self.table_name = 'HISTORICO'
+        self.archive_table_name = 'HISTORICO_ARQUIVO'
     
-    def buscar_por_solicitacao(self, solicitacao_id, limit=None):
+    def get_all(self, *args, **kwargs):
+        """Busca registros do histórico, incluindo as entradas ainda no buffer"""
+        try:
+            descarregar_historico()
+        except Exception as e:
+            print(f"⚠️ [HISTORICO] Entradas pendentes não gravadas antes da leitura: {e}")
+        return super().get_all(*args, **kwargs)
+    
+    def versao(self, *args, **kwargs):
+        """Versão do resultado, considerando também as entradas ainda no buffer"""
+        try:
+            descarregar_historico()
+        except Exception as e:
+            print(f"⚠️ [HISTORICO] Entradas pendentes não gravadas antes da leitura: {e}")
+        return super().versao(*args, **kwargs)
+    
+    def buscar_por_solicitacao(self, solicitacao_id, limit=None, incluir_arquivo=False, carregar_blobs=()):
         """Busca histórico de uma solicitação específica"""
         return self.get_all(
             where="ID_SOLICITACAO = ?",
             params=(solicitacao_id,),
             order_by="DTHR_ACAO DESC",
-            limit=limit
+            limit=limit,
+            incluir_arquivo=incluir_arquivo,
+            carregar_blobs=carregar_blobs
+        )
+    
+    def versao_por_solicitacao(self, solicitacao_id, limit=None, incluir_arquivo=False):
+        """Versão de buscar_por_solicitacao (o histórico só recebe inclusões: basta o ID)"""
+        return self.versao(
+            where="ID_SOLICITACAO = ?",
+            params=(solicitacao_id,),
+            order_by="DTHR_ACAO DESC",
+            limit=limit,
+            incluir_arquivo=incluir_arquivo,
+            coluna_versao=None
         )
     
     def buscar_por_usuario(self, usuario_id, limit=None):
@@ -42,9 +73,9 @@ class HistoricoModel(BaseModel):
             limit=limit
         )
     
-    def registrar_acao(self, solicitacao_id, usuario_id, tipo_acao, descricao, dados_anteriores=None, dados_novos=None):
-        """Registra uma nova ação no histórico"""
-        return self.create({
+    def registrar_acao(self, solicitacao_id, usuario_id, tipo_acao, descricao, dados_anteriores=None, dados_novos=None, sincrono=False):
+        """Registra uma nova ação no histórico (em segundo plano, salvo sincrono=True)"""
+        registrar_historico({
             'ID_SOLICITACAO': solicitacao_id,
             'ID_USUARIO': usuario_id,
             'TIPO_ACAO': tipo_acao,
@@ -52,4 +83,4 @@ class HistoricoModel(BaseModel):
             'DADOS_ANTERIORES': dados_anteriores,
             'DADOS_NOVOS': dados_novos,
             'DTHR_ACAO': datetime.now()
-        })
+        }, sincrono=sincrono)
@@ -0,0 +1,244 @@
+from models.base import BaseModel
+from database.connection import db_connection
+from utils.busca import indice_artigos
+from utils.cache import CacheLRU
+from utils.compressao_blob import texto
+from utils.contadores import contadores
+from utils.normalizacao import tokenizar, normalizar_tag
+from datetime import datetime
+import json
+import config
+
+# Termos do chamado usados na sugestão de artigos (título primeiro)
+MAXIMO_TERMOS_SUGESTAO = 30
+
+# Colunas das listagens e buscas (sem os BLOBs)
+COLUNAS_RESUMO = ['ID', 'TITULO', 'CATEGORIA', 'VISUALIZACOES', 'AVALIACAO_MEDIA', 'TOTAL_AVALIACOES', 'DTHR_ATUALIZACAO']
+
+# Consultas frequentes da base de conhecimento, limpas a cada alteração de artigo e
+# a cada gravação dos contadores (os totais em cache não incluem mais os pendentes)
+cache_consultas = CacheLRU(config.KB_CACHE_TAMANHO, ttl=config.KB_CACHE_TTL_SEGUNDOS)
+contadores.ao_gravar('KNOWLEDGE_BASE', cache_consultas.invalidar)
+
+class KnowledgeBaseModel(BaseModel):
+    def __init__(self):
+        super().__init__()
+        self.table_name = 'KNOWLEDGE_BASE'
+
+    def obter(self, artigo_id, registrar_visualizacao=True):
+        """Busca um artigo completo e contabiliza a visualização"""
+        artigo = self.get_by_id(artigo_id, carregar_blobs=True)
+        if not artigo:
+            return None
+
+        artigo['TAGS'] = json.loads(artigo['TAGS'] or '[]')
+        if registrar_visualizacao:
+            contadores.incrementar('KNOWLEDGE_BASE', 'VISUALIZACOES', artigo_id)
+        return contadores.aplicar('KNOWLEDGE_BASE', artigo)
+
+    def buscar(self, consulta=None, tag=None, categoria=None, limite=10):
+        """Artigos ativos por relevância (com consulta) ou mais visualizados (sem consulta)"""
+        termos = tuple(dict.fromkeys(tokenizar(consulta)))
+        tag = normalizar_tag(tag) if tag else None
+        chave = ('busca', termos, tag, categoria, limite)
+
+        resultado = cache_consultas.obter(chave)
+        if resultado is None:
+            geracao = cache_consultas.geracao
+            if termos:
+                ids = self._ids_por_tag(tag) if tag else None
+                ranking = indice_artigos.buscar(termos, categoria=categoria, ids=ids, limite=limite)
+                resultado = self._resumos(ranking)
+            else:
+                resultado = self._mais_visualizados(tag, categoria, limite)
+            cache_consultas.guardar(chave, resultado, geracao=geracao)
+
+        return self._com_pendentes(resultado)
+
+    def sugerir(self, titulo, descricao=None, limite=5):
+        """Artigos relacionados ao texto de um chamado (qualquer termo, ranking BM25)"""
+        termos = tuple(dict.fromkeys(tokenizar(titulo) + tokenizar(descricao)))[:MAXIMO_TERMOS_SUGESTAO]
+        if not termos:
+            return []
+
+        chave = ('sugestao', termos, limite)
+        resultado = cache_consultas.obter(chave)
+        if resultado is None:
+            geracao = cache_consultas.geracao
+            resultado = self._resumos(indice_artigos.buscar(termos, qualquer_termo=True, limite=limite))
+            cache_consultas.guardar(chave, resultado, geracao=geracao)
+
+        return self._com_pendentes(resultado)
+
+    def tags(self):
+        """Tags dos artigos ativos com a quantidade de artigos de cada uma"""
+        resultado = cache_consultas.obter(('tags',))
+        if resultado is None:
+            with db_connection() as con:
+                cur = con.cursor()
+                cur.execute("""
+                    SELECT T.TAG, COUNT(*) FROM KNOWLEDGE_BASE_TAGS T
+                    JOIN KNOWLEDGE_BASE K ON K.ID = T.ID_ARTIGO
+                    WHERE K.ATIVO = TRUE
+                    GROUP BY T.TAG
+                    ORDER BY 2 DESC, 1
+                """)
+                resultado = [{'TAG': tag, 'ARTIGOS': total} for tag, total in cur.fetchall()]
+            cache_consultas.guardar(('tags',), resultado)
+        return resultado
+
+    def create(self, data):
+        """Cria o artigo e suas tags na mesma transação"""
+        data = dict(data)
+        tags = self._normalizar_tags(data.pop('TAGS', None))
+        data['TAGS'] = json.dumps(tags, ensure_ascii=False)
+        data = self._comprimir_colunas(data)
+
+        with db_connection() as con:
+            cur = con.cursor()
+            cur.execute(
+                f"INSERT INTO KNOWLEDGE_BASE ({', '.join(data)}) VALUES ({', '.join('?' for _ in data)}) RETURNING ID",
+                list(data.values())
+            )
+            artigo_id = cur.fetchone()[0]
+            self._gravar_tags(cur, artigo_id, tags)
+            con.commit()
+
+        self._artigos_alterados(artigo_id)
+        return artigo_id
+
+    def update(self, id, data):
+        """Atualiza o artigo (e as tags, se informadas) na mesma transação"""
+        data = dict(data)
+        tags = None
+        if 'TAGS' in data:
+            tags = self._normalizar_tags(data.pop('TAGS'))
+            data['TAGS'] = json.dumps(tags, ensure_ascii=False)
+        data['DTHR_ATUALIZACAO'] = datetime.now()
+        data = self._comprimir_colunas(data)
+
+        with db_connection() as con:
+            cur = con.cursor()
+            cur.execute(
+                f"UPDATE KNOWLEDGE_BASE SET {', '.join(f'{campo} = ?' for campo in data)} WHERE ID = ?",
+                list(data.values()) + [id]
+            )
+            atualizado = cur.rowcount > 0
+            if atualizado and tags is not None:
+                cur.execute("DELETE FROM KNOWLEDGE_BASE_TAGS WHERE ID_ARTIGO = ?", (id,))
+                self._gravar_tags(cur, id, tags)
+            con.commit()
+
+        self._artigos_alterados(id)
+        return atualizado
+
+    def delete(self, id):
+        """Remove o artigo (as tags saem em cascata)"""
+        removido = super().delete(id)
+        self._artigos_alterados(id)
+        return removido
+
+    def avaliar(self, artigo_id, nota):
+        """Registra uma nota de 1 a 5 para o artigo"""
+        if nota not in (1, 2, 3, 4, 5):
+            raise ValueError("A nota deve ser um inteiro de 1 a 5")
+        contadores.avaliar('KNOWLEDGE_BASE', 'AVALIACAO_MEDIA', 'TOTAL_AVALIACOES', artigo_id, nota)
+
+    def reconstruir_indices(self):
+        """Recria KNOWLEDGE_BASE_TAGS a partir do JSON de TAGS e reindexa os artigos"""
+        with db_connection() as con:
+            cur = con.cursor()
+            cur.execute("SELECT ID, TAGS FROM KNOWLEDGE_BASE")
+            artigos = [(id, self._normalizar_tags(json.loads(texto(tags) or '[]'))) for id, tags in cur.fetchall()]
+
+            cur.execute("DELETE FROM KNOWLEDGE_BASE_TAGS")
+            for artigo_id, tags in artigos:
+                self._gravar_tags(cur, artigo_id, tags)
+            con.commit()
+
+        total = indice_artigos.reconstruir()
+        cache_consultas.invalidar()
+        return total
+
+    def _ids_por_tag(self, tag):
+        """IDs dos artigos com a tag (pelo índice KNOWLEDGE_BASE_TAGS)"""
+        with db_connection() as con:
+            cur = con.cursor()
+            cur.execute("SELECT ID_ARTIGO FROM KNOWLEDGE_BASE_TAGS WHERE TAG = ?", (tag,))
+            return [row[0] for row in cur.fetchall()]
+
+    def _resumos(self, ranking):
+        """Dados resumidos dos artigos na ordem do ranking [(id, relevância)]"""
+        if not ranking:
+            return []
+
+        relevancia = dict(ranking)
+        with db_connection() as con:
+            cur = con.cursor()
+            cur.execute(f"""
+                SELECT {', '.join(COLUNAS_RESUMO)} FROM KNOWLEDGE_BASE
+                WHERE ID IN ({', '.join('?' for _ in relevancia)}) AND ATIVO = TRUE
+            """, list(relevancia))
+            artigos = {row[0]: self._resumo(row) for row in cur.fetchall()}
+
+        resultado = []
+        for artigo_id, pontuacao in ranking:
+            if artigo_id in artigos:
+                artigos[artigo_id]['RELEVANCIA'] = round(pontuacao, 6)
+                resultado.append(artigos[artigo_id])
+        return resultado
+
+    def _mais_visualizados(self, tag, categoria, limite):
+        """Artigos ativos mais visualizados, com filtros opcionais de tag e categoria"""
+        joins, condicoes, params = "", ["K.ATIVO = TRUE"], []
+        if tag:
+            joins = " JOIN KNOWLEDGE_BASE_TAGS T ON T.ID_ARTIGO = K.ID AND T.TAG = ?"
+            params.append(tag)
+        if categoria:
+            condicoes.append("K.CATEGORIA = ?")
+            params.append(categoria)
+
+        with db_connection() as con:
+            cur = con.cursor()
+            cur.execute(f"""
+                SELECT {', '.join('K.' + coluna for coluna in COLUNAS_RESUMO)}
+                FROM KNOWLEDGE_BASE K{joins}
+                WHERE {' AND '.join(condicoes)}
+                ORDER BY K.VISUALIZACOES DESC NULLS LAST, K.ID DESC
+                ROWS {int(limite)}
+            """, params)
+            return [self._resumo(row) for row in cur.fetchall()]
+
+    def _resumo(self, row):
+        resumo = dict(zip(COLUNAS_RESUMO, row))
+        if resumo['AVALIACAO_MEDIA'] is not None:
+            resumo['AVALIACAO_MEDIA'] = float(resumo['AVALIACAO_MEDIA'])
+        if resumo['DTHR_ATUALIZACAO']:
+            resumo['DTHR_ATUALIZACAO'] = resumo['DTHR_ATUALIZACAO'].isoformat()
+        return resumo
+
+    def _com_pendentes(self, resultado):
+        """Cópia do resultado (em cache) com visualizações e avaliações ainda não gravadas"""
+        return [contadores.aplicar('KNOWLEDGE_BASE', dict(artigo)) for artigo in resultado]
+
+    def _normalizar_tags(self, tags):
+        """Lista ou texto separado por vírgulas -> tags normalizadas, sem repetição"""
+        if isinstance(tags, str):
+            tags = tags.split(',')
+        normalizadas = (normalizar_tag(tag)[:50] for tag in tags or [])
+        return list(dict.fromkeys(tag for tag in normalizadas if tag))
+
+    def _gravar_tags(self, cur, artigo_id, tags):
+        if tags:
+            cur.executemany(
+                "INSERT INTO KNOWLEDGE_BASE_TAGS (TAG, ID_ARTIGO) VALUES (?, ?)",
+                [(tag, artigo_id) for tag in tags]
+            )
+
+    def _artigos_alterados(self, *ids):
+        """Atualiza o índice textual e descarta as consultas em cache"""
+        try:
+            indice_artigos.indexar(ids)
+        except Exception as e:
+            print(f"⚠️ [KNOWLEDGE_BASE] Índice não atualizado para {ids} (use scripts/indice_busca.py --artigos): {e}")
+        cache_consultas.invalidar()
@@ -0,0 +1,212 @@
+from models.base import BaseModel
+from database.connection import db_connection
+from database.analitico import analitico_connection, base_analitica_disponivel
+from datetime import datetime
+import numpy as np
+import config
+
+# Quantidade de linhas lidas por vez do cursor
+TAMANHO_LOTE = 5000
+
+# Status que não contam como backlog (Resolvido, Fechado, Cancelado)
+STATUS_ENCERRADOS = (6, 7, 8)
+
+EPOCA = datetime(1970, 1, 1)
+
+AGRUPAMENTOS = {
+    'categoria': "SELECT ID, NOME FROM CATEGORIAS",
+    'prioridade': "SELECT ID, NOME FROM PRIORIDADES",
+    'tecnico': "SELECT ID, NOME FROM USUARIOS WHERE TIPO_USUARIO IN ('TECNICO', 'ADMIN')",
+}
+
+# Colunas carregadas para o relatório. Os timestamps já vêm convertidos em
+# segundos desde 1970 pelo próprio banco, evitando objetos datetime por linha.
+COLUNAS_SLA = """
+    ID_CATEGORIA, ID_PRIORIDADE, COALESCE(ID_TECNICO_RESPONSAVEL, 0), ID_STATUS,
+    DATEDIFF(SECOND FROM TIMESTAMP '1970-01-01 00:00:00' TO DTHR_CRIACAO),
+    DATEDIFF(SECOND FROM TIMESTAMP '1970-01-01 00:00:00' TO COALESCE(DTHR_RESOLUCAO, DTHR_FECHAMENTO)),
+    DATEDIFF(SECOND FROM TIMESTAMP '1970-01-01 00:00:00' TO PRAZO_RESOLUCAO)
+"""
+
+# Mesmas colunas na base analítica (SQLite), onde os timestamps são texto ISO
+COLUNAS_SLA_ANALITICO = """
+    ID_CATEGORIA, ID_PRIORIDADE, COALESCE(ID_TECNICO_RESPONSAVEL, 0), ID_STATUS,
+    CAST(strftime('%s', DTHR_CRIACAO) AS INTEGER),
+    CAST(strftime('%s', COALESCE(DTHR_RESOLUCAO, DTHR_FECHAMENTO)) AS INTEGER),
+    CAST(strftime('%s', PRAZO_RESOLUCAO) AS INTEGER)
+"""
+
+class RelatorioSLAModel(BaseModel):
+    """Relatórios de SLA calculados de forma vetorizada com NumPy"""
+
+    def __init__(self):
+        super().__init__()
+        self.table_name = 'SOLICITACOES'
+
+    def resolver_fonte(self, fonte=None):
+        """Define se o relatório lê do snapshot analítico ou do Firebird"""
+        fonte = fonte or config.FONTE_RELATORIOS
+        if fonte == 'analitico' and not base_analitica_disponivel():
+            print("⚠️ [RELATORIOS] Base analítica indisponível - consultando o banco de produção")
+            return 'oltp'
+        return fonte
+
+    def carregar_colunas(self, where=None, params=None, fonte='oltp'):
+        """Lê as colunas de SLA em lotes e devolve um dicionário de arrays"""
+        if fonte == 'analitico':
+            conexao = analitico_connection
+            query = f"SELECT {COLUNAS_SLA_ANALITICO} FROM {self.table_name}"
+            # O SQLite compara datas como texto no mesmo formato do snapshot
+            params = [p.isoformat(sep=' ') if isinstance(p, datetime) else p for p in (params or ())]
+        else:
+            conexao = db_connection
+            query = f"SELECT {COLUNAS_SLA} FROM {self.table_name}"
+
+        if where:
+            query += f" WHERE {where}"
+
+        lotes = []
+        with conexao() as con:
+            cur = con.cursor()
+            cur.execute(query, params or ())
+            while True:
+                rows = cur.fetchmany(TAMANHO_LOTE)
+                if not rows:
+                    break
+                # Transpõe o lote (linhas -> colunas); None vira NaN nas colunas float
+                colunas = list(zip(*rows))
+                lotes.append((
+                    np.array(colunas[0], dtype=np.int64),
+                    np.array(colunas[1], dtype=np.int64),
+                    np.array(colunas[2], dtype=np.int64),
+                    np.array(colunas[3], dtype=np.int64),
+                    np.array(colunas[4], dtype=np.float64),
+                    np.array(colunas[5], dtype=np.float64),
+                    np.array(colunas[6], dtype=np.float64),
+                ))
+
+        nomes = ['categoria', 'prioridade', 'tecnico', 'status', 'criacao', 'resolucao', 'prazo']
+        if not lotes:
+            return {nome: np.array([], dtype=np.int64 if i < 4 else np.float64) for i, nome in enumerate(nomes)}
+
+        return {nome: np.concatenate([lote[i] for lote in lotes]) for i, nome in enumerate(nomes)}
+
+    def calcular_sla(self, agrupar_por=None, data_inicio=None, data_fim=None,
+                     categoria_id=None, prioridade_id=None, agora=None, fonte=None):
+        """Calcula percentis de resolução, violação de prazo e idade do backlog"""
+        if agrupar_por and agrupar_por not in AGRUPAMENTOS:
+            raise ValueError(f"Agrupamento não suportado: {agrupar_por}")
+
+        fonte = self.resolver_fonte(fonte)
+        where, params = self._montar_filtros(data_inicio, data_fim, categoria_id, prioridade_id)
+        colunas = self.carregar_colunas(where, params, fonte)
+        # Mesma referência usada no SQL (segundos desde 1970, sem fuso)
+        agora = ((agora or datetime.now()) - EPOCA).total_seconds()
+
+        metricas = self._calcular_metricas(colunas, agora)
+
+        if not agrupar_por:
+            return self._resumir(metricas, np.ones(len(metricas['resolucao']), dtype=bool))
+
+        chaves = colunas[agrupar_por]
+        nomes = self._carregar_nomes(agrupar_por, fonte)
+        grupos, inverso = np.unique(chaves, return_inverse=True)
+
+        resultado = []
+        for indice, chave in enumerate(grupos):
+            chave = int(chave)
+            resumo = self._resumir(metricas, inverso == indice)
+            resumo['id'] = chave or None
+            resumo['nome'] = nomes.get(chave, 'Sem responsável' if not chave else 'Desconhecido')
+            resultado.append(resumo)
+
+        resultado.sort(key=lambda item: item['total'], reverse=True)
+        return resultado
+
+    def _calcular_metricas(self, colunas, agora):
+        """Deriva os vetores de métricas (em horas) a partir das colunas brutas"""
+        criacao = colunas['criacao']
+        resolucao = colunas['resolucao']
+        prazo = colunas['prazo']
+
+        resolvida = ~np.isnan(resolucao)
+        aberta = ~resolvida & ~np.isin(colunas['status'], STATUS_ENCERRADOS)
+        com_prazo = ~np.isnan(prazo)
+
+        # Solicitações resolvidas violam o prazo se resolvidas depois dele;
+        # as ainda em aberto, se o prazo já passou. Canceladas e encerradas
+        # sem data de resolução não contam.
+        prazo_limite = np.nan_to_num(prazo, nan=np.inf)
+        violada = com_prazo & np.where(resolvida, resolucao > prazo_limite, aberta & (agora > prazo_limite))
+
+        return {
+            'resolucao': (resolucao - criacao) / 3600.0,
+            'idade': (agora - criacao) / 3600.0,
+            'resolvida': resolvida,
+            'aberta': aberta,
+            'com_prazo': com_prazo,
+            'violada': violada,
+        }
+
+    def _resumir(self, metricas, mascara):
+        """Resume as métricas de um grupo selecionado pela máscara"""
+        tempos = metricas['resolucao'][mascara & metricas['resolvida']]
+        idades = metricas['idade'][mascara & metricas['aberta']]
+        com_prazo = int(np.count_nonzero(mascara & metricas['com_prazo']))
+        violadas = int(np.count_nonzero(mascara & metricas['violada']))
+
+        return {
+            'total': int(np.count_nonzero(mascara)),
+            'resolvidas': int(tempos.size),
+            'tempo_resolucao_horas': self._percentis(tempos, (50, 90, 99)),
+            'violadas': violadas,
+            'taxa_violacao': round(violadas / com_prazo, 4) if com_prazo else None,
+            'backlog': {
+                'abertas': int(idades.size),
+                'idade_horas': self._percentis(idades, (50, 90, 100)),
+            }
+        }
+
+    def _percentis(self, valores, percentis):
+        """Calcula percentis e média de um vetor, retornando None se vazio"""
+        if not valores.size:
+            return {**{f"p{p}" if p < 100 else 'max': None for p in percentis}, 'media': None}
+
+        calculados = np.percentile(valores, percentis)
+        resultado = {
+            (f"p{p}" if p < 100 else 'max'): round(float(valor), 2)
+            for p, valor in zip(percentis, calculados)
+        }
+        resultado['media'] = round(float(valores.mean()), 2)
+        return resultado
+
+    def _montar_filtros(self, data_inicio, data_fim, categoria_id, prioridade_id):
+        """Monta a cláusula WHERE a partir dos filtros informados"""
+        condicoes = []
+        params = []
+
+        if data_inicio:
+            condicoes.append("DTHR_CRIACAO >= ?")
+            params.append(data_inicio)
+
+        if data_fim:
+            condicoes.append("DTHR_CRIACAO <= ?")
+            params.append(data_fim)
+
+        if categoria_id:
+            condicoes.append("ID_CATEGORIA = ?")
+            params.append(categoria_id)
+
+        if prioridade_id:
+            condicoes.append("ID_PRIORIDADE = ?")
+            params.append(prioridade_id)
+
+        return (" AND ".join(condicoes) if condicoes else None), params
+
+    def _carregar_nomes(self, agrupar_por, fonte='oltp'):
+        """Carrega os nomes dos grupos (categorias, prioridades ou técnicos)"""
+        conexao = analitico_connection if fonte == 'analitico' else db_connection
+        with conexao() as con:
+            cur = con.cursor()
+            cur.execute(AGRUPAMENTOS[agrupar_por])
+            return dict(cur.fetchall())
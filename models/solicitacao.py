@@ -1,11 +1,63 @@
 from models.base import BaseModel
+from database.connection import db_connection
+from utils.auditoria import inserir_historico
+from utils.busca import atualizar_indice_busca
+from utils.duplicatas import indice_duplicatas
+from utils.autocompletar import autocompletar
+from utils.cache import MapaIdentidade, invalidar_respostas
+from utils.compressao_blob import texto
 from datetime import datetime, timedelta
+from itertools import islice
+import heapq
 import json
+import config
+
+# IDs por UPDATE/SELECT com IN (o Firebird aceita até 1500 itens)
+TAMANHO_LOTE_IDS = 1000
+
+# ID do status "Fechado" (preenche DTHR_FECHAMENTO)
+STATUS_FECHADO = 7
+
+# ID do status "Cancelado" (informado como removido na sincronização incremental)
+STATUS_CANCELADO = 8
+
+# Fontes da linha do tempo: (tipo, tabela, tabela de arquivo, coluna de data, colunas próprias)
+# A posição desempata eventos no mesmo instante (anexo, comentário, histórico, do mais novo ao mais antigo)
+FONTES_LINHA_DO_TEMPO = (
+    ('HISTORICO', 'HISTORICO', 'HISTORICO_ARQUIVO', 'DTHR_ACAO',
+     ('TIPO_ACAO', 'DESCRICAO', 'DADOS_ANTERIORES', 'DADOS_NOVOS')),
+    ('COMENTARIO', 'COMENTARIOS', 'COMENTARIOS_ARQUIVO', 'DTHR_CRIACAO',
+     ('COMENTARIO', 'INTERNO', 'DTHR_EDICAO')),
+    ('ANEXO', 'ANEXOS', 'ANEXOS_ARQUIVO', 'DTHR_UPLOAD',
+     ('NOME_ORIGINAL', 'TIPO_MIME', 'TAMANHO_BYTES', 'DESCRICAO')),
+)
+
+# Solicitações lidas por ID, compartilhadas entre as instâncias do model no processo
+mapa_solicitacoes = MapaIdentidade(
+    'SOLICITACOES', config.IDENTIDADE_CACHE_TAMANHO, config.IDENTIDADE_CACHE_TTL_SEGUNDOS
+)
 
 class SolicitacaoModel(BaseModel):
     def __init__(self):
         super().__init__()
         self.table_name = 'SOLICITACOES'
+        self.archive_table_name = 'SOLICITACOES_ARQUIVO'
+        self.mapa_identidade = mapa_solicitacoes
+    
+    def create(self, data):
+        """Cria a solicitação e a inclui nos índices de busca e de autocompletar"""
+        solicitacao_id = super().create(data)
+        atualizar_indice_busca(solicitacao_id)
+        autocompletar.registrar_valor('SISTEMA', data.get('SISTEMA'))
+        autocompletar.registrar_valor('MODULO', data.get('MODULO'))
+        return solicitacao_id
+    
+    def update(self, id, data):
+        """Atualiza a solicitação e reindexa se título/descrição mudaram"""
+        atualizado = super().update(id, data)
+        if atualizado and ('TITULO' in data or 'DESCRICAO' in data):
+            atualizar_indice_busca(id)
+        return atualizado
     
     def criar_solicitacao(self, dados):
         """Cria uma nova solicitação com validações"""
@@ -52,15 +104,20 @@ class SolicitacaoModel(BaseModel):
         }
         
         # Se foi resolvida, marca data de resolução
-        if self._is_status_finalizado(novo_status_id):
+        finalizado = self._is_status_finalizado(novo_status_id)
+        if finalizado:
             dados_update['DTHR_RESOLUCAO'] = datetime.now()
         
         # Se foi fechada, marca data de fechamento
-        if novo_status_id == 7:  # Status "Fechado"
+        if novo_status_id == STATUS_FECHADO:
             dados_update['DTHR_FECHAMENTO'] = datetime.now()
         
         self.update(solicitacao_id, dados_update)
         
+        # Finalizadas deixam de ser sugeridas como duplicatas
+        if finalizado:
+            indice_duplicatas.remover(solicitacao_id)
+        
         # Registra no histórico
         descricao = f"Status alterado para {self._get_nome_status(novo_status_id)}"
         if comentario:
@@ -70,13 +127,86 @@ class SolicitacaoModel(BaseModel):
         
         return True
     
-    def buscar_por_cliente(self, cliente_id, limit=None):
+    def atualizar_status_em_lote(self, ids, novo_status_id, tecnico_id, comentario=None):
+        """Muda o status de várias solicitações em uma transação (UPDATE por conjunto e histórico em lote)
+
+        Retorna os IDs atualizados, os que já estavam no status e os não encontrados.
+        """
+        ids = list(dict.fromkeys(ids))
+        agora = datetime.now()
+        
+        with db_connection() as con:
+            cur = con.cursor()
+            cur.execute("SELECT NOME, FINALIZADO, ATIVO FROM STATUS WHERE ID = ?", (novo_status_id,))
+            status = cur.fetchone()
+            if not status or not status[2]:
+                raise ValueError(f"Status {novo_status_id} não encontrado ou inativo")
+            nome_status, finalizado, _ = status
+            
+            # Situação atual de todas as solicitações, validada em memória
+            atuais = {}
+            for inicio in range(0, len(ids), TAMANHO_LOTE_IDS):
+                lote = ids[inicio:inicio + TAMANHO_LOTE_IDS]
+                cur.execute(
+                    f"SELECT ID, ID_STATUS FROM SOLICITACOES WHERE ID IN ({', '.join('?' for _ in lote)})", lote
+                )
+                atuais.update(cur.fetchall())
+            
+            nao_encontradas = [id for id in ids if id not in atuais]
+            sem_alteracao = [id for id in ids if atuais.get(id) == novo_status_id]
+            atualizar = [id for id in ids if id in atuais and atuais[id] != novo_status_id]
+            
+            if atualizar:
+                campos = {'ID_STATUS': novo_status_id, 'ID_TECNICO_RESPONSAVEL': tecnico_id, 'DTHR_ATUALIZACAO': agora}
+                if finalizado:
+                    campos['DTHR_RESOLUCAO'] = agora
+                if novo_status_id == STATUS_FECHADO:
+                    campos['DTHR_FECHAMENTO'] = agora
+                set_clause = ', '.join(f"{campo} = ?" for campo in campos)
+                
+                for inicio in range(0, len(atualizar), TAMANHO_LOTE_IDS):
+                    lote = atualizar[inicio:inicio + TAMANHO_LOTE_IDS]
+                    cur.execute(
+                        f"UPDATE SOLICITACOES SET {set_clause} WHERE ID IN ({', '.join('?' for _ in lote)})",
+                        list(campos.values()) + lote
+                    )
+                
+                descricao = f"Status alterado para {nome_status}"
+                if comentario:
+                    descricao += f" - {comentario}"
+                inserir_historico(cur, [{
+                    'ID_SOLICITACAO': id,
+                    'ID_USUARIO': tecnico_id,
+                    'TIPO_ACAO': 'MUDANCA_STATUS',
+                    'DESCRICAO': descricao,
+                    'DADOS_ANTERIORES': json.dumps({'ID_STATUS': atuais[id]}),
+                    'DADOS_NOVOS': json.dumps({'ID_STATUS': novo_status_id}),
+                    'DTHR_ACAO': agora
+                } for id in atualizar])
+            
+            con.commit()
+        
+        for id in atualizar:
+            self.mapa_identidade.invalidar(id)
+        if atualizar:
+            invalidar_respostas(self.table_name)
+        if finalizado:
+            indice_duplicatas.remover(*atualizar)
+        
+        return {
+            'atualizadas': atualizar,
+            'sem_alteracao': sem_alteracao,
+            'nao_encontradas': nao_encontradas
+        }
+    
+    def buscar_por_cliente(self, cliente_id, limit=None, incluir_arquivo=False):
         """Busca solicitações de um cliente específico"""
         return self.get_all(
             where="ID_CLIENTE = ?",
             params=(cliente_id,),
             order_by="DTHR_CRIACAO DESC",
-            limit=limit
+            limit=limit,
+            incluir_arquivo=incluir_arquivo
         )
     
     def buscar_por_tecnico(self, tecnico_id, limit=None):
@@ -106,34 +236,159 @@ class SolicitacaoModel(BaseModel):
             limit=limit
         )
     
-    def buscar_urgentes(self, limit=None):
+    def buscar_urgentes(self, limit=None, carregar_blobs=()):
         """Busca solicitações urgentes (próximas do prazo)"""
         prazo_limite = datetime.now() + timedelta(hours=24)
         return self.get_all(
             where="PRAZO_RESOLUCAO <= ? AND ID_STATUS NOT IN (6, 7, 8)",
             params=(prazo_limite,),
             order_by="PRAZO_RESOLUCAO ASC",
-            limit=limit
+            limit=limit,
+            carregar_blobs=carregar_blobs
         )
     
-    def buscar_vencidas(self, limit=None):
+    def buscar_vencidas(self, limit=None, carregar_blobs=()):
         """Busca solicitações vencidas"""
         return self.get_all(
             where="PRAZO_RESOLUCAO < ? AND ID_STATUS NOT IN (6, 7, 8)",
             params=(datetime.now(),),
             order_by="PRAZO_RESOLUCAO ASC",
-            limit=limit
+            limit=limit,
+            carregar_blobs=carregar_blobs
         )
     
-    def buscar_por_periodo(self, data_inicio, data_fim, limit=None):
+    def buscar_por_periodo(self, data_inicio, data_fim, limit=None, incluir_arquivo=False):
         """Busca solicitações criadas em um período"""
         return self.get_all(
             where="DTHR_CRIACAO BETWEEN ? AND ?",
             params=(data_inicio, data_fim),
             order_by="DTHR_CRIACAO DESC",
-            limit=limit
+            limit=limit,
+            incluir_arquivo=incluir_arquivo
         )
     
+    def linha_do_tempo(self, solicitacao_id, limite, antes=None, incluir_internos=True, incluir_arquivo=False):
+        """Histórico, comentários e anexos da solicitação em uma lista, do mais recente ao mais antigo
+
+        Cada fonte é lida já ordenada (até limite + 1 linhas, a partir da posição `antes`)
+        e as três são intercaladas com heapq.merge. Retorna os itens e a posição
+        (data, fonte, ID) do último item, para a página seguinte, ou None se não houver mais.
+        O histórico ainda no buffer deve ser descarregado antes (descarregar_historico).
+        """
+        with db_connection() as con:
+            fontes = [
+                self._eventos_fonte(con.cursor(), posicao, fonte, solicitacao_id, limite + 1, antes, incluir_internos, incluir_arquivo)
+                for posicao, fonte in enumerate(FONTES_LINHA_DO_TEMPO)
+            ]
+            eventos = list(islice(heapq.merge(*fontes, key=lambda evento: evento[0], reverse=True), limite + 1))
+        
+        proximo = eventos[limite - 1][0] if len(eventos) > limite else None
+        return [item for _, item in eventos[:limite]], proximo
+    
+    def _eventos_fonte(self, cur, posicao, fonte, solicitacao_id, limite, antes, incluir_internos, incluir_arquivo):
+        """(chave de ordenação, item) de uma fonte da linha do tempo, em ordem decrescente"""
+        tipo, tabela, tabela_arquivo, coluna_data, colunas = fonte
+        filtro = ["X.ID_SOLICITACAO = ?", f"X.{coluna_data} IS NOT NULL"]
+        params = [solicitacao_id]
+        if tipo == 'COMENTARIO' and not incluir_internos:
+            filtro.append("X.INTERNO IS DISTINCT FROM TRUE")
+        if antes is not None:
+            # Keyset pela chave (data, fonte, ID): só o que vem depois de `antes` na ordem decrescente
+            data, posicao_antes, id_antes = antes
+            if posicao < posicao_antes:
+                filtro.append(f"X.{coluna_data} <= ?")
+                params.append(data)
+            elif posicao == posicao_antes:
+                filtro.append(f"(X.{coluna_data} < ? OR (X.{coluna_data} = ? AND X.ID < ?))")
+                params += [data, data, id_antes]
+            else:
+                filtro.append(f"X.{coluna_data} < ?")
+                params.append(data)
+        
+        def select(nome_tabela):
+            return (
+                f"SELECT X.ID, X.{coluna_data} AS DTHR, X.ID_USUARIO, U.NOME AS NOME_USUARIO, "
+                f"{', '.join('X.' + coluna for coluna in colunas)} "
+                f"FROM {nome_tabela} X LEFT JOIN USUARIOS U ON U.ID = X.ID_USUARIO "
+                f"WHERE {' AND '.join(filtro)}"
+            )
+        
+        if incluir_arquivo:
+            query = f"SELECT * FROM ({select(tabela)} UNION ALL {select(tabela_arquivo)}) ORDER BY DTHR DESC, ID DESC ROWS {int(limite)}"
+            params *= 2
+        else:
+            query = f"{select(tabela)} ORDER BY X.{coluna_data} DESC, X.ID DESC ROWS {int(limite)}"
+        cur.execute(query, params)
+        
+        nomes = [descricao[0] for descricao in cur.description]
+        for row in cur.fetchall():
+            item = {'TIPO': tipo}
+            for nome, valor in zip(nomes, row):
+                if hasattr(valor, 'read') or isinstance(valor, bytes):
+                    valor = texto(valor)
+                if isinstance(valor, str) and valor.startswith(('{', '[')):
+                    try:
+                        valor = json.loads(valor)
+                    except ValueError:
+                        pass
+                item[nome] = valor.isoformat() if isinstance(valor, datetime) else valor
+            yield (row[1], posicao, row[0]), item
+    
+    def mudancas(self, posicao, limite):
+        """Solicitações alteradas e removidas depois da posição, na ordem em que mudaram
+
+        posicao: (DTHR_ATUALIZACAO, ID, DTHR_EXCLUSAO, ID) devolvida pela chamada anterior,
+        ou None para a sincronização completa. As leituras seguem os índices por data e ID,
+        então o custo depende só do que mudou. Retorna (alteradas, removidas, nova posição, mais);
+        as canceladas vêm em removidas.
+        """
+        with db_connection() as con:
+            cur = con.cursor()
+            # Alterações dos últimos segundos podem estar em transações ainda abertas: ficam para depois
+            # LOCALTIMESTAMP: sem fuso, como as colunas TIMESTAMP (CURRENT_TIMESTAMP tem fuso no Firebird 4)
+            cur.execute("SELECT LOCALTIMESTAMP FROM RDB$DATABASE")
+            corte = cur.fetchone()[0] - timedelta(seconds=config.MUDANCAS_MARGEM_SEGUNDOS)
+            
+            if posicao is None:
+                # Sincronização completa: todas as solicitações; exclusões só a partir de agora
+                posicao = (None, None, corte, 0)
+            data_alteracao, id_alteracao, data_exclusao, id_exclusao = posicao
+            
+            where, params = "DTHR_ATUALIZACAO <= ?", [corte]
+            if data_alteracao is not None:
+                where += " AND DTHR_ATUALIZACAO >= ? AND (DTHR_ATUALIZACAO > ? OR ID > ?)"
+                params += [data_alteracao, data_alteracao, id_alteracao]
+            # As linhas vão inteiras na resposta: BLOBs no mesmo SELECT
+            alteradas = self.get_all(where=where, params=params, order_by="DTHR_ATUALIZACAO, ID", limit=limite + 1, carregar_blobs=True)
+            
+            cur.execute(f"""
+                SELECT ID, ID_SOLICITACAO, MOTIVO, DTHR_EXCLUSAO FROM SOLICITACOES_EXCLUIDAS
+                WHERE DTHR_EXCLUSAO <= ? AND DTHR_EXCLUSAO >= ? AND (DTHR_EXCLUSAO > ? OR ID > ?)
+                ORDER BY DTHR_EXCLUSAO, ID ROWS {int(limite) + 1}
+            """, (corte, data_exclusao, data_exclusao, id_exclusao))
+            exclusoes = cur.fetchall()
+        
+        mais = len(alteradas) > limite or len(exclusoes) > limite
+        alteradas, exclusoes = alteradas[:limite], exclusoes[:limite]
+        if alteradas:
+            data_alteracao = datetime.fromisoformat(alteradas[-1]['DTHR_ATUALIZACAO'])
+            id_alteracao = alteradas[-1]['ID']
+        if exclusoes:
+            id_exclusao, data_exclusao = exclusoes[-1][0], exclusoes[-1][3]
+        
+        removidas = [
+            {'ID': id_solicitacao, 'MOTIVO': motivo, 'DTHR': dthr.isoformat()}
+            for _, id_solicitacao, motivo, dthr in exclusoes
+        ]
+        # Canceladas saem das listas como as arquivadas
+        removidas += [
+            {'ID': solicitacao['ID'], 'MOTIVO': 'CANCELADA', 'DTHR': solicitacao['DTHR_ATUALIZACAO']}
+            for solicitacao in alteradas if solicitacao['ID_STATUS'] == STATUS_CANCELADO
+        ]
+        alteradas = [solicitacao for solicitacao in alteradas if solicitacao['ID_STATUS'] != STATUS_CANCELADO]
+        
+        return alteradas, removidas, (data_alteracao, id_alteracao, data_exclusao, id_exclusao), mais
+    
     def get_dashboard_data(self):
         """Retorna dados para o dashboard"""
         with db_connection() as con:
@@ -237,10 +492,9 @@ class SolicitacaoModel(BaseModel):
     
     def _registrar_historico(self, solicitacao_id, usuario_id, tipo_acao, descricao):
         """Registra uma ação no histórico"""
-        from models.historico import HistoricoModel
+        from utils.auditoria import registrar_historico
         
-        historico = HistoricoModel()
-        historico.create({
+        registrar_historico({
             'ID_SOLICITACAO': solicitacao_id,
             'ID_USUARIO': usuario_id,
             'TIPO_ACAO': tipo_acao,
@@ -1,19 +1,139 @@
-from flask import Blueprint, request, jsonify
-from models.solicitacao import SolicitacaoModel
+from flask import Blueprint, request, jsonify, Response, stream_with_context, session, make_response, current_app
+from models.solicitacao import SolicitacaoModel, mapa_solicitacoes
 from models.historico import HistoricoModel
-from models.base import BaseModel
+from models.relatorio import RelatorioSLAModel, AGRUPAMENTOS
+from models.base import BaseModel, versao_linhas
+from models.knowledge_base import KnowledgeBaseModel, cache_consultas
 from utils.email_service import EmailService
-from database.connection import db_connection
-from datetime import datetime
+from utils.contadores import contadores
+from utils.busca import indice_busca
+from utils.autocompletar import autocompletar
+from utils.bloom import usuarios_conhecidos
+from utils.notificacoes import fila_notificacoes
+from utils.cache import cache_respostas
+from utils.duplicatas import indice_duplicatas, verificar_nova_solicitacao
+from utils.exportacao import exportar, formato_disponivel, FORMATOS as FORMATOS_EXPORTACAO
+from utils.importacao import importar, importar_usuarios, FORMATOS as FORMATOS_IMPORTACAO, FORMATOS_USUARIOS, TIPOS_USUARIO
+from database.connection import db_connection, conexao_compartilhada
+from utils.compressao_blob import comprimir, texto
+from utils.auditoria import descarregar_historico
+from datetime import datetime, timedelta
+from functools import wraps
+import base64
+import hashlib
 import json
+import config
 
 api_bp = Blueprint('api', __name__, url_prefix='/api/v1')
 
 # Instâncias dos modelos
 solicitacao_model = SolicitacaoModel()
 historico_model = HistoricoModel()
+relatorio_sla_model = RelatorioSLAModel()
+knowledge_base_model = KnowledgeBaseModel()
 email_service = EmailService()
 
+class RespostaComErro(Exception):
+    """Resposta 5xx de um endpoint em cache (permite servir a última resposta válida)"""
+    def __init__(self, resposta):
+        super().__init__(resposta.get_data(as_text=True)[:200])
+        self.resposta = resposta
+
+# Tabelas lidas pelo dashboard e pelas listas de urgentes/vencidas
+TAGS_PAINEL = ('SOLICITACOES', 'STATUS', 'PRIORIDADES', 'CATEGORIAS')
+
+def cache_resposta(ttl, tags):
+    """Guarda a resposta do endpoint GET por parâmetros e perfil da sessão"""
+    def decorador(funcao):
+        @wraps(funcao)
+        def wrapper(*args, **kwargs):
+            chave = (
+                request.endpoint,
+                tuple(sorted(request.args.items(multi=True))),
+                tuple(sorted(kwargs.items())),
+                session.get('usuario_tipo'),
+            )
+
+            def calcular():
+                resposta = make_response(funcao(*args, **kwargs))
+                if resposta.status_code >= 500:
+                    raise RespostaComErro(resposta)
+                corpo = resposta.get_data()
+                return corpo, resposta.status_code, resposta.mimetype, hashlib.sha1(corpo).hexdigest()[:24]
+
+            try:
+                (corpo, status, mimetype, etag), situacao = cache_respostas.obter_ou_calcular(
+                    chave, calcular, ttl, tags, grupo=request.endpoint
+                )
+            except RespostaComErro as e:
+                return e.resposta
+            if status == 200 and request.if_none_match.contains_weak(etag):
+                resposta = nao_modificado(etag)
+            else:
+                resposta = Response(corpo, status=status, mimetype=mimetype)
+                if status == 200:
+                    resposta.set_etag(etag)
+            resposta.headers['X-Cache'] = 'HIT' if situacao == 'COALESCED' else situacao
+            return resposta
+        return wrapper
+    return decorador
+
+def nao_modificado(etag):
+    resposta = Response(status=304)
+    resposta.set_etag(etag)
+    return resposta
+
+def responder_condicional(versao, gerar):
+    """304 se o cliente já tem a versão (If-None-Match); senão a resposta de gerar() com ETag"""
+    if request.if_none_match.contains_weak(versao):
+        return nao_modificado(versao)
+    resposta = make_response(gerar())
+    if resposta.status_code == 200:
+        resposta.set_etag(versao)
+    return resposta
+
+def codificar_posicao(valores):
+    """Token opaco (base64 de JSON) com uma posição de paginação/sincronização; datas em ISO"""
+    valores = [valor.isoformat() if isinstance(valor, datetime) else valor for valor in valores]
+    return base64.urlsafe_b64encode(json.dumps(valores).encode('utf-8')).decode('ascii').rstrip('=')
+
+def decodificar_posicao(token, datas=(0,), opcionais=()):
+    """Valores de codificar_posicao, com as posições em datas convertidas em datetime (ValueError se inválido)
+
+    Só as posições em opcionais podem ser nulas.
+    """
+    try:
+        valores = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+        for i in datas:
+            if valores[i] is not None or i not in opcionais:
+                valores[i] = datetime.fromisoformat(valores[i])
+        return valores
+    except Exception:
+        raise ValueError('Token de posição inválido')
+
+def arquivo_importacao():
+    """Arquivo enviado como multipart (campo "arquivo") ou como corpo da requisição, e o formato"""
+    arquivo = request.files.get('arquivo')
+    nome_arquivo = arquivo.filename if arquivo else ''
+    formato = request.args.get('formato') or nome_arquivo.rsplit('.', 1)[-1].lower()
+    return (arquivo.stream if arquivo else request.stream), formato
+
+def responder_importacao(eventos):
+    """Eventos da importação em JSON Lines, enviados à medida que os lotes são gravados"""
+    def gerar():
+        try:
+            for evento in eventos:
+                yield json.dumps(evento, ensure_ascii=False) + '\n'
+        except Exception as e:
+            print(f"❌ [IMPORTACAO] Importação interrompida: {e}")
+            yield json.dumps({'tipo': 'falha', 'error': str(e)}, ensure_ascii=False) + '\n'
+
+    # no-transform: comprimida, a resposta só sairia do buffer do compressor no final (sem progresso)
+    return Response(
+        stream_with_context(gerar()), mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-transform'}
+    )
+
 # =====================================================
 # ENDPOINTS DE SOLICITAÇÕES
 # =====================================================
@@ -28,6 +148,7 @@ def listar_solicitacoes():
         cliente_id = request.args.get('cliente_id', type=int)
         tecnico_id = request.args.get('tecnico_id', type=int)
         limit = request.args.get('limit', type=int, default=50)
+        incluir_arquivo = request.args.get('incluir_arquivo', 'false').lower() == 'true'
         
         # Constrói a query base
         where_conditions = []
@@ -50,20 +171,27 @@ def listar_solicitacoes():
             params.append(tecnico_id)
         
         where_clause = " AND ".join(where_conditions) if where_conditions else None
+        consulta = {
+            'where': where_clause,
+            'params': params,
+            'order_by': "DTHR_CRIACAO DESC",
+            'limit': limit,
+            'incluir_arquivo': incluir_arquivo
+        }
         
-        # Busca as solicitações
-        solicitacoes = solicitacao_model.get_all(
-            where=where_clause,
-            params=params,
-            order_by="DTHR_CRIACAO DESC",
-            limit=limit
-        )
+        def gerar():
+            # Busca as solicitações
+            # A resposta devolve as linhas inteiras: BLOBs no mesmo SELECT
+            solicitacoes = solicitacao_model.get_all(**consulta, carregar_blobs=True)
+            
+            return jsonify({
+                'success': True,
+                'data': solicitacoes,
+                'total': len(solicitacoes)
+            })
         
-        return jsonify({
-            'success': True,
-            'data': solicitacoes,
-            'total': len(solicitacoes)
-        })
+        # Versão pelas chaves e DTHR_ATUALIZACAO: sem mudanças, responde 304 sem ler as linhas
+        return responder_condicional(solicitacao_model.versao(**consulta), gerar)
         
     except Exception as e:
         return jsonify({
@@ -103,6 +231,12 @@ def criar_solicitacao():
         # Cria a solicitação
         solicitacao_id = solicitacao_model.criar_solicitacao(dados_banco)
         
+        # Vincula possíveis duplicatas em aberto (registradas no histórico)
+        duplicatas = verificar_nova_solicitacao(
+            solicitacao_id, dados_banco.get('CODIGO_REFERENCIA'), dados['titulo'], dados['descricao'],
+            dados['id_cliente'], dados.get('id_tecnico_criador')
+        )
+        
         # Envia email de confirmação
         try:
             email_service.enviar_confirmacao_abertura(solicitacao_id)
@@ -115,6 +249,7 @@ def criar_solicitacao():
         return jsonify({
             'success': True,
             'data': solicitacao,
+            'possiveis_duplicatas': duplicatas,
             'message': 'Solicitação criada com sucesso'
         }), 201
         
@@ -124,21 +259,26 @@ def criar_solicitacao():
             'error': str(e)
         }), 500
 
-@api_bp.route('/solicitacoes/<int:solicitacao_id>', methods=['GET'])
-def obter_solicitacao(solicitacao_id):
-    """Obtém uma solicitação específica"""
+@api_bp.route('/solicitacoes/duplicatas', methods=['POST'])
+def verificar_duplicatas():
+    """Sugere solicitações em aberto parecidas antes da abertura"""
     try:
-        solicitacao = solicitacao_model.get_by_id(solicitacao_id)
+        dados = request.get_json() or {}
         
-        if not solicitacao:
+        if not dados.get('titulo') and not dados.get('descricao'):
             return jsonify({
                 'success': False,
-                'error': 'Solicitação não encontrada'
-            }), 404
+                'error': 'Informe titulo e/ou descricao'
+            }), 400
+        
+        limite = min(request.args.get('limite', type=int, default=5), 20)
+        duplicatas = indice_duplicatas.candidatos(
+            dados.get('titulo'), dados.get('descricao'), dados.get('id_cliente'), limite=max(limite, 1)
+        )
         
         return jsonify({
             'success': True,
-            'data': solicitacao
+            'data': duplicatas
         })
         
     except Exception as e:
@@ -147,6 +287,40 @@ def obter_solicitacao(solicitacao_id):
             'error': str(e)
         }), 500
 
+@api_bp.route('/solicitacoes/<int:solicitacao_id>', methods=['GET'])
+def obter_solicitacao(solicitacao_id):
+    """Obtém uma solicitação específica"""
+    try:
+        incluir_arquivo = request.args.get('incluir_arquivo', 'false').lower() == 'true'
+        versao = solicitacao_model.versao(where="ID = ?", params=(solicitacao_id,), incluir_arquivo=incluir_arquivo)
+        
+        def gerar():
+            solicitacao = solicitacao_model.get_by_id(solicitacao_id, incluir_arquivo=incluir_arquivo, carregar_blobs=True)
+            
+            if solicitacao and versao_linhas([(solicitacao['ID'], solicitacao['DTHR_ATUALIZACAO'])]) != versao:
+                # Registro em cache anterior a uma alteração feita por outro processo
+                mapa_solicitacoes.invalidar(solicitacao_id)
+                solicitacao = solicitacao_model.get_by_id(solicitacao_id, incluir_arquivo=incluir_arquivo, carregar_blobs=True)
+            
+            if not solicitacao:
+                return jsonify({
+                    'success': False,
+                    'error': 'Solicitação não encontrada'
+                }), 404
+            
+            return jsonify({
+                'success': True,
+                'data': solicitacao
+            })
+        
+        return responder_condicional(versao, gerar)
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @api_bp.route('/solicitacoes/<int:solicitacao_id>', methods=['PUT'])
 def atualizar_solicitacao(solicitacao_id):
     """Atualiza uma solicitação"""
@@ -230,6 +404,94 @@ def atualizar_status_solicitacao(solicitacao_id):
             'error': str(e)
         }), 500
 
+@api_bp.route('/solicitacoes/status', methods=['PUT'])
+def atualizar_status_em_lote():
+    """Atualiza o status de várias solicitações em uma transação (emails enviados em segundo plano)"""
+    try:
+        dados = request.get_json() or {}
+        
+        ids = dados.get('ids')
+        novo_status_id = dados.get('novo_status_id')
+        tecnico_id = dados.get('tecnico_id')
+        comentario = dados.get('comentario')
+        
+        if not ids or not isinstance(ids, list) or not novo_status_id or not tecnico_id:
+            return jsonify({
+                'success': False,
+                'error': 'ids (lista), novo_status_id e tecnico_id são obrigatórios'
+            }), 400
+        
+        if len(ids) > config.STATUS_LOTE_MAXIMO:
+            return jsonify({
+                'success': False,
+                'error': f'Máximo de {config.STATUS_LOTE_MAXIMO} solicitações por chamada'
+            }), 400
+        
+        try:
+            ids = [int(id) for id in ids]
+        except (TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'error': 'ids deve conter apenas números inteiros'
+            }), 400
+        
+        try:
+            novo_status_id = int(novo_status_id)
+            tecnico_id = int(tecnico_id)
+        except (TypeError, ValueError):
+            return jsonify({
+                'success': False,
+                'error': 'novo_status_id e tecnico_id devem ser números inteiros'
+            }), 400
+        
+        try:
+            resultado = solicitacao_model.atualizar_status_em_lote(ids, novo_status_id, tecnico_id, comentario)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        for solicitacao_id in resultado['atualizadas']:
+            fila_notificacoes.enfileirar('enviar_atualizacao_status', solicitacao_id, novo_status_id, comentario)
+        
+        return jsonify({
+            'success': True,
+            'data': resultado,
+            'message': f"{len(resultado['atualizadas'])} solicitação(ões) atualizada(s)"
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@api_bp.route('/solicitacoes/importar', methods=['POST'])
+def importar_solicitacoes():
+    """Importa solicitações de um arquivo CSV ou JSON Lines, respondendo o progresso em JSON Lines"""
+    try:
+        fluxo, formato = arquivo_importacao()
+        if formato not in FORMATOS_IMPORTACAO:
+            return jsonify({
+                'success': False,
+                'error': f'Formato não suportado. Use formato={" ou ".join(FORMATOS_IMPORTACAO)}'
+            }), 400
+
+        return responder_importacao(importar(
+            fluxo,
+            formato,
+            separador=request.args.get('separador', ';'),
+            usuario_id=session.get('usuario_id'),
+            notificar=request.args.get('notificar', 'false').lower() == 'true'
+        ))
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @api_bp.route('/solicitacoes/<int:solicitacao_id>/comentarios', methods=['POST'])
 def adicionar_comentario(solicitacao_id):
     """Adiciona um comentário à solicitação"""
@@ -281,6 +543,7 @@ def adicionar_comentario(solicitacao_id):
 # =====================================================
 
 @api_bp.route('/dashboard', methods=['GET'])
+@cache_resposta(config.CACHE_RESPOSTAS_TTL_PAINEL, TAGS_PAINEL)
 def dashboard():
     """Retorna dados do dashboard"""
     try:
@@ -298,11 +561,12 @@ def dashboard():
         }), 500
 
 @api_bp.route('/solicitacoes/urgentes', methods=['GET'])
+@cache_resposta(config.CACHE_RESPOSTAS_TTL_PAINEL, TAGS_PAINEL)
 def solicitacoes_urgentes():
     """Retorna solicitações urgentes"""
     try:
         limit = request.args.get('limit', type=int, default=10)
-        solicitacoes = solicitacao_model.buscar_urgentes(limit)
+        solicitacoes = solicitacao_model.buscar_urgentes(limit, carregar_blobs=True)
         
         return jsonify({
             'success': True,
@@ -317,11 +581,12 @@ def solicitacoes_urgentes():
         }), 500
 
 @api_bp.route('/solicitacoes/vencidas', methods=['GET'])
+@cache_resposta(config.CACHE_RESPOSTAS_TTL_PAINEL, TAGS_PAINEL)
 def solicitacoes_vencidas():
     """Retorna solicitações vencidas"""
     try:
         limit = request.args.get('limit', type=int, default=10)
-        solicitacoes = solicitacao_model.buscar_vencidas(limit)
+        solicitacoes = solicitacao_model.buscar_vencidas(limit, carregar_blobs=True)
         
         return jsonify({
             'success': True,
@@ -335,11 +600,61 @@ def solicitacoes_vencidas():
             'error': str(e)
         }), 500
 
+@api_bp.route('/relatorios/sla', methods=['GET'])
+@api_bp.route('/relatorios/sla/<agrupamento>', methods=['GET'])
+def relatorio_sla(agrupamento=None):
+    """Retorna percentis de resolução, violação de prazo e backlog (geral ou agrupado)"""
+    try:
+        try:
+            data_inicio = request.args.get('data_inicio')
+            data_fim = request.args.get('data_fim')
+            data_inicio = datetime.fromisoformat(data_inicio) if data_inicio else None
+            data_fim = datetime.fromisoformat(data_fim) if data_fim else None
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'Datas devem estar no formato ISO (AAAA-MM-DD ou AAAA-MM-DDTHH:MM:SS)'
+            }), 400
+
+        if request.args.get('fonte') not in (None, 'analitico', 'oltp'):
+            return jsonify({
+                'success': False,
+                'error': 'Fonte inválida. Use: analitico, oltp'
+            }), 400
+
+        if agrupamento and agrupamento not in AGRUPAMENTOS:
+            return jsonify({
+                'success': False,
+                'error': f'Agrupamento inválido. Use: {", ".join(AGRUPAMENTOS)}'
+            }), 400
+
+        dados = relatorio_sla_model.calcular_sla(
+            agrupar_por=agrupamento,
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            categoria_id=request.args.get('categoria_id', type=int),
+            prioridade_id=request.args.get('prioridade_id', type=int),
+            fonte=request.args.get('fonte')
+        )
+
+        return jsonify({
+            'success': True,
+            'agrupamento': agrupamento,
+            'data': dados
+        })
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 # =====================================================
 # ENDPOINTS DE CATEGORIAS, PRIORIDADES E STATUS
 # =====================================================
 
 @api_bp.route('/categorias', methods=['GET'])
+@cache_resposta(config.CACHE_RESPOSTAS_TTL_CADASTROS, ('CATEGORIAS',))
 def listar_categorias():
     """Lista todas as categorias"""
     try:
@@ -363,6 +678,7 @@ def listar_categorias():
         }), 500
 
 @api_bp.route('/prioridades', methods=['GET'])
+@cache_resposta(config.CACHE_RESPOSTAS_TTL_CADASTROS, ('PRIORIDADES',))
 def listar_prioridades():
     """Lista todas as prioridades"""
     try:
@@ -386,6 +702,7 @@ def listar_prioridades():
         }), 500
 
 @api_bp.route('/status', methods=['GET'])
+@cache_resposta(config.CACHE_RESPOSTAS_TTL_CADASTROS, ('STATUS',))
 def listar_status():
     """Lista todos os status"""
     try:
@@ -417,12 +734,169 @@ def historico_solicitacao(solicitacao_id):
     """Retorna o histórico de uma solicitação"""
     try:
         limit = request.args.get('limit', type=int, default=50)
-        historico = historico_model.buscar_por_solicitacao(solicitacao_id, limit)
+        incluir_arquivo = request.args.get('incluir_arquivo', 'false').lower() == 'true'
+        
+        def gerar():
+            historico = historico_model.buscar_por_solicitacao(solicitacao_id, limit, incluir_arquivo=incluir_arquivo, carregar_blobs=True)
+            
+            return jsonify({
+                'success': True,
+                'data': historico,
+                'total': len(historico)
+            })
+        
+        versao = historico_model.versao_por_solicitacao(solicitacao_id, limit, incluir_arquivo=incluir_arquivo)
+        return responder_condicional(versao, gerar)
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@api_bp.route('/solicitacoes/<int:solicitacao_id>/completo', methods=['GET'])
+def solicitacao_completa(solicitacao_id):
+    """Solicitação com histórico, comentários e anexos em uma linha do tempo paginada (uma conexão)"""
+    try:
+        limite = min(max(request.args.get('limite', type=int, default=50), 1), 200)
+        incluir_arquivo = request.args.get('incluir_arquivo', 'false').lower() == 'true'
+        antes = request.args.get('antes')
+        try:
+            antes = decodificar_posicao(antes) if antes else None
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        # Grava o histórico pendente antes, para a transação de leitura enxergá-lo
+        descarregar_historico()
+        
+        with conexao_compartilhada():
+            solicitacao = solicitacao_model.get_by_id(solicitacao_id, incluir_arquivo=incluir_arquivo, carregar_blobs=True)
+            if not solicitacao:
+                return jsonify({
+                    'success': False,
+                    'error': 'Solicitação não encontrada'
+                }), 404
+            
+            # Clientes não veem os comentários internos
+            eventos, proximo = solicitacao_model.linha_do_tempo(
+                solicitacao_id, limite, antes,
+                incluir_internos=session.get('usuario_tipo') != 'CLIENTE',
+                incluir_arquivo=incluir_arquivo
+            )
+        
+        return jsonify({
+            'success': True,
+            'data': {
+                'solicitacao': solicitacao,
+                'linha_do_tempo': eventos,
+                'proximo': codificar_posicao(proximo) if proximo else None
+            }
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@api_bp.route('/solicitacoes/mudancas', methods=['GET'])
+def solicitacoes_mudancas():
+    """Sincronização incremental: solicitações alteradas e removidas desde o token da chamada anterior"""
+    try:
+        limite = min(max(request.args.get('limite', type=int, default=config.MUDANCAS_LIMITE), 1), config.MUDANCAS_LIMITE)
+        desde = request.args.get('desde')
+        try:
+            # Posição 0 é nula quando a sincronização completa não encontrou solicitações
+            posicao = decodificar_posicao(desde, datas=(0, 2), opcionais=(0,)) if desde else None
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        # Exclusões mais antigas que a retenção já foram apagadas: o cliente precisa sincronizar tudo
+        if posicao and posicao[2] < datetime.now() - timedelta(days=config.MUDANCAS_RETENCAO_DIAS):
+            return jsonify({
+                'success': False,
+                'error': 'Token expirado, faça a sincronização completa (sem o parâmetro desde)'
+            }), 410
+        
+        with conexao_compartilhada():
+            alteradas, removidas, posicao, mais = solicitacao_model.mudancas(posicao, limite)
+            
+            return jsonify({
+                'success': True,
+                'data': {
+                    'alteradas': alteradas,
+                    'removidas': removidas,
+                    'token': codificar_posicao(posicao),
+                    'mais': mais
+                }
+            })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# =====================================================
+# ENDPOINTS DE BUSCA
+# =====================================================
+
+@api_bp.route('/busca', methods=['GET'])
+def buscar_solicitacoes():
+    """Busca textual em título, descrição e comentários das solicitações"""
+    try:
+        consulta = request.args.get('q', '').strip()
+        pagina = request.args.get('pagina', type=int, default=1)
+        por_pagina = request.args.get('por_pagina', type=int, default=20)
+        
+        if not consulta:
+            return jsonify({
+                'success': False,
+                'error': 'Parâmetro q é obrigatório'
+            }), 400
+        
+        resultados, total = indice_busca.buscar(consulta, pagina, por_pagina)
+        
+        return jsonify({
+            'success': True,
+            'data': resultados,
+            'total': total,
+            'pagina': pagina,
+            'por_pagina': por_pagina
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@api_bp.route('/autocomplete', methods=['GET'])
+def autocomplete():
+    """Sugestões por prefixo para sistema, módulo e usuários (nome ou email)"""
+    try:
+        campo = request.args.get('campo', '')
+        limite = min(request.args.get('limite', type=int, default=10), 50)
+        
+        try:
+            sugestoes = autocompletar.sugerir(
+                campo, request.args.get('q', ''), max(limite, 1), request.args.get('tipo_usuario')
+            )
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
         
         return jsonify({
             'success': True,
-            'data': historico,
-            'total': len(historico)
+            'data': sugestoes
         })
         
     except Exception as e:
@@ -431,6 +905,267 @@ def historico_solicitacao(solicitacao_id):
             'error': str(e)
         }), 500
 
+# =====================================================
+# ENDPOINTS DA BASE DE CONHECIMENTO
+# =====================================================
+
+# Campos aceitos na criação/atualização de artigos
+CAMPOS_ARTIGO = ['TITULO', 'CONTEUDO', 'CATEGORIA', 'TAGS', 'ATIVO']
+
+@api_bp.route('/knowledge-base', methods=['GET'])
+def buscar_artigos():
+    """Busca artigos por texto, tag e categoria (sem q: mais visualizados)"""
+    try:
+        limite = min(request.args.get('limite', type=int, default=10), 50)
+        artigos = knowledge_base_model.buscar(
+            consulta=request.args.get('q', '').strip() or None,
+            tag=request.args.get('tag'),
+            categoria=request.args.get('categoria'),
+            limite=max(limite, 1)
+        )
+        
+        return jsonify({
+            'success': True,
+            'data': artigos
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@api_bp.route('/knowledge-base/tags', methods=['GET'])
+def listar_tags_artigos():
+    """Lista as tags dos artigos ativos com a quantidade de artigos"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': knowledge_base_model.tags()
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@api_bp.route('/knowledge-base/<int:artigo_id>', methods=['GET'])
+def obter_artigo(artigo_id):
+    """Obtém um artigo completo (conta uma visualização)"""
+    try:
+        artigo = knowledge_base_model.obter(artigo_id)
+        
+        if not artigo:
+            return jsonify({
+                'success': False,
+                'error': 'Artigo não encontrado'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'data': artigo
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@api_bp.route('/knowledge-base', methods=['POST'])
+def criar_artigo():
+    """Cria um artigo na base de conhecimento"""
+    try:
+        dados = request.get_json()
+        
+        for campo in ['titulo', 'conteudo', 'id_autor']:
+            if not dados.get(campo):
+                return jsonify({
+                    'success': False,
+                    'error': f'Campo obrigatório não informado: {campo}'
+                }), 400
+        
+        artigo = {campo: dados[campo.lower()] for campo in CAMPOS_ARTIGO if campo.lower() in dados}
+        artigo['ID_AUTOR'] = dados['id_autor']
+        artigo_id = knowledge_base_model.create(artigo)
+        
+        return jsonify({
+            'success': True,
+            'message': 'Artigo criado com sucesso',
+            'id': artigo_id
+        }), 201
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@api_bp.route('/knowledge-base/<int:artigo_id>', methods=['PUT'])
+def atualizar_artigo(artigo_id):
+    """Atualiza um artigo (ativo=false retira o artigo das buscas)"""
+    try:
+        dados = request.get_json()
+        
+        artigo = {campo: dados[campo.lower()] for campo in CAMPOS_ARTIGO if campo.lower() in dados}
+        if not artigo:
+            return jsonify({
+                'success': False,
+                'error': 'Nenhum campo para atualizar'
+            }), 400
+        
+        if not knowledge_base_model.update(artigo_id, artigo):
+            return jsonify({
+                'success': False,
+                'error': 'Artigo não encontrado'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            'data': knowledge_base_model.obter(artigo_id, registrar_visualizacao=False),
+            'message': 'Artigo atualizado com sucesso'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@api_bp.route('/knowledge-base/<int:artigo_id>/avaliar', methods=['POST'])
+def avaliar_artigo(artigo_id):
+    """Registra uma avaliação (1 a 5) do artigo"""
+    try:
+        nota = (request.get_json() or {}).get('nota')
+        
+        try:
+            knowledge_base_model.avaliar(artigo_id, nota)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        return jsonify({
+            'success': True,
+            'message': 'Avaliação registrada'
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@api_bp.route('/solicitacoes/<int:solicitacao_id>/artigos-sugeridos', methods=['GET'])
+def sugerir_artigos(solicitacao_id):
+    """Sugere artigos relacionados ao título e à descrição da solicitação"""
+    try:
+        solicitacao = solicitacao_model.get_by_id(solicitacao_id, carregar_blobs=('DESCRICAO',))
+        
+        if not solicitacao:
+            return jsonify({
+                'success': False,
+                'error': 'Solicitação não encontrada'
+            }), 404
+        
+        limite = min(request.args.get('limite', type=int, default=5), 20)
+        artigos = knowledge_base_model.sugerir(solicitacao['TITULO'], solicitacao['DESCRICAO'], max(limite, 1))
+        
+        return jsonify({
+            'success': True,
+            'data': artigos
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+# =====================================================
+# ENDPOINTS DE EXPORTAÇÃO
+# =====================================================
+
+# Filtros aceitos por exportação: parâmetro -> (condição SQL, conversor)
+FILTROS_EXPORTACAO = {
+    'solicitacoes': {
+        'status_id': ("ID_STATUS = ?", int),
+        'prioridade_id': ("ID_PRIORIDADE = ?", int),
+        'categoria_id': ("ID_CATEGORIA = ?", int),
+        'cliente_id': ("ID_CLIENTE = ?", int),
+        'tecnico_id': ("ID_TECNICO_RESPONSAVEL = ?", int),
+        'data_inicio': ("DTHR_CRIACAO >= ?", datetime.fromisoformat),
+        'data_fim': ("DTHR_CRIACAO <= ?", datetime.fromisoformat),
+    },
+    'historico': {
+        'solicitacao_id': ("ID_SOLICITACAO = ?", int),
+        'usuario_id': ("ID_USUARIO = ?", int),
+        'tipo_acao': ("TIPO_ACAO = ?", str),
+        'data_inicio': ("DTHR_ACAO >= ?", datetime.fromisoformat),
+        'data_fim': ("DTHR_ACAO <= ?", datetime.fromisoformat),
+    },
+}
+
+TABELAS_EXPORTACAO = {
+    'solicitacoes': ('SOLICITACOES', 'ID'),
+    'historico': ('HISTORICO', 'ID'),
+}
+
+@api_bp.route('/export/<recurso>', methods=['GET'])
+def exportar_recurso(recurso):
+    """Exporta solicitações ou histórico em streaming (csv, jsonl ou parquet)"""
+    try:
+        if recurso not in TABELAS_EXPORTACAO:
+            return jsonify({
+                'success': False,
+                'error': f'Recurso inválido. Use: {", ".join(TABELAS_EXPORTACAO)}'
+            }), 404
+
+        formato = request.args.get('formato', 'csv')
+        if not formato_disponivel(formato):
+            return jsonify({
+                'success': False,
+                'error': f'Formato não suportado: {formato}'
+            }), 400
+
+        condicoes = []
+        params = []
+        for parametro, (condicao, conversor) in FILTROS_EXPORTACAO[recurso].items():
+            valor = request.args.get(parametro)
+            if not valor:
+                continue
+            try:
+                params.append(conversor(valor))
+            except ValueError:
+                return jsonify({
+                    'success': False,
+                    'error': f'Valor inválido para {parametro}: {valor}'
+                }), 400
+            condicoes.append(condicao)
+
+        tabela, ordem = TABELAS_EXPORTACAO[recurso]
+        query = f"SELECT * FROM {tabela}"
+        if condicoes:
+            query += " WHERE " + " AND ".join(condicoes)
+        query += f" ORDER BY {ordem}"
+
+        mimetype, extensao = FORMATOS_EXPORTACAO[formato]
+        nome_arquivo = f"{recurso}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extensao}"
+
+        return Response(
+            stream_with_context(exportar(query, params, formato)),
+            mimetype=mimetype,
+            headers={'Content-Disposition': f'attachment; filename="{nome_arquivo}"'}
+        )
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 # =====================================================
 # ENDPOINTS DE EMAIL
 # =====================================================
@@ -467,6 +1202,82 @@ def enviar_email_solicitacao(solicitacao_id):
             'error': str(e)
         }), 500
 
+# =====================================================
+# REQUISIÇÕES EM LOTE
+# =====================================================
+
+# Subrequisições aceitas por chamada a POST /batch
+MAXIMO_SUBREQUISICOES = 20
+
+@api_bp.route('/batch', methods=['POST'])
+def executar_lote():
+    """Executa várias consultas GET da API em uma só requisição, com uma conexão compartilhada"""
+    try:
+        dados = request.get_json() or {}
+        requisicoes = dados.get('requisicoes')
+        
+        if not isinstance(requisicoes, list) or not requisicoes:
+            return jsonify({
+                'success': False,
+                'error': 'Informe requisicoes: lista de URLs (ou objetos com url) da API'
+            }), 400
+        
+        if len(requisicoes) > MAXIMO_SUBREQUISICOES:
+            return jsonify({
+                'success': False,
+                'error': f'Máximo de {MAXIMO_SUBREQUISICOES} requisições por lote'
+            }), 400
+        
+        urls = [item.get('url') if isinstance(item, dict) else item for item in requisicoes]
+        invalidas = [
+            url for url in urls
+            if not isinstance(url, str) or not url.startswith(api_bp.url_prefix + '/')
+            or url.split('?')[0].rstrip('/') == api_bp.url_prefix + '/batch'
+        ]
+        if invalidas:
+            return jsonify({
+                'success': False,
+                'error': f'URLs inválidas para o lote: {invalidas}'
+            }), 400
+        
+        # Grava o histórico pendente antes, para a transação de leitura enxergá-lo
+        descarregar_historico()
+        
+        # Uma conexão e uma transação de leitura para todas as subrequisições
+        with conexao_compartilhada():
+            resultados = [_executar_subrequisicao(url) for url in urls]
+        
+        return jsonify({
+            'success': True,
+            'data': resultados
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+def _executar_subrequisicao(url):
+    """Executa um GET da API no contexto atual (mesma sessão) e retorna status e corpo"""
+    caminho, _, query_string = url.partition('?')
+    with current_app.test_request_context(
+        caminho, method='GET', query_string=query_string,
+        headers={'Cookie': request.headers.get('Cookie', '')}
+    ):
+        resposta = current_app.full_dispatch_request()
+    
+    if resposta.is_streamed:
+        resposta.close()
+        return {'url': url, 'status': 400, 'body': {'success': False, 'error': 'Respostas em streaming não são suportadas em lote'}}
+    
+    corpo = resposta.get_json(silent=True)
+    return {
+        'url': url,
+        'status': resposta.status_code,
+        'body': corpo if corpo is not None else resposta.get_data(as_text=True)
+    }
+
 # =====================================================
 # ENDPOINTS DE ADMINISTRAÇÃO
 # =====================================================
@@ -510,6 +1321,26 @@ def admin_stats():
             'error': str(e)
         }), 500
 
+@api_bp.route('/admin/cache', methods=['GET'])
+def admin_cache():
+    """Retorna a ocupação e a taxa de acerto dos caches deste processo"""
+    try:
+        return jsonify({
+            'success': True,
+            'data': {
+                'respostas': cache_respostas.estatisticas(),
+                'solicitacoes_por_id': mapa_solicitacoes.estatisticas(),
+                'notificacoes': fila_notificacoes.estatisticas(),
+                'knowledge_base': cache_consultas.estatisticas()
+            }
+        })
+        
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @api_bp.route('/usuarios', methods=['GET'])
 def listar_usuarios():
     """Lista todos os usuários"""
@@ -518,13 +1349,15 @@ def listar_usuarios():
             cur = con.cursor()
             
             cur.execute("""
-                SELECT ID, NOME, EMAIL, CPF_CNPJ, TIPO_USUARIO, ATIVO, DTHR_CRIACAO
+                SELECT ID, NOME, EMAIL, CPF_CNPJ, TIPO_USUARIO, ATIVO, DTHR_CRIACAO, DTHR_ULTIMO_ACESSO
                 FROM USUARIOS 
                 ORDER BY NOME
             """)
             
             usuarios = []
             for row in cur.fetchall():
+                # Inclui os acessos ainda não gravados pelo agregador
+                usuario = contadores.aplicar('USUARIOS', {'ID': row[0], 'DTHR_ULTIMO_ACESSO': row[7]})
                 usuarios.append({
                     'ID': row[0],
                     'NOME': row[1],
@@ -532,7 +1365,8 @@ def listar_usuarios():
                     'CPF_CNPJ': row[3],
                     'TIPO_USUARIO': row[4],
                     'ATIVO': row[5],
-                    'DTHR_CRIACAO': row[6].isoformat() if row[6] else None
+                    'DTHR_CRIACAO': row[6].isoformat() if row[6] else None,
+                    'DTHR_ULTIMO_ACESSO': usuario['DTHR_ULTIMO_ACESSO'].isoformat() if usuario['DTHR_ULTIMO_ACESSO'] else None
                 })
             
             return jsonify({
@@ -564,13 +1398,22 @@ def criar_usuario():
         with db_connection() as con:
             cur = con.cursor()
             
-            # Verifica se email já existe
-            cur.execute("SELECT ID FROM USUARIOS WHERE EMAIL = ?", (dados['email'],))
-            if cur.fetchone():
-                return jsonify({
-                    'success': False,
-                    'error': 'Email já cadastrado'
-                }), 400
+            # Verifica se email/CPF já existem (só consulta o banco se o filtro de Bloom não descartar)
+            if usuarios_conhecidos.email_pode_existir(dados['email']):
+                cur.execute("SELECT ID FROM USUARIOS WHERE EMAIL = ?", (dados['email'],))
+                if cur.fetchone():
+                    return jsonify({
+                        'success': False,
+                        'error': 'Email já cadastrado'
+                    }), 400
+            
+            if dados.get('cpf_cnpj') and usuarios_conhecidos.documento_pode_existir(dados['cpf_cnpj']):
+                cur.execute("SELECT ID FROM USUARIOS WHERE CPF_CNPJ = ?", (dados['cpf_cnpj'],))
+                if cur.fetchone():
+                    return jsonify({
+                        'success': False,
+                        'error': 'CPF/CNPJ já cadastrado'
+                    }), 400
             
             # Insere o usuário
             cur.execute("""
@@ -586,6 +1429,7 @@ def criar_usuario():
             ))
             
             con.commit()
+            usuarios_conhecidos.registrar(dados['email'], dados.get('cpf_cnpj'))
             
             # Para Firebird, precisamos buscar o ID do usuário recém-criado
             cur.execute("""
@@ -595,6 +1439,8 @@ def criar_usuario():
             """, (dados['email'],))
             novo_id = cur.fetchone()[0]
             
+            autocompletar.atualizar_usuario(novo_id, dados['nome'], dados['email'], dados['tipo_usuario'])
+            
             return jsonify({
                 'success': True,
                 'message': 'Usuário criado com sucesso',
@@ -607,6 +1453,38 @@ def criar_usuario():
             'error': str(e)
         }), 500
 
+@api_bp.route('/usuarios/importar', methods=['POST'])
+def importar_usuarios_lote():
+    """Cadastra usuários de um arquivo CSV, JSON Lines ou JSON, respondendo o progresso em JSON Lines"""
+    try:
+        fluxo, formato = arquivo_importacao()
+        if formato not in FORMATOS_USUARIOS:
+            return jsonify({
+                'success': False,
+                'error': f'Formato não suportado. Use formato={", ".join(FORMATOS_USUARIOS)}'
+            }), 400
+
+        tipo_usuario = request.args.get('tipo_usuario', 'CLIENTE').upper()
+        if tipo_usuario not in TIPOS_USUARIO:
+            return jsonify({
+                'success': False,
+                'error': f'tipo_usuario inválido. Use: {", ".join(TIPOS_USUARIO)}'
+            }), 400
+
+        return responder_importacao(importar_usuarios(
+            fluxo,
+            formato,
+            separador=request.args.get('separador', ';'),
+            tipo_usuario=tipo_usuario,
+            empresa=request.args.get('empresa')
+        ))
+
+    except Exception as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @api_bp.route('/usuarios/<int:usuario_id>', methods=['PUT'])
 def atualizar_usuario(usuario_id):
     """Atualiza um usuário"""
@@ -641,6 +1519,11 @@ def atualizar_usuario(usuario_id):
             
             con.commit()
             
+            usuarios_conhecidos.registrar(dados.get('email'), dados.get('cpf_cnpj'))
+            autocompletar.atualizar_usuario(
+                usuario_id, dados.get('nome'), dados.get('email'), dados.get('tipo_usuario'), dados.get('ativo', True)
+            )
+            
             return jsonify({
                 'success': True,
                 'message': 'Usuário atualizado com sucesso'
@@ -660,7 +1543,7 @@ def toggle_usuario(usuario_id):
             cur = con.cursor()
             
             # Busca o status atual
-            cur.execute("SELECT ATIVO FROM USUARIOS WHERE ID = ?", (usuario_id,))
+            cur.execute("SELECT ATIVO, NOME, EMAIL, TIPO_USUARIO FROM USUARIOS WHERE ID = ?", (usuario_id,))
             result = cur.fetchone()
             
             if not result:
@@ -674,6 +1557,7 @@ def toggle_usuario(usuario_id):
             # Atualiza o status
             cur.execute("UPDATE USUARIOS SET ATIVO = ? WHERE ID = ?", (novo_status, usuario_id))
             con.commit()
+            autocompletar.atualizar_usuario(usuario_id, result[1], result[2], result[3], novo_status)
             
             return jsonify({
                 'success': True,
@@ -702,26 +1586,30 @@ def listar_templates_email():
                 ORDER BY NOME
             """)
             
-            templates = []
             rows = cur.fetchall()
             print(f"🔍 [API] Encontrados {len(rows)} templates no banco de dados.")
             
-            for row in rows:
-                print(f"🔍 [API] Template row: {row}")
-                templates.append({
-                    'id': row[0],
-                    'nome': row[1],
-                    'assunto': row[2],
-                    'ativo': row[3],
-                    'dthr_criacao': row[4].isoformat() if row[4] else None,
-                    'dthr_atualizacao': row[5].isoformat() if row[5] else None
+            def gerar():
+                templates = []
+                for row in rows:
+                    print(f"🔍 [API] Template row: {row}")
+                    templates.append({
+                        'id': row[0],
+                        'nome': row[1],
+                        'assunto': row[2],
+                        'ativo': row[3],
+                        'dthr_criacao': row[4].isoformat() if row[4] else None,
+                        'dthr_atualizacao': row[5].isoformat() if row[5] else None
+                    })
+                
+                print(f"🔍 [API] Retornando {len(templates)} templates para o frontend.")
+                return jsonify({
+                    'success': True,
+                    'templates': templates
                 })
             
-            print(f"🔍 [API] Retornando {len(templates)} templates para o frontend.")
-            return jsonify({
-                'success': True,
-                'templates': templates
-            })
+            # As colunas da listagem já são pequenas: a versão é o hash das próprias linhas
+            return responder_condicional(versao_linhas(rows), gerar)
             
     except Exception as e:
         print(f"❌ [API] Erro ao listar templates: {str(e)}")
@@ -754,7 +1642,7 @@ def criar_template_email():
             """, (
                 dados['nome'],
                 dados['assunto'],
-                dados['corpo_html'].encode('utf-8'),
+                comprimir(dados['corpo_html']),
                 dados.get('corpo_texto', '').encode('utf-8'),
                 json.dumps(dados.get('variaveis', [])),
                 dados.get('ativo', True)
@@ -790,7 +1678,7 @@ def obter_template_email(template_id):
                     'id': row[0],
                     'nome': row[1],
                     'assunto': row[2],
-                    'corpo_html': row[3].decode('utf-8') if row[3] else '',
+                    'corpo_html': texto(row[3]),
                     'corpo_texto': row[4].decode('utf-8') if row[4] else '',
                     'variaveis': json.loads(row[5]) if row[5] else [],
                     'ativo': row[6]
@@ -838,7 +1726,7 @@ def atualizar_template_email(template_id):
             """, (
                 dados['nome'],
                 dados['assunto'],
-                dados['corpo_html'].encode('utf-8'),
+                comprimir(dados['corpo_html']),
                 dados.get('corpo_texto', '').encode('utf-8'),
                 json.dumps(dados.get('variaveis', [])),
                 dados.get('ativo', True),
@@ -1,5 +1,7 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash, session
 from database.connection import db_connection
+from utils.contadores import contadores
+from datetime import datetime
 import re
 import hashlib
 
@@ -199,15 +201,10 @@ def login():
                 print(f"   usuario_tipo: {session['usuario_tipo']}")
                 print(f"   logado: {session['logado']}")
                 
-                # Atualiza último acesso
-                cur.execute("""
-                    UPDATE USUARIOS 
-                    SET DTHR_ULTIMO_ACESSO = CURRENT_TIMESTAMP 
-                    WHERE ID = ?
-                """, (usuario_id,))
-                con.commit()
+                # Atualiza último acesso (gravado em lote pelo agregador de contadores)
+                contadores.registrar_ultimo('USUARIOS', 'DTHR_ULTIMO_ACESSO', usuario_id, datetime.now())
                 
-                print("✅ [LOGIN] Último acesso atualizado")
+                print("✅ [LOGIN] Último acesso registrado")
                 flash(f'Bem-vindo(a), {nome}!', 'success')
                 
                 # Redireciona baseado no tipo de usuário
@@ -1,6 +1,7 @@
 from flask import Blueprint, render_template, session
 from routes.auth import login_required, admin_required
 from database.connection import db_connection
+from utils.compressao_blob import texto
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
@@ -99,7 +100,7 @@ def dashboard():
                     'ID': row[0],
                     'CODIGO_REFERENCIA': row[1],
                     'TITULO': row[2],
-                    'DESCRICAO': row[3].decode('utf-8') if row[3] else '',
+                    'DESCRICAO': texto(row[3]),
                     'ID_CLIENTE': row[4],
                     'ID_CATEGORIA': row[5],
                     'ID_PRIORIDADE': row[6],
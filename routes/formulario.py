@@ -3,6 +3,11 @@ from werkzeug.utils import secure_filename
 import os
 from utils.email_sender import enviar_email
 from database.connection import db_connection
+from utils.compressao_blob import comprimir
+from utils.busca import atualizar_indice_busca
+from utils.duplicatas import verificar_nova_solicitacao
+from utils.autocompletar import autocompletar
+from utils.cache import invalidar_respostas
 from routes.auth import login_required
 from datetime import datetime
 
@@ -64,6 +69,7 @@ def formulario():
                             VALUES ('Outro', ?, '#6B7280', 'fas fa-question', TRUE)
                         """, ('Outros tipos de solicitação'.encode('utf-8'),))
                         con.commit()
+                        invalidar_respostas('CATEGORIAS')
                         # Busca o ID da categoria recém-criada
                         cur.execute("""
                             SELECT ID FROM CATEGORIAS 
@@ -130,7 +136,7 @@ def formulario():
                         DTHR_CRIACAO, DTHR_ATUALIZACAO
                     ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
                 """, (
-                    codigo_referencia, tipo, descricao.encode('utf-8'), usuario_id, categoria_id,
+                    codigo_referencia, tipo, comprimir(descricao), usuario_id, categoria_id,
                     prioridade_id, status_id, sistema, prazo_resolucao
                 ))
                 
@@ -166,6 +172,12 @@ def formulario():
                         # Continua sem registrar o anexo
                 
                 con.commit()
+                invalidar_respostas('SOLICITACOES')
+                atualizar_indice_busca(solicitacao_id)
+                autocompletar.registrar_valor('SISTEMA', sistema)
+                duplicatas = verificar_nova_solicitacao(
+                    solicitacao_id, codigo_referencia, tipo, descricao, usuario_id
+                )
 
                 # Envia email de confirmação
                 try:
@@ -179,7 +191,9 @@ def formulario():
                                      codigo_referencia=codigo_referencia,
                                      data_criacao=data_atual.strftime('%d/%m/%Y %H:%M'),
                                      sistema=sistema,
-                                     tipo=tipo)
+                                     tipo=tipo,
+                                     # O cliente só vê as próprias solicitações
+                                     duplicatas=[d for d in duplicatas if d['MESMO_CLIENTE']])
                 
         except Exception as e:
             flash(f'Ocorreu um erro ao processar a solicitação: {str(e)}', 'error')
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Script de arquivamento de solicitações finalizadas
+
+Uso:
+    python scripts/arquivar_solicitacoes.py                # arquiva com ARQUIVAMENTO_DIAS
+    python scripts/arquivar_solicitacoes.py --dias 365
+    python scripts/arquivar_solicitacoes.py --simular      # apenas conta as pendentes
+"""
+
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from utils.arquivamento import ArquivamentoSolicitacoes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Arquiva solicitações fechadas/canceladas antigas")
+    parser.add_argument('--dias', type=int, default=config.ARQUIVAMENTO_DIAS,
+                        help='Idade mínima (dias desde a última atualização)')
+    parser.add_argument('--lote', type=int, default=config.ARQUIVAMENTO_TAMANHO_LOTE,
+                        help='Solicitações movidas por transação')
+    parser.add_argument('--max-lotes', type=int, default=None, help='Interrompe após N lotes')
+    parser.add_argument('--simular', action='store_true', help='Apenas informa quantas seriam arquivadas')
+    args = parser.parse_args()
+
+    arquivamento = ArquivamentoSolicitacoes(dias=args.dias, tamanho_lote=args.lote)
+
+    try:
+        if args.simular:
+            print(f"🔍 {arquivamento.contar_pendentes()} solicitações finalizadas há mais de {args.dias} dias")
+            sys.exit(0)
+
+        print(f"📦 Arquivando solicitações finalizadas há mais de {args.dias} dias (lotes de {args.lote})...")
+        inicio = time.perf_counter()
+        resumo = arquivamento.executar(limite_lotes=args.max_lotes)
+
+        for tabela, total in resumo.items():
+            print(f"  - {tabela}: {total} linhas movidas para {tabela}_ARQUIVO")
+        removidas = arquivamento.remover_exclusoes_antigas()
+        print(f"  - SOLICITACOES_EXCLUIDAS: {removidas} registro(s) com mais de {config.MUDANCAS_RETENCAO_DIAS} dias removido(s)")
+        print(f"✅ Arquivamento concluído em {time.perf_counter() - inicio:.1f}s")
+    except Exception as e:
+        print(f"❌ Erro no arquivamento: {e}")
+        sys.exit(1)
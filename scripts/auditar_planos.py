@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Script para auditar os planos de execução das consultas do SAOS
+
+Uso:
+    python scripts/auditar_planos.py              # relatório com problemas e sugestões
+    python scripts/auditar_planos.py --atualizar  # grava os planos atuais no snapshot
+    python scripts/auditar_planos.py --verificar  # falha (exit 1) se algum plano mudou
+
+O modo --verificar (ou scripts/test_planos_consulta.py) deve rodar no build:
+qualquer alteração de plano precisa ser revisada e aceita explicitamente com
+--atualizar, e o snapshot gerado (database/planos_consulta.json) versionado.
+"""
+
+import sys
+import os
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.planos_consulta import (
+    coletar_consultas, obter_planos, carregar_indices_schema, analisar,
+    carregar_snapshot, gravar_snapshot, comparar_snapshot, ARQUIVO_SNAPSHOT
+)
+
+def relatorio(consultas, planos):
+    """Exibe problemas e sugestões de índices por consulta"""
+    indices = carregar_indices_schema()
+    sugestoes_unicas = set()
+    total_problemas = 0
+    
+    for chave in sorted(consultas):
+        problemas, sugestoes = analisar(consultas[chave], planos[chave], indices)
+        if not problemas:
+            continue
+        
+        total_problemas += 1
+        print(f"\n⚠️ {chave}")
+        print(f"   SQL:   {consultas[chave]}")
+        print(f"   PLANO: {planos[chave]}")
+        for problema in problemas:
+            print(f"   - {problema}")
+        for sugestao in sugestoes:
+            print(f"   💡 {sugestao}")
+            sugestoes_unicas.add(sugestao)
+    
+    print(f"\n🔍 {len(consultas)} consultas auditadas, {total_problemas} com problemas")
+    if sugestoes_unicas:
+        print("\n💡 Índices sugeridos:")
+        for sugestao in sorted(sugestoes_unicas):
+            print(f"   {sugestao}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Auditoria de planos de execução")
+    grupo = parser.add_mutually_exclusive_group()
+    grupo.add_argument('--atualizar', action='store_true', help='Grava os planos atuais no snapshot')
+    grupo.add_argument('--verificar', action='store_true', help='Compara com o snapshot e falha se houver diferenças')
+    args = parser.parse_args()
+    
+    consultas = coletar_consultas()
+    print(f"🔍 {len(consultas)} consultas encontradas no código")
+    
+    try:
+        planos = obter_planos(consultas)
+    except Exception as e:
+        print(f"❌ Erro ao obter planos: {e}")
+        sys.exit(2)
+    
+    if args.atualizar:
+        gravar_snapshot(consultas, planos)
+        print(f"✅ Snapshot atualizado: {ARQUIVO_SNAPSHOT}")
+    elif args.verificar:
+        snapshot = carregar_snapshot()
+        if not snapshot:
+            print(f"❌ Snapshot inexistente. Gere com --atualizar: {ARQUIVO_SNAPSHOT}")
+            sys.exit(1)
+        
+        divergencias = comparar_snapshot(consultas, planos, snapshot)
+        for divergencia in divergencias:
+            print(f"❌ {divergencia}")
+        
+        if divergencias:
+            print(f"\n❌ {len(divergencias)} divergência(s) de plano. Revise e rode --atualizar se forem esperadas.")
+            sys.exit(1)
+        print("✅ Todos os planos conferem com o snapshot")
+    else:
+        relatorio(consultas, planos)
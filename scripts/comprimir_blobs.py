@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Script de backfill da compressão de colunas BLOB
+
+Regrava comprimidos os valores antigos das colunas listadas em
+utils.compressao_blob.COLUNAS_COMPRIMIDAS. Pode ser interrompido e executado
+novamente: valores já comprimidos ou abaixo do limite não são alterados.
+
+Uso:
+    python scripts/comprimir_blobs.py                      # todas as tabelas
+    python scripts/comprimir_blobs.py --tabela HISTORICO
+    python scripts/comprimir_blobs.py --descomprimir       # desfaz a compressão
+"""
+
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import db_connection
+from utils.compressao_blob import COLUNAS_COMPRIMIDAS, comprimir, descomprimir, esta_comprimido
+
+TAMANHO_LOTE = 500
+
+def processar_tabela(tabela, colunas, descomprimir_valores=False):
+    """Regrava os valores da tabela em lotes por ID e retorna (lidas, alteradas, bytes antes, bytes depois)"""
+    lista_colunas = ', '.join(colunas)
+    set_clause = ', '.join(f"{coluna} = ?" for coluna in colunas)
+    ultimo_id = 0
+    lidas = alteradas = bytes_antes = bytes_depois = 0
+
+    with db_connection() as con:
+        cur = con.cursor()
+        while True:
+            cur.execute(f"""
+                SELECT ID, {lista_colunas} FROM {tabela}
+                WHERE ID > ? ORDER BY ID ROWS {TAMANHO_LOTE}
+            """, (ultimo_id,))
+            rows = cur.fetchall()
+            if not rows:
+                break
+
+            atualizacoes = []
+            for row in rows:
+                originais = [_ler(valor) for valor in row[1:]]
+                if descomprimir_valores:
+                    novos = [descomprimir(valor) if esta_comprimido(valor) else valor for valor in originais]
+                else:
+                    novos = [comprimir(valor) for valor in originais]
+
+                if novos != originais:
+                    atualizacoes.append(novos + [row[0]])
+                    bytes_antes += sum(len(valor) for valor in originais if isinstance(valor, bytes))
+                    bytes_depois += sum(len(valor) for valor in novos if isinstance(valor, bytes))
+
+            if atualizacoes:
+                # Não altera DTHR_ATUALIZACAO (arquivamento e snapshot dependem dela)
+                cur.execute("SELECT RDB$SET_CONTEXT('USER_TRANSACTION', 'SAOS_MANUTENCAO', '1') FROM RDB$DATABASE")
+                cur.executemany(f"UPDATE {tabela} SET {set_clause} WHERE ID = ?", atualizacoes)
+            con.commit()
+
+            lidas += len(rows)
+            alteradas += len(atualizacoes)
+            ultimo_id = rows[-1][0]
+
+    return lidas, alteradas, bytes_antes, bytes_depois
+
+def _ler(valor):
+    """Lê o valor bruto gravado (sem descomprimir) como bytes"""
+    if hasattr(valor, 'read'):
+        leitor = valor
+        try:
+            valor = leitor.read()
+        finally:
+            leitor.close()
+    if isinstance(valor, str):
+        return valor.encode('utf-8')
+    return valor
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Comprime (ou descomprime) os BLOBs já gravados")
+    parser.add_argument('--tabela', choices=sorted(COLUNAS_COMPRIMIDAS), help='Processa apenas esta tabela')
+    parser.add_argument('--descomprimir', action='store_true', help='Regrava os valores sem compressão')
+    args = parser.parse_args()
+
+    tabelas = [args.tabela] if args.tabela else list(COLUNAS_COMPRIMIDAS)
+    acao = "Descomprimindo" if args.descomprimir else "Comprimindo"
+
+    try:
+        for tabela in tabelas:
+            colunas = COLUNAS_COMPRIMIDAS[tabela]
+            print(f"🔄 {acao} {tabela} ({', '.join(colunas)})...")
+            inicio = time.perf_counter()
+            lidas, alteradas, antes, depois = processar_tabela(tabela, colunas, args.descomprimir)
+            print(f"✅ {tabela}: {alteradas}/{lidas} linhas regravadas, "
+                  f"{antes / 1024:.0f} KB -> {depois / 1024:.0f} KB ({time.perf_counter() - inicio:.1f}s)")
+
+        if not args.descomprimir:
+            print("💡 O espaço liberado é reaproveitado após o próximo sweep (scripts/manutencao_indices.py)")
+    except Exception as e:
+        print(f"❌ Erro no backfill: {e}")
+        sys.exit(1)
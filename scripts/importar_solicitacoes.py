@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Importação de solicitações a partir de CSV ou JSON Lines
+
+O arquivo é lido em streaming e gravado em lotes (ver utils/importacao.py);
+arquivos de qualquer tamanho usam a mesma memória. As linhas rejeitadas são
+listadas com o número da linha e o motivo, e podem ser gravadas em um arquivo.
+
+Colunas: titulo, descricao, id_categoria|categoria, id_prioridade|prioridade,
+id_cliente|email_cliente e, opcionais, id_status|status,
+id_tecnico_responsavel|email_tecnico_responsavel, sistema, modulo, urgente,
+confidencial, dthr_criacao, dthr_resolucao, dthr_fechamento e
+codigo_referencia.
+
+Uso:
+    python scripts/importar_solicitacoes.py chamados.csv
+    python scripts/importar_solicitacoes.py chamados.jsonl --notificar
+    python scripts/importar_solicitacoes.py chamados.csv --separador , --erros erros.jsonl
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.importacao import importar, FORMATOS
+from utils.notificacoes import fila_notificacoes
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importa solicitações de um arquivo CSV ou JSON Lines")
+    parser.add_argument('arquivo', help='Arquivo .csv ou .jsonl')
+    parser.add_argument('--formato', choices=FORMATOS, help='Formato do arquivo (padrão: pela extensão)')
+    parser.add_argument('--separador', default=';', help="Separador do CSV (padrão: ';')")
+    parser.add_argument('--usuario-id', type=int, help='Usuário registrado no histórico como autor da importação')
+    parser.add_argument('--notificar', action='store_true', help='Envia o email de abertura aos clientes')
+    parser.add_argument('--erros', help='Grava as linhas rejeitadas neste arquivo (JSON Lines)')
+    args = parser.parse_args()
+
+    formato = args.formato or args.arquivo.rsplit('.', 1)[-1].lower()
+    if formato not in FORMATOS:
+        print(f"❌ Formato não reconhecido: {formato} (use --formato {'|'.join(FORMATOS)})")
+        sys.exit(1)
+
+    saida_erros = open(args.erros, 'w', encoding='utf-8') if args.erros else None
+    inicio = time.perf_counter()
+    try:
+        with open(args.arquivo, 'rb') as arquivo:
+            print(f"🔄 Importando {args.arquivo}...")
+            for evento in importar(arquivo, formato, args.separador, args.usuario_id, args.notificar):
+                if evento['tipo'] == 'erro':
+                    if saida_erros:
+                        saida_erros.write(json.dumps(evento, ensure_ascii=False) + '\n')
+                    else:
+                        print(f"⚠️ Linha {evento['linha']}: {evento['erro']}")
+                elif evento['tipo'] == 'progresso':
+                    print(f"   {evento['lidas']} lidas, {evento['importadas']} importadas, {evento['erros']} com erro "
+                          f"({time.perf_counter() - inicio:.1f}s)")
+                else:
+                    print(f"✅ {evento['importadas']}/{evento['lidas']} solicitação(ões) importada(s), "
+                          f"{evento['erros']} linha(s) rejeitada(s) em {time.perf_counter() - inicio:.1f}s")
+
+        if args.notificar:
+            print(f"📧 Enviando {fila_notificacoes.estatisticas()['pendentes']} email(s) de abertura...")
+    except Exception as e:
+        print(f"❌ Erro na importação: {e}")
+        sys.exit(1)
+    finally:
+        if saida_erros:
+            saida_erros.close()
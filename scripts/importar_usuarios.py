@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Cadastro de usuários em lote a partir de CSV, JSON Lines ou JSON
+
+Usado na entrada de uma empresa cliente: CPF/CNPJ são validados para o lote
+inteiro de uma vez, emails/documentos já cadastrados são rejeitados e os novos
+usuários são gravados em lotes (ver utils/importacao.py). A senha é definida
+pelo usuário no primeiro acesso.
+
+Colunas: nome, email e, opcionais, cpf_cnpj, telefone, tipo_usuario
+(CLIENTE, TECNICO ou ADMIN), empresa, departamento e cargo.
+
+Uso:
+    python scripts/importar_usuarios.py funcionarios.csv --empresa "ACME Ltda"
+    python scripts/importar_usuarios.py tecnicos.json --tipo-usuario TECNICO
+    python scripts/importar_usuarios.py funcionarios.csv --erros rejeitados.jsonl
+"""
+
+import sys
+import os
+import json
+import time
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.importacao import importar_usuarios, FORMATOS_USUARIOS, TIPOS_USUARIO
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cadastra usuários de um arquivo CSV, JSON Lines ou JSON")
+    parser.add_argument('arquivo', help='Arquivo .csv, .jsonl ou .json')
+    parser.add_argument('--formato', choices=FORMATOS_USUARIOS, help='Formato do arquivo (padrão: pela extensão)')
+    parser.add_argument('--separador', default=';', help="Separador do CSV (padrão: ';')")
+    parser.add_argument('--tipo-usuario', choices=TIPOS_USUARIO, default='CLIENTE',
+                        help='Tipo das linhas sem tipo_usuario (padrão: CLIENTE)')
+    parser.add_argument('--empresa', help='Empresa das linhas sem a coluna empresa')
+    parser.add_argument('--erros', help='Grava as linhas rejeitadas neste arquivo (JSON Lines)')
+    args = parser.parse_args()
+
+    formato = args.formato or args.arquivo.rsplit('.', 1)[-1].lower()
+    if formato not in FORMATOS_USUARIOS:
+        print(f"❌ Formato não reconhecido: {formato} (use --formato {'|'.join(FORMATOS_USUARIOS)})")
+        sys.exit(1)
+
+    saida_erros = open(args.erros, 'w', encoding='utf-8') if args.erros else None
+    inicio = time.perf_counter()
+    try:
+        with open(args.arquivo, 'rb') as arquivo:
+            print(f"🔄 Importando {args.arquivo}...")
+            for evento in importar_usuarios(arquivo, formato, args.separador, args.tipo_usuario, args.empresa):
+                if evento['tipo'] == 'erro':
+                    if saida_erros:
+                        saida_erros.write(json.dumps(evento, ensure_ascii=False) + '\n')
+                    else:
+                        print(f"⚠️ Linha {evento['linha']}: {evento['erro']}")
+                elif evento['tipo'] == 'progresso':
+                    print(f"   {evento['lidas']} lidos, {evento['importadas']} cadastrados, {evento['erros']} com erro "
+                          f"({time.perf_counter() - inicio:.1f}s)")
+                else:
+                    print(f"✅ {evento['importadas']}/{evento['lidas']} usuário(s) cadastrado(s), "
+                          f"{evento['erros']} linha(s) rejeitada(s) em {time.perf_counter() - inicio:.1f}s")
+    except Exception as e:
+        print(f"❌ Erro na importação: {e}")
+        sys.exit(1)
+    finally:
+        if saida_erros:
+            saida_erros.close()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Script de manutenção do índice de busca textual
+
+Uso:
+    python scripts/indice_busca.py                 # sincroniza o que mudou
+    python scripts/indice_busca.py --reconstruir   # recria o índice inteiro
+    python scripts/indice_busca.py --continuo      # sincroniza a cada BUSCA_INTERVALO_SEGUNDOS
+    python scripts/indice_busca.py --buscar "impressora não imprime"
+    python scripts/indice_busca.py --artigos       # recria tags e índice da base de conhecimento
+"""
+
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from utils.busca import indice_busca
+from models.knowledge_base import KnowledgeBaseModel
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manutenção do índice de busca textual")
+    parser.add_argument('--reconstruir', action='store_true', help='Recria o índice a partir do banco')
+    parser.add_argument('--continuo', action='store_true', help='Sincroniza continuamente no intervalo configurado')
+    parser.add_argument('--intervalo', type=int, default=config.BUSCA_INTERVALO_SEGUNDOS,
+                        help='Intervalo entre sincronizações em segundos (modo contínuo)')
+    parser.add_argument('--buscar', metavar='CONSULTA', help='Executa uma busca de teste')
+    parser.add_argument('--artigos', action='store_true',
+                        help='Recria KNOWLEDGE_BASE_TAGS e o índice dos artigos da base de conhecimento')
+    args = parser.parse_args()
+
+    try:
+        if args.buscar:
+            inicio = time.perf_counter()
+            resultados, total = indice_busca.buscar(args.buscar)
+            print(f"🔍 {total} resultado(s) em {(time.perf_counter() - inicio) * 1000:.1f} ms")
+            for resultado in resultados:
+                print(f"  - [{resultado['RELEVANCIA']:.2f}] {resultado['CODIGO_REFERENCIA']} {resultado['TITULO']}")
+            sys.exit(0)
+
+        if args.artigos:
+            inicio = time.perf_counter()
+            total = KnowledgeBaseModel().reconstruir_indices()
+            print(f"✅ {total} artigo(s) indexado(s) em {time.perf_counter() - inicio:.1f}s")
+            sys.exit(0)
+
+        if args.reconstruir:
+            print("🔄 Reconstruindo o índice de busca...")
+            inicio = time.perf_counter()
+            total = indice_busca.reconstruir()
+            print(f"✅ {total} solicitações indexadas em {time.perf_counter() - inicio:.1f}s")
+    except Exception as e:
+        print(f"❌ Erro no índice de busca: {e}")
+        sys.exit(1)
+
+    while not args.reconstruir or args.continuo:
+        try:
+            inicio = time.perf_counter()
+            total = indice_busca.sincronizar()
+            print(f"✅ Sincronização: {total} solicitação(ões) reindexada(s) em {time.perf_counter() - inicio:.1f}s")
+        except Exception as e:
+            print(f"❌ Erro na sincronização do índice: {e}")
+            if not args.continuo:
+                sys.exit(1)
+
+        if not args.continuo:
+            break
+        time.sleep(args.intervalo)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Script de manutenção do banco: estatísticas de índices e sweep
+
+Uso:
+    python scripts/manutencao_indices.py               # estatísticas + sweep se necessário
+    python scripts/manutencao_indices.py --sem-sweep   # apenas estatísticas e indicadores
+    python scripts/manutencao_indices.py --forcar-sweep
+    python scripts/manutencao_indices.py --continuo    # repete a cada MANUTENCAO_INTERVALO_SEGUNDOS
+"""
+
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from utils.manutencao_banco import (
+    atualizar_estatisticas_indices, coletar_indicadores, precisa_sweep, executar_sweep
+)
+
+def exibir_indicadores(indicadores):
+    """Exibe contadores de transações e de versões de registro"""
+    print(f"  OIT={indicadores['oit']} OAT={indicadores['oat']} OST={indicadores['ost']} "
+          f"Próxima={indicadores['proxima_transacao']} (intervalo de sweep: {indicadores['intervalo_sweep']})")
+    print(f"  Gap OIT/OST: {indicadores['gap_oit_ost']} | Gap OAT/Próxima: {indicadores['gap_oat_proxima']}")
+    for tabela, dados in sorted(indicadores['tabelas'].items()):
+        print(f"  - {tabela}: {dados['leituras']} leituras, {dados['leituras_versoes']} em versões antigas "
+              f"({dados['proporcao_versoes']:.1%}), backouts={dados['backouts']}, "
+              f"purges={dados['purges']}, expunges={dados['expunges']}")
+
+def executar_manutencao(sem_sweep=False, forcar_sweep=False):
+    """Executa um ciclo completo de manutenção"""
+    inicio = time.perf_counter()
+    
+    print("📊 Indicadores antes da manutenção:")
+    antes = coletar_indicadores()
+    exibir_indicadores(antes)
+    
+    print("🔄 Atualizando estatísticas dos índices...")
+    for indice, seletividade_antes, seletividade_depois, duracao in atualizar_estatisticas_indices():
+        print(f"  - {indice}: {seletividade_antes} -> {seletividade_depois} ({duracao * 1000:.0f} ms)")
+    
+    motivos = precisa_sweep(antes)
+    if forcar_sweep:
+        motivos.append("sweep forçado por parâmetro")
+    
+    if motivos and not sem_sweep:
+        print("🧹 Executando sweep:")
+        for motivo in motivos:
+            print(f"  - {motivo}")
+        duracao = executar_sweep()
+        print(f"✅ Sweep concluído em {duracao:.1f}s")
+        
+        print("📊 Indicadores após o sweep:")
+        exibir_indicadores(coletar_indicadores())
+    elif motivos:
+        print("⚠️ Sweep recomendado, mas desativado (--sem-sweep):")
+        for motivo in motivos:
+            print(f"  - {motivo}")
+    else:
+        print("✅ Nenhum limite ultrapassado - sweep não necessário")
+    
+    print(f"✅ Manutenção concluída em {time.perf_counter() - inicio:.1f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manutenção de índices e sweep do Firebird")
+    parser.add_argument('--sem-sweep', action='store_true', help='Nunca executa o sweep')
+    parser.add_argument('--forcar-sweep', action='store_true', help='Executa o sweep mesmo abaixo dos limites')
+    parser.add_argument('--continuo', action='store_true', help='Executa continuamente no intervalo configurado')
+    parser.add_argument('--intervalo', type=int, default=config.MANUTENCAO_INTERVALO_SEGUNDOS,
+                        help='Intervalo entre ciclos em segundos (modo contínuo)')
+    args = parser.parse_args()
+    
+    while True:
+        try:
+            executar_manutencao(args.sem_sweep, args.forcar_sweep)
+        except Exception as e:
+            print(f"❌ Erro na manutenção: {e}")
+            if not args.continuo:
+                sys.exit(1)
+        
+        if not args.continuo:
+            break
+        time.sleep(args.intervalo)
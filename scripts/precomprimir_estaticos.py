@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Script de pré-compressão dos arquivos estáticos
+
+Gera, ao lado de cada arquivo de static/ (JS, CSS, SVG...), as versões .gz e
+.br (se o pacote brotli estiver instalado) com compressão máxima. O
+middleware de compressão as serve diretamente, sem comprimir a cada
+requisição. Execute após alterar os estáticos (ex.: no deploy); arquivos
+pré-comprimidos mais antigos que o original são ignorados pelo middleware.
+
+Uso:
+    python scripts/precomprimir_estaticos.py
+    python scripts/precomprimir_estaticos.py --limpar   # remove os .gz/.br
+"""
+
+import sys
+import os
+import mimetypes
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from utils.compressao import TIPOS_COMPRIMIVEIS, EXTENSOES, algoritmos_disponiveis, comprimir_arquivo
+
+PASTA_ESTATICOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+
+def arquivos_estaticos():
+    """Arquivos originais de static/ com tipo comprimível"""
+    for raiz, _, nomes in os.walk(PASTA_ESTATICOS):
+        for nome in sorted(nomes):
+            if nome.endswith(tuple(EXTENSOES.values())):
+                continue
+            if mimetypes.guess_type(nome)[0] in TIPOS_COMPRIMIVEIS:
+                yield os.path.join(raiz, nome)
+
+def precomprimir():
+    """Gera as versões comprimidas e retorna (arquivos, bytes originais, bytes por algoritmo)"""
+    arquivos, total, comprimidos = 0, 0, dict.fromkeys(algoritmos_disponiveis(), 0)
+    for caminho in arquivos_estaticos():
+        with open(caminho, 'rb') as arquivo:
+            conteudo = arquivo.read()
+        if len(conteudo) < config.COMPRESSAO_HTTP_LIMITE_BYTES:
+            continue
+
+        arquivos += 1
+        total += len(conteudo)
+        for algoritmo in comprimidos:
+            dados = comprimir_arquivo(conteudo, algoritmo)
+            with open(caminho + EXTENSOES[algoritmo], 'wb') as arquivo:
+                arquivo.write(dados)
+            comprimidos[algoritmo] += len(dados)
+    return arquivos, total, comprimidos
+
+def limpar():
+    removidos = 0
+    for raiz, _, nomes in os.walk(PASTA_ESTATICOS):
+        for nome in nomes:
+            if nome.endswith(tuple(EXTENSOES.values())):
+                os.remove(os.path.join(raiz, nome))
+                removidos += 1
+    return removidos
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pré-comprime os arquivos estáticos (gzip/brotli)")
+    parser.add_argument('--limpar', action='store_true', help='Remove as versões pré-comprimidas')
+    args = parser.parse_args()
+
+    try:
+        if args.limpar:
+            print(f"✅ {limpar()} arquivo(s) pré-comprimido(s) removido(s)")
+            sys.exit(0)
+
+        if 'br' not in algoritmos_disponiveis():
+            print("⚠️ Pacote brotli não instalado: gerando apenas .gz")
+        arquivos, total, comprimidos = precomprimir()
+        print(f"✅ {arquivos} arquivo(s), {total / 1024:.0f} KB")
+        for algoritmo, tamanho in comprimidos.items():
+            if total:
+                print(f"   {algoritmo}: {tamanho / 1024:.0f} KB ({total / max(tamanho, 1):.1f}x menor)")
+    except Exception as e:
+        print(f"❌ Erro na pré-compressão: {e}")
+        sys.exit(1)
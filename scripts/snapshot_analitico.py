@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Script para gerar o snapshot incremental da base analítica (relatórios)
+
+Uso:
+    python scripts/snapshot_analitico.py              # executa um ciclo
+    python scripts/snapshot_analitico.py --continuo   # repete a cada SNAPSHOT_INTERVALO_SEGUNDOS
+"""
+
+import sys
+import os
+import time
+import argparse
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+from utils.snapshot_analitico import SnapshotAnalitico
+
+def executar_snapshot():
+    """Executa um ciclo de snapshot e exibe o resumo"""
+    inicio = time.perf_counter()
+    try:
+        resumo = SnapshotAnalitico().executar()
+    except Exception as e:
+        print(f"❌ Erro ao gerar snapshot: {e}")
+        return False
+    
+    duracao = time.perf_counter() - inicio
+    for tabela, linhas in resumo.items():
+        print(f"  - {tabela}: {linhas} linha(s) copiada(s)")
+    print(f"✅ Snapshot concluído em {duracao:.2f}s -> {config.BASE_ANALITICA}")
+    return True
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Snapshot incremental para a base analítica")
+    parser.add_argument('--continuo', action='store_true', help='Executa continuamente no intervalo configurado')
+    parser.add_argument('--intervalo', type=int, default=config.SNAPSHOT_INTERVALO_SEGUNDOS,
+                        help='Intervalo entre ciclos em segundos (modo contínuo)')
+    args = parser.parse_args()
+    
+    print("🔄 Gerando snapshot da base analítica...")
+    sucesso = executar_snapshot()
+    
+    while args.continuo:
+        time.sleep(args.intervalo)
+        print("🔄 Novo ciclo de snapshot...")
+        executar_snapshot()
+    
+    sys.exit(0 if sucesso else 1)
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Script para testar a gravação do histórico pendente durante leituras com a
+conexão compartilhada (somente leitura) de POST /api/v1/batch
+
+As entradas do buffer lidas por GET /solicitacoes/{id}/historico dentro do
+lote precisam ser gravadas por outra conexão: na compartilhada o INSERT falha
+e as entradas iriam para rejeitadas.jsonl. O banco é simulado (não precisa
+do Firebird nem do servidor rodando).
+"""
+
+import sys
+import os
+import tempfile
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Spool em diretório temporário e sem gravação pela thread durante o teste
+os.environ['SAOS_AUDITORIA_SPOOL'] = tempfile.mkdtemp(prefix='saos_auditoria_')
+os.environ['SAOS_AUDITORIA_INTERVALO_MS'] = '600000'
+
+import config
+import database.connection as conexao
+from flask import Flask
+
+class TransacaoFalsa:
+    def __init__(self):
+        self.default_tpb = None
+
+class CursorFalso:
+    def __init__(self, con):
+        self.con = con
+        self.rowcount = 0
+
+    def execute(self, sql, params=()):
+        self.executemany(sql, [params])
+
+    def executemany(self, sql, lista_params):
+        if sql.lstrip().upper().startswith('INSERT'):
+            # Na conexão compartilhada o TPB padrão é de somente leitura
+            if self.con.main_transaction.default_tpb is not None:
+                raise Exception('attempted update during read-only transaction')
+            self.con.pendentes.extend(lista_params)
+
+    def fetchall(self):
+        return []
+
+    def fetchone(self):
+        return None
+
+class ConexaoFalsa:
+    gravadas = []
+
+    def __init__(self):
+        self.main_transaction = TransacaoFalsa()
+        self.pendentes = []
+
+    def cursor(self):
+        return CursorFalso(self)
+
+    def commit(self):
+        ConexaoFalsa.gravadas.extend(self.pendentes)
+        self.pendentes = []
+
+    def rollback(self):
+        self.pendentes = []
+
+    def close(self):
+        pass
+
+# Antes dos imports abaixo: routes.api consulta o banco ao ser importado
+conexao.fbd.connect = lambda *args, **kwargs: ConexaoFalsa()
+
+from routes.api import api_bp
+from models.historico import HistoricoModel
+from utils.auditoria import buffer_historico, registrar_historico
+
+def registrar_pendentes(total):
+    for i in range(total):
+        registrar_historico({'ID_SOLICITACAO': 1, 'ID_USUARIO': 1, 'TIPO_ACAO': 'TESTE', 'DESCRICAO': f'Entrada {i}'})
+
+def verificar(descricao, total):
+    arquivo_rejeitadas = os.path.join(config.AUDITORIA_DIR_SPOOL, 'rejeitadas.jsonl')
+    ok = (
+        len(ConexaoFalsa.gravadas) == total
+        and not buffer_historico.pendentes
+        and not os.path.exists(arquivo_rejeitadas)
+    )
+    print(f"{'✅' if ok else '❌'} {descricao}: {len(ConexaoFalsa.gravadas)}/{total} gravada(s), "
+          f"{len(buffer_historico.pendentes)} pendente(s), rejeitadas.jsonl {'existe' if os.path.exists(arquivo_rejeitadas) else 'inexistente'}")
+    ConexaoFalsa.gravadas = []
+    return ok
+
+def testar_descarga_na_conexao_compartilhada():
+    """Leitura do histórico dentro da conexão compartilhada"""
+    registrar_pendentes(3)
+    with conexao.conexao_compartilhada():
+        HistoricoModel().buscar_por_solicitacao(1)
+    return verificar('Histórico lido na conexão compartilhada', 3)
+
+def testar_lote_com_historico():
+    """POST /batch com GET /solicitacoes/{id}/historico"""
+    app = Flask(__name__)
+    app.secret_key = 'teste'
+    app.register_blueprint(api_bp)
+
+    registrar_pendentes(3)
+    resposta = app.test_client().post('/api/v1/batch', json={'requisicoes': [
+        '/api/v1/solicitacoes/1/historico',
+        '/api/v1/solicitacoes/1/historico?limit=10',
+    ]})
+    status = [item['status'] for item in (resposta.get_json() or {}).get('data', [])]
+    if resposta.status_code != 200 or status != [200, 200]:
+        print(f"❌ POST /batch: status {resposta.status_code}, subrequisições {status}")
+        return False
+    return verificar('POST /batch com /historico', 3)
+
+if __name__ == "__main__":
+    print("🧪 Testando o histórico pendente com a conexão compartilhada...")
+
+    resultados = [testar_descarga_na_conexao_compartilhada(), testar_lote_com_historico()]
+    sys.exit(0 if all(resultados) else 1)
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Script para testar os planos de execução contra o snapshot versionado
+
+Etapa do build: falha (exit 1) se alguma consulta do código mudou de plano,
+foi incluída/alterada sem plano registrado ou se database/planos_consulta.json
+não existe. Roda contra um banco criado a partir de database/schema.sql;
+mudanças esperadas são aceitas com scripts/auditar_planos.py --atualizar.
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.planos_consulta import verificar_snapshot
+
+def test_planos_consulta():
+    """Compara os planos atuais com o snapshot"""
+    print("🧪 Verificando os planos de execução contra o snapshot...")
+    
+    try:
+        divergencias = verificar_snapshot()
+    except Exception as e:
+        print(f"❌ Erro ao obter planos: {e}")
+        return 2
+    
+    for divergencia in divergencias:
+        print(f"❌ {divergencia}")
+    
+    if divergencias:
+        print(f"\n❌ {len(divergencias)} divergência(s). Revise e rode scripts/auditar_planos.py --atualizar se forem esperadas.")
+        return 1
+    
+    print("✅ Todos os planos conferem com o snapshot")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(test_planos_consulta())
@@ -0,0 +1,221 @@
+// Variáveis globais
+let categorias = [];
+let prioridades = [];
+
+// Inicialização
+document.addEventListener('DOMContentLoaded', function() {
+    carregarCatalogos();
+    inicializarFormularioModal();
+});
+
+// Categorias e prioridades em uma única requisição
+async function carregarCatalogos() {
+    try {
+        const resultados = await buscarEmLote(['/api/v1/categorias', '/api/v1/prioridades']);
+        const dadosCategorias = resultados['/api/v1/categorias'];
+        const dadosPrioridades = resultados['/api/v1/prioridades'];
+
+        if (dadosCategorias && dadosCategorias.success) {
+            categorias = dadosCategorias.data;
+            preencherSelectCategorias();
+        }
+
+        if (dadosPrioridades && dadosPrioridades.success) {
+            prioridades = dadosPrioridades.data;
+            preencherSelectPrioridades();
+        }
+    } catch (error) {
+        console.error('Erro ao carregar categorias e prioridades:', error);
+    }
+}
+
+function preencherSelectCategorias() {
+    const select = document.querySelector('select[name="id_categoria"]');
+    select.innerHTML = '<option value="">Selecione...</option>';
+
+    categorias.forEach(categoria => {
+        const option = document.createElement('option');
+        option.value = categoria.ID;
+        option.textContent = categoria.NOME;
+        select.appendChild(option);
+    });
+}
+
+function preencherSelectPrioridades() {
+    const select = document.querySelector('select[name="id_prioridade"]');
+    select.innerHTML = '<option value="">Selecione...</option>';
+
+    prioridades.forEach(prioridade => {
+        const option = document.createElement('option');
+        option.value = prioridade.ID;
+        option.textContent = prioridade.NOME;
+        select.appendChild(option);
+    });
+}
+
+// Funções do formulário modal
+function inicializarFormularioModal() {
+    // Contador de caracteres
+    const descricaoTextarea = document.querySelector('#form-nova-solicitacao textarea[name="descricao"]');
+    const charCount = document.getElementById('charCount');
+
+    if (descricaoTextarea && charCount) {
+        descricaoTextarea.addEventListener('input', function() {
+            const count = this.value.length;
+            charCount.textContent = `${count} caracteres`;
+
+            if (count < 10) {
+                charCount.classList.add('text-red-500');
+                charCount.classList.remove('text-gray-400');
+            } else {
+                charCount.classList.remove('text-red-500');
+                charCount.classList.add('text-gray-400');
+            }
+            validateModalForm();
+        });
+    }
+
+    // Upload de arquivo
+    const arquivoInput = document.getElementById('arquivo');
+    const fileInfo = document.getElementById('fileInfo');
+    const fileName = document.getElementById('fileName');
+    const removeFile = document.getElementById('removeFile');
+
+    if (arquivoInput && fileInfo && fileName && removeFile) {
+        arquivoInput.addEventListener('change', function() {
+            if (this.files.length > 0) {
+                const file = this.files[0];
+                const maxSize = 10 * 1024 * 1024; // 10MB
+
+                if (file.size > maxSize) {
+                    alert('Arquivo muito grande. Tamanho máximo: 10MB');
+                    this.value = '';
+                    return;
+                }
+
+                fileName.textContent = file.name;
+                fileInfo.classList.remove('hidden');
+            }
+        });
+
+        removeFile.addEventListener('click', function() {
+            arquivoInput.value = '';
+            fileInfo.classList.add('hidden');
+        });
+    }
+
+    // Validar campos obrigatórios
+    const requiredFields = document.querySelectorAll('#form-nova-solicitacao [required]');
+    requiredFields.forEach(field => {
+        field.addEventListener('input', validateModalForm);
+        field.addEventListener('change', validateModalForm);
+    });
+
+    // Inicializar validação
+    validateModalForm();
+}
+
+function validateModalForm() {
+    const requiredFields = document.querySelectorAll('#form-nova-solicitacao [required]');
+    const submitBtn = document.getElementById('submitBtn');
+    const descricaoTextarea = document.querySelector('#form-nova-solicitacao textarea[name="descricao"]');
+    let isValid = true;
+
+    requiredFields.forEach(field => {
+        if (!field.value.trim()) {
+            isValid = false;
+        }
+    });
+
+    // Validação da descrição
+    if (descricaoTextarea && descricaoTextarea.value.length < 10) {
+        isValid = false;
+    }
+
+    if (submitBtn) {
+        submitBtn.disabled = !isValid;
+
+        if (isValid) {
+            submitBtn.classList.remove('opacity-50', 'cursor-not-allowed');
+            submitBtn.classList.add('hover:from-blue-700', 'hover:to-indigo-700');
+        } else {
+            submitBtn.classList.add('opacity-50', 'cursor-not-allowed');
+            submitBtn.classList.remove('hover:from-blue-700', 'hover:to-indigo-700');
+        }
+    }
+}
+
+
+
+// Funções de modal
+function abrirNovaSolicitacao() {
+    document.getElementById('modal-nova-solicitacao').classList.remove('hidden');
+}
+
+function fecharModal() {
+    document.getElementById('modal-nova-solicitacao').classList.add('hidden');
+    document.getElementById('form-nova-solicitacao').reset();
+
+    // Limpar arquivo selecionado
+    const fileInfo = document.getElementById('fileInfo');
+    if (fileInfo) {
+        fileInfo.classList.add('hidden');
+    }
+
+    // Resetar contador de caracteres
+    const charCount = document.getElementById('charCount');
+    if (charCount) {
+        charCount.textContent = '0 caracteres';
+        charCount.classList.remove('text-red-500');
+        charCount.classList.add('text-gray-400');
+    }
+
+    // Resetar validação
+    validateModalForm();
+}
+
+// Event listeners
+document.getElementById('form-nova-solicitacao').addEventListener('submit', async function(e) {
+    e.preventDefault();
+
+    const loadingOverlay = document.getElementById('loadingOverlay');
+    loadingOverlay.classList.remove('hidden');
+
+    const formData = new FormData(this);
+
+    try {
+        const response = await fetch('/', {
+            method: 'POST',
+            body: formData
+        });
+
+        if (response.ok) {
+            const result = await response.text();
+            if (result.includes('Solicitação Enviada com Sucesso')) {
+                alert('Solicitação criada com sucesso!');
+                fecharModal();
+                window.location.reload(); // Recarrega a página para mostrar a nova solicitação
+            } else {
+                alert('Erro ao criar solicitação');
+            }
+        } else {
+            alert('Erro ao criar solicitação');
+        }
+    } catch (error) {
+        console.error('Erro:', error);
+        alert('Erro ao criar solicitação');
+    } finally {
+        loadingOverlay.classList.add('hidden');
+    }
+});
+
+// Funções auxiliares
+function verDetalhes(id) {
+    // Implementar visualização de detalhes
+    alert('Ver detalhes da solicitação ' + id);
+}
+
+function editarSolicitacao(id) {
+    // Implementar edição
+    alert('Editar solicitação ' + id);
+}
@@ -0,0 +1,20 @@
+// Busca várias URLs GET da API em uma única requisição (POST /api/v1/batch).
+// Retorna um objeto url -> corpo JSON da resposta de cada URL.
+async function buscarEmLote(urls) {
+    const response = await fetch('/api/v1/batch', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ requisicoes: urls })
+    });
+    const data = await response.json();
+
+    if (!data.success) {
+        throw new Error(data.error);
+    }
+
+    const resultados = {};
+    data.data.forEach(item => {
+        resultados[item.url] = item.body;
+    });
+    return resultados;
+}
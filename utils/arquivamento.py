@@ -0,0 +1,138 @@
+"""
+Arquivamento de solicitações finalizadas
+
+Move solicitações fechadas (7) e canceladas (8) sem alteração há mais de
+config.ARQUIVAMENTO_DIAS dias, junto com histórico, comentários e metadados de
+anexos, para as tabelas *_ARQUIVO. Cada lote é movido em uma transação própria,
+de modo que uma interrupção nunca deixa uma solicitação dividida entre as duas
+tabelas.
+"""
+
+from datetime import datetime, timedelta
+import config
+from database.connection import db_connection
+from utils.busca import indice_busca
+
+STATUS_ARQUIVAVEIS = (7, 8)
+
+# Tabelas filhas movidas junto com a solicitação (coluna de ligação: ID_SOLICITACAO)
+TABELAS_FILHAS = ['HISTORICO', 'COMENTARIOS', 'ANEXOS']
+
+class ArquivamentoSolicitacoes:
+    """Move solicitações finalizadas antigas para as tabelas de arquivo"""
+
+    def __init__(self, dias=None, tamanho_lote=None):
+        self.dias = config.ARQUIVAMENTO_DIAS if dias is None else dias
+        self.tamanho_lote = tamanho_lote or config.ARQUIVAMENTO_TAMANHO_LOTE
+
+    def executar(self, limite_lotes=None):
+        """Arquiva em lotes e retorna as linhas movidas por tabela"""
+        data_corte = datetime.now() - timedelta(days=self.dias)
+        resumo = {tabela: 0 for tabela in ['SOLICITACOES'] + TABELAS_FILHAS}
+        lotes = 0
+
+        with db_connection() as con:
+            colunas = {tabela: self._colunas(con, tabela) for tabela in resumo}
+
+            while limite_lotes is None or lotes < limite_lotes:
+                ids = self._selecionar_lote(con, data_corte)
+                if not ids:
+                    break
+
+                try:
+                    movidas = self._mover_lote(con, ids, colunas)
+                    con.commit()
+                except Exception as e:
+                    con.rollback()
+                    print(f"❌ [ARQUIVAMENTO] Erro ao mover lote {ids[0]}..{ids[-1]}: {e}")
+                    raise
+
+                for tabela, quantidade in movidas.items():
+                    resumo[tabela] += quantidade
+                lotes += 1
+
+                try:
+                    indice_busca.remover(ids)
+                except Exception as e:
+                    print(f"⚠️ [ARQUIVAMENTO] Lote não removido do índice de busca: {e}")
+
+        return resumo
+
+    def contar_pendentes(self):
+        """Quantidade de solicitações que seriam arquivadas agora"""
+        data_corte = datetime.now() - timedelta(days=self.dias)
+        placeholders = ', '.join('?' for _ in STATUS_ARQUIVAVEIS)
+        with db_connection() as con:
+            cur = con.cursor()
+            cur.execute(
+                f"SELECT COUNT(*) FROM SOLICITACOES WHERE ID_STATUS IN ({placeholders}) AND DTHR_ATUALIZACAO < ?",
+                (*STATUS_ARQUIVAVEIS, data_corte)
+            )
+            return cur.fetchone()[0]
+
+    def remover_exclusoes_antigas(self):
+        """Apaga os registros de saída (SOLICITACOES_EXCLUIDAS) além da retenção da sincronização incremental"""
+        data_corte = datetime.now() - timedelta(days=config.MUDANCAS_RETENCAO_DIAS)
+        with db_connection() as con:
+            cur = con.cursor()
+            cur.execute("DELETE FROM SOLICITACOES_EXCLUIDAS WHERE DTHR_EXCLUSAO < ?", (data_corte,))
+            removidas = cur.rowcount
+            con.commit()
+        return removidas
+
+    def _selecionar_lote(self, con, data_corte):
+        """IDs do próximo lote a arquivar"""
+        placeholders = ', '.join('?' for _ in STATUS_ARQUIVAVEIS)
+        cur = con.cursor()
+        cur.execute(f"""
+            SELECT ID FROM SOLICITACOES
+            WHERE ID_STATUS IN ({placeholders}) AND DTHR_ATUALIZACAO < ?
+            ROWS {int(self.tamanho_lote)}
+        """, (*STATUS_ARQUIVAVEIS, data_corte))
+        return sorted(row[0] for row in cur.fetchall())
+
+    def _mover_lote(self, con, ids, colunas):
+        """Copia o lote para o arquivo e remove das tabelas principais (sem commit)"""
+        cur = con.cursor()
+        placeholders = ', '.join('?' for _ in ids)
+        movidas = {}
+
+        # Notificações antigas continuam visíveis, apenas perdem a ligação
+        cur.execute(
+            f"UPDATE NOTIFICACOES SET ID_SOLICITACAO = NULL WHERE ID_SOLICITACAO IN ({placeholders})",
+            ids
+        )
+
+        for tabela in TABELAS_FILHAS:
+            lista_colunas = ', '.join(colunas[tabela])
+            cur.execute(f"""
+                INSERT INTO {tabela}_ARQUIVO ({lista_colunas})
+                SELECT {lista_colunas} FROM {tabela} WHERE ID_SOLICITACAO IN ({placeholders})
+            """, ids)
+            movidas[tabela] = cur.rowcount
+            cur.execute(f"DELETE FROM {tabela} WHERE ID_SOLICITACAO IN ({placeholders})", ids)
+
+        lista_colunas = ', '.join(colunas['SOLICITACOES'])
+        cur.execute(f"""
+            INSERT INTO SOLICITACOES_ARQUIVO ({lista_colunas})
+            SELECT {lista_colunas} FROM SOLICITACOES WHERE ID IN ({placeholders})
+        """, ids)
+        movidas['SOLICITACOES'] = cur.rowcount
+        # TR_SOLICITACOES_EXCLUSAO registra a saída como arquivamento (sincronização incremental)
+        cur.execute("SELECT RDB$SET_CONTEXT('USER_TRANSACTION', 'SAOS_MOTIVO_EXCLUSAO', 'ARQUIVADA') FROM RDB$DATABASE")
+        cur.execute(f"DELETE FROM SOLICITACOES WHERE ID IN ({placeholders})", ids)
+
+        return movidas
+
+    def _colunas(self, con, tabela):
+        """Colunas da tabela de arquivo, na ordem de definição"""
+        cur = con.cursor()
+        cur.execute("""
+            SELECT TRIM(RDB$FIELD_NAME) FROM RDB$RELATION_FIELDS
+            WHERE RDB$RELATION_NAME = ?
+            ORDER BY RDB$FIELD_POSITION
+        """, (f"{tabela}_ARQUIVO",))
+        colunas = [row[0] for row in cur.fetchall()]
+        if not colunas:
+            raise ValueError(f"Tabela de arquivo {tabela}_ARQUIVO não encontrada")
+        return colunas
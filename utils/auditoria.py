@@ -0,0 +1,233 @@
+"""
+Gravação do histórico (HISTORICO) em segundo plano
+
+As ações registradas vão para um buffer em memória, espelhado em um arquivo
+de spool local, e são gravadas em lote (executemany + um único commit) a cada
+config.AUDITORIA_INTERVALO_MS ou quando o buffer atinge
+config.AUDITORIA_MAX_LINHAS. O buffer é descarregado de forma síncrona no
+encerramento do processo; se o processo morrer antes disso, o spool é
+reprocessado pelo próximo processo que iniciar.
+"""
+
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+from datetime import datetime
+import config
+from database.connection import db_connection
+from utils.compressao_blob import COLUNAS_COMPRIMIDAS, comprimir
+
+COLUNAS_HISTORICO = [
+    'ID_SOLICITACAO', 'ID_USUARIO', 'TIPO_ACAO', 'DESCRICAO',
+    'DADOS_ANTERIORES', 'DADOS_NOVOS', 'DTHR_ACAO', 'IP_ADDRESS', 'USER_AGENT'
+]
+
+INSERT_HISTORICO = (
+    f"INSERT INTO HISTORICO ({', '.join(COLUNAS_HISTORICO)}) "
+    f"VALUES ({', '.join('?' for _ in COLUNAS_HISTORICO)})"
+)
+
+# Spool sem alteração há mais que isto e de outro processo é considerado órfão
+SEGUNDOS_SPOOL_ORFAO = 60
+
+class BufferHistorico:
+    """Buffer write-behind das entradas de histórico"""
+
+    def __init__(self):
+        self.pendentes = []
+        self.lock = threading.Lock()
+        self.lock_gravacao = threading.Lock()
+        self.sinal = threading.Event()
+        self.thread = None
+        self.arquivo_spool = os.path.join(config.AUDITORIA_DIR_SPOOL, f"historico_{os.getpid()}.jsonl")
+
+    def registrar(self, dados, sincrono=False):
+        """Enfileira uma entrada de histórico (ou grava na hora se sincrono=True)"""
+        entrada = {coluna: dados.get(coluna) for coluna in COLUNAS_HISTORICO}
+        entrada['DTHR_ACAO'] = entrada['DTHR_ACAO'] or datetime.now()
+
+        if sincrono or not config.AUDITORIA_BUFFER_ATIVO:
+            # Entradas anteriores vão antes para manter a ordem do histórico
+            self.descarregar()
+            self._gravar([entrada])
+            return
+
+        self._iniciar()
+        with self.lock:
+            self.pendentes.append(entrada)
+            self._anexar_spool([entrada])
+            cheio = len(self.pendentes) >= config.AUDITORIA_MAX_LINHAS
+
+        if cheio:
+            self.sinal.set()
+
+    def descarregar(self):
+        """Grava agora todas as entradas pendentes"""
+        with self.lock_gravacao:
+            with self.lock:
+                lote = self.pendentes
+                self.pendentes = []
+            if not lote:
+                return 0
+
+            try:
+                self._gravar(lote)
+            except Exception as e:
+                print(f"❌ [AUDITORIA] Erro ao gravar {len(lote)} entrada(s) do histórico, nova tentativa em seguida: {e}")
+                with self.lock:
+                    self.pendentes = lote + self.pendentes
+                    # Mantém o spool "vivo" para não ser tratado como órfão
+                    self._reescrever_spool()
+                raise
+
+            with self.lock:
+                self._reescrever_spool()
+            return len(lote)
+
+    def _gravar(self, entradas):
+        """Insere as entradas em lote, isolando as linhas rejeitadas pelo banco"""
+        valores = _valores(entradas)
+
+        # Conexão própria: a compartilhada (POST /batch, /completo) é somente leitura
+        with db_connection(compartilhada=False) as con:
+            cur = con.cursor()
+            try:
+                cur.executemany(INSERT_HISTORICO, valores)
+                con.commit()
+                return
+            except Exception as e:
+                con.rollback()
+                if len(entradas) == 1:
+                    raise
+                print(f"⚠️ [AUDITORIA] Lote rejeitado ({e}), gravando linha a linha")
+
+            rejeitadas = []
+            for entrada, linha in zip(entradas, valores):
+                try:
+                    cur.execute(INSERT_HISTORICO, linha)
+                    con.commit()
+                except Exception as e:
+                    con.rollback()
+                    print(f"❌ [AUDITORIA] Entrada rejeitada para a solicitação {entrada['ID_SOLICITACAO']}: {e}")
+                    rejeitadas.append(entrada)
+
+        if rejeitadas:
+            # Não volta para a fila (falharia sempre); fica registrada para análise
+            with open(os.path.join(config.AUDITORIA_DIR_SPOOL, 'rejeitadas.jsonl'), 'a', encoding='utf-8') as arquivo:
+                for entrada in rejeitadas:
+                    arquivo.write(_serializar(entrada) + '\n')
+
+    def _iniciar(self):
+        """Inicia a thread de gravação no primeiro registro do processo"""
+        if self.thread is not None:
+            return
+        with self.lock:
+            if self.thread is not None:
+                return
+            os.makedirs(config.AUDITORIA_DIR_SPOOL, exist_ok=True)
+            self.pendentes = _recuperar_spools_orfaos(self.arquivo_spool) + self.pendentes
+            self._reescrever_spool()
+            self.thread = threading.Thread(target=self._executar, name='buffer-historico', daemon=True)
+            self.thread.start()
+            atexit.register(self._encerrar)
+
+    def _executar(self):
+        while True:
+            self.sinal.wait(config.AUDITORIA_INTERVALO_MS / 1000)
+            self.sinal.clear()
+            try:
+                self.descarregar()
+            except Exception:
+                time.sleep(config.AUDITORIA_INTERVALO_MS / 1000)
+
+    def _encerrar(self):
+        """Descarrega o buffer de forma síncrona no encerramento do processo"""
+        try:
+            total = self.descarregar()
+            if total:
+                print(f"✅ [AUDITORIA] {total} entrada(s) do histórico gravada(s) no encerramento")
+        except Exception as e:
+            print(f"❌ [AUDITORIA] Entradas mantidas no spool {self.arquivo_spool}: {e}")
+            return
+
+        if os.path.exists(self.arquivo_spool) and os.path.getsize(self.arquivo_spool) == 0:
+            os.remove(self.arquivo_spool)
+
+    def _anexar_spool(self, entradas):
+        with open(self.arquivo_spool, 'a', encoding='utf-8') as arquivo:
+            for entrada in entradas:
+                arquivo.write(_serializar(entrada) + '\n')
+            arquivo.flush()
+
+    def _reescrever_spool(self):
+        """Regrava o spool com as entradas ainda pendentes"""
+        temporario = self.arquivo_spool + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            for entrada in self.pendentes:
+                arquivo.write(_serializar(entrada) + '\n')
+        os.replace(temporario, self.arquivo_spool)
+
+def _recuperar_spools_orfaos(arquivo_atual):
+    """Lê os spools deixados por processos encerrados sem descarregar o buffer"""
+    entradas = []
+    limite = time.time() - SEGUNDOS_SPOOL_ORFAO
+
+    for caminho in sorted(glob.glob(os.path.join(config.AUDITORIA_DIR_SPOOL, 'historico_*.jsonl'))):
+        if caminho == arquivo_atual or os.path.getmtime(caminho) > limite:
+            continue
+
+        # Renomeia antes de ler para que só um processo assuma o spool
+        assumido = caminho + '.recuperando'
+        try:
+            os.replace(caminho, assumido)
+        except OSError:
+            continue
+
+        with open(assumido, encoding='utf-8') as arquivo:
+            recuperadas = [_desserializar(linha) for linha in arquivo if linha.strip()]
+        os.remove(assumido)
+
+        if recuperadas:
+            print(f"🔄 [AUDITORIA] {len(recuperadas)} entrada(s) recuperada(s) de {os.path.basename(caminho)}")
+        entradas.extend(recuperadas)
+
+    return entradas
+
+def _valores(entradas):
+    """Parâmetros do INSERT (colunas comprimidas já comprimidas)"""
+    comprimidas = COLUNAS_COMPRIMIDAS.get('HISTORICO', ())
+    return [
+        [comprimir(entrada.get(coluna)) if coluna in comprimidas else entrada.get(coluna) for coluna in COLUNAS_HISTORICO]
+        for entrada in entradas
+    ]
+
+def _serializar(entrada):
+    return json.dumps({
+        coluna: valor.isoformat() if isinstance(valor, datetime) else valor
+        for coluna, valor in entrada.items()
+    }, ensure_ascii=False)
+
+def _desserializar(linha):
+    entrada = json.loads(linha)
+    if entrada.get('DTHR_ACAO'):
+        entrada['DTHR_ACAO'] = datetime.fromisoformat(entrada['DTHR_ACAO'])
+    return entrada
+
+# Instância única por processo
+buffer_historico = BufferHistorico()
+
+def registrar_historico(dados, sincrono=False):
+    """Registra uma entrada de histórico pelo buffer do processo"""
+    buffer_historico.registrar(dados, sincrono=sincrono)
+
+def descarregar_historico():
+    """Grava as entradas pendentes (leituras que precisam ver as últimas ações)"""
+    return buffer_historico.descarregar()
+
+def inserir_historico(cur, entradas):
+    """Insere entradas na transação do cursor, sem passar pelo buffer (gravadas junto com a alteração)"""
+    agora = datetime.now()
+    cur.executemany(INSERT_HISTORICO, _valores([dict(entrada, DTHR_ACAO=entrada.get('DTHR_ACAO') or agora) for entrada in entradas]))
@@ -0,0 +1,218 @@
+"""
+Autocompletar de SISTEMA, MODULO e usuários
+
+Os valores distintos de SOLICITACOES.SISTEMA/MODULO e os usuários ativos
+(nome, cada palavra do nome e email) ficam em memória em listas ordenadas pela
+forma normalizada (minúsculas, sem acentos); os usuários também em uma lista
+por TIPO_USUARIO, para o filtro por tipo não depender dos primeiros encontrados. Um prefixo é resolvido com duas
+buscas binárias (bisect), sem consultar o banco. As listas são carregadas na
+inicialização, recarregadas em segundo plano a cada
+config.AUTOCOMPLETAR_INTERVALO_SEGUNDOS e atualizadas nas gravações feitas por
+este processo.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+import config
+from database.connection import db_connection
+from utils.normalizacao import remover_acentos
+
+CAMPOS = ('SISTEMA', 'MODULO', 'USUARIO')
+
+# Entradas examinadas por consulta de usuário (prefixos curtos casam com muitas)
+MAXIMO_VARRIDOS = 500
+
+def normalizar(valor):
+    """Forma usada na comparação: minúsculas, sem acentos e com espaços simples"""
+    return ' '.join(remover_acentos(str(valor)).lower().split())
+
+class ListaPrefixos:
+    """Lista ordenada de (chave normalizada, item) com busca por prefixo"""
+
+    def __init__(self, entradas=()):
+        entradas = sorted(entradas, key=lambda entrada: entrada[0])
+        self.chaves = [chave for chave, _ in entradas]
+        self.itens = [item for _, item in entradas]
+
+    def adicionar(self, chave, item):
+        posicao = bisect_left(self.chaves, chave)
+        self.chaves.insert(posicao, chave)
+        self.itens.insert(posicao, item)
+
+    def remover(self, chave, item):
+        posicao = bisect_left(self.chaves, chave)
+        while posicao < len(self.chaves) and self.chaves[posicao] == chave:
+            if self.itens[posicao] == item:
+                del self.chaves[posicao]
+                del self.itens[posicao]
+                return
+            posicao += 1
+
+    def buscar(self, prefixo, maximo):
+        """Itens cujas chaves começam com o prefixo, em ordem alfabética"""
+        inicio = bisect_left(self.chaves, prefixo)
+        fim = bisect_left(self.chaves, prefixo + '\uffff', inicio)
+        return self.itens[inicio:min(fim, inicio + maximo)]
+
+class Autocompletar:
+    """Índices de prefixo em memória para os campos de texto livre e usuários"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.listas = {campo: ListaPrefixos() for campo in CAMPOS}
+        self.valores = {'SISTEMA': {}, 'MODULO': {}}   # campo -> {chave: [valor, ocorrências]}
+        self.usuarios = {}                             # id -> {ID, NOME, EMAIL, TIPO_USUARIO, chaves}
+        self.usuarios_por_tipo = {}                    # TIPO_USUARIO -> ListaPrefixos
+        self.carregado_em = None
+        self.recarregando = False
+
+    def sugerir(self, campo, prefixo, limite=10, tipo_usuario=None):
+        """Sugestões para o prefixo digitado (valores mais usados / usuários por nome)"""
+        campo = campo.upper()
+        if campo not in CAMPOS:
+            raise ValueError(f"Campo inválido: {campo}. Use {', '.join(c.lower() for c in CAMPOS)}")
+
+        self._garantir_atualizado()
+        prefixo = normalizar(prefixo or '')
+
+        if campo == 'USUARIO':
+            vistos, resultado = set(), []
+            with self.lock:
+                lista = self.usuarios_por_tipo.get(tipo_usuario) if tipo_usuario else self.listas['USUARIO']
+                encontrados = lista.buscar(prefixo, MAXIMO_VARRIDOS) if lista else []
+            for usuario_id in encontrados:
+                usuario = self.usuarios.get(usuario_id)
+                if usuario_id in vistos or usuario is None:
+                    continue
+                vistos.add(usuario_id)
+                resultado.append({coluna: usuario[coluna] for coluna in ('ID', 'NOME', 'EMAIL', 'TIPO_USUARIO')})
+                if len(resultado) >= limite:
+                    break
+            return resultado
+
+        with self.lock:
+            valores = self.valores[campo]
+            chaves = self.listas[campo].buscar(prefixo, len(valores))
+        mais_usados = sorted(chaves, key=lambda chave: -valores[chave][1])[:limite]
+        return [valores[chave][0] for chave in mais_usados]
+
+    def registrar_valor(self, campo, valor):
+        """Contabiliza um SISTEMA/MODULO gravado (novos valores passam a ser sugeridos)"""
+        if not valor or self.carregado_em is None:
+            return
+        chave = normalizar(valor)
+        with self.lock:
+            if chave in self.valores[campo]:
+                self.valores[campo][chave][1] += 1
+            else:
+                self.valores[campo][chave] = [valor, 1]
+                self.listas[campo].adicionar(chave, chave)
+
+    def atualizar_usuario(self, usuario_id, nome, email, tipo_usuario, ativo=True):
+        """Reflete a criação/alteração de um usuário (inativos deixam de ser sugeridos)"""
+        if self.carregado_em is None:
+            return
+        with self.lock:
+            anterior = self.usuarios.pop(usuario_id, None)
+            if anterior:
+                for chave in anterior['chaves']:
+                    self.listas['USUARIO'].remover(chave, usuario_id)
+                    self.usuarios_por_tipo[anterior['TIPO_USUARIO']].remover(chave, usuario_id)
+            if ativo:
+                usuario = self._usuario(usuario_id, nome, email, tipo_usuario)
+                self.usuarios[usuario_id] = usuario
+                lista_tipo = self.usuarios_por_tipo.setdefault(tipo_usuario, ListaPrefixos())
+                for chave in usuario['chaves']:
+                    self.listas['USUARIO'].adicionar(chave, usuario_id)
+                    lista_tipo.adicionar(chave, usuario_id)
+
+    def recarregar(self):
+        """Relê os valores distintos e os usuários ativos e troca os índices de uma vez"""
+        valores = {'SISTEMA': {}, 'MODULO': {}}
+        with db_connection() as con:
+            cur = con.cursor()
+            for campo in valores:
+                cur.execute(f"""
+                    SELECT {campo}, COUNT(*) FROM SOLICITACOES
+                    WHERE {campo} IS NOT NULL
+                    GROUP BY {campo}
+                """)
+                for valor, ocorrencias in cur.fetchall():
+                    # Grafias diferentes do mesmo valor: mantém a mais usada
+                    chave = normalizar(valor)
+                    if not chave:
+                        continue
+                    atual = valores[campo].get(chave)
+                    if atual is None:
+                        valores[campo][chave] = [valor, ocorrencias]
+                    else:
+                        if ocorrencias > atual[1]:
+                            atual[0] = valor
+                        atual[1] += ocorrencias
+
+            cur.execute("SELECT ID, NOME, EMAIL, TIPO_USUARIO FROM USUARIOS WHERE ATIVO = TRUE")
+            usuarios = {row[0]: self._usuario(*row) for row in cur.fetchall()}
+
+        listas = {campo: ListaPrefixos((chave, chave) for chave in valores[campo]) for campo in valores}
+        listas['USUARIO'] = ListaPrefixos(
+            (chave, usuario_id) for usuario_id, usuario in usuarios.items() for chave in usuario['chaves']
+        )
+        usuarios_por_tipo = {
+            tipo: ListaPrefixos(
+                (chave, usuario_id) for usuario_id, usuario in usuarios.items()
+                if usuario['TIPO_USUARIO'] == tipo for chave in usuario['chaves']
+            )
+            for tipo in {usuario['TIPO_USUARIO'] for usuario in usuarios.values()}
+        }
+
+        with self.lock:
+            self.valores, self.usuarios, self.listas = valores, usuarios, listas
+            self.usuarios_por_tipo = usuarios_por_tipo
+            self.carregado_em = time.monotonic()
+        return {campo: len(lista.chaves) for campo, lista in listas.items()}
+
+    def recarregar_em_segundo_plano(self):
+        """Recarrega os índices em uma thread (uma por vez); até terminar valem os atuais"""
+        with self.lock:
+            if self.recarregando:
+                return
+            self.recarregando = True
+
+        def executar():
+            try:
+                totais = self.recarregar()
+                print(f"✅ [AUTOCOMPLETAR] Índices carregados: {totais}")
+            except Exception as e:
+                print(f"⚠️ [AUTOCOMPLETAR] Recarga falhou, usando os índices atuais: {e}")
+                with self.lock:
+                    if self.carregado_em is not None:
+                        self.carregado_em = time.monotonic()
+            finally:
+                with self.lock:
+                    self.recarregando = False
+        threading.Thread(target=executar, name='carga-autocompletar', daemon=True).start()
+
+    def _usuario(self, usuario_id, nome, email, tipo_usuario):
+        """Usuário com as chaves de busca: nome completo, cada palavra do nome e email"""
+        nome_normalizado = normalizar(nome or '')
+        chaves = {nome_normalizado, normalizar(email or '')} | set(nome_normalizado.split())
+        return {
+            'ID': usuario_id,
+            'NOME': nome,
+            'EMAIL': email,
+            'TIPO_USUARIO': tipo_usuario,
+            'chaves': [chave for chave in chaves if chave],
+        }
+
+    def _garantir_atualizado(self):
+        # A releitura não roda dentro da requisição; antes da carga inicial não há sugestões
+        if self.carregado_em is None or time.monotonic() - self.carregado_em >= config.AUTOCOMPLETAR_INTERVALO_SEGUNDOS:
+            self.recarregar_em_segundo_plano()
+
+# Instância única por processo
+autocompletar = Autocompletar()
+
+def carregar_em_segundo_plano():
+    """Carrega os índices na inicialização, sem atrasar a primeira requisição"""
+    autocompletar.recarregar_em_segundo_plano()
@@ -0,0 +1,161 @@
+"""
+Leitura sob demanda de colunas BLOB
+
+Os models deixam as colunas BLOB fora do SELECT e devolvem um BlobSobDemanda
+no lugar do valor. O conteúdo só é lido quando acessado; na primeira leitura,
+a coluna é carregada de uma vez para todas as linhas da mesma consulta (uma
+query por coluna, não por linha). Ao serializar para JSON, as colunas ainda
+não lidas do grupo são carregadas juntas (carregar_pendentes), com uma única
+conexão. Endpoints que devolvem os BLOBs devem pedi-los no SELECT original
+(carregar_blobs dos models). Valores muito grandes podem ser lidos em
+segmentos, sem materializar o BLOB inteiro.
+"""
+
+import json
+from database.connection import db_connection
+from utils.compressao_blob import descomprimir_segmentos, texto
+
+# Bytes lidos por segmento em BlobSobDemanda.segmentos()
+TAMANHO_SEGMENTO = 64 * 1024
+
+# Limite de IDs por IN (o Firebird aceita até 1500 itens)
+TAMANHO_LOTE_IDS = 1000
+
+def decodificar_json(valor):
+    """Texto de um objeto JSON (ex.: HISTORICO.DADOS_NOVOS) como dict; outros valores sem alteração"""
+    if isinstance(valor, str) and valor and valor.startswith('{'):
+        try:
+            return json.loads(valor)
+        except ValueError:
+            pass
+    return valor
+
+class GrupoBlobs:
+    """BLOBs das linhas de uma mesma consulta, carregados juntos por coluna"""
+
+    def __init__(self, tabelas, primary_key='ID'):
+        # Tabela principal primeiro; a de arquivo só é consultada para IDs não encontrados
+        self.tabelas = tabelas
+        self.primary_key = primary_key
+        self.ids = []
+        self.colunas = {}   # colunas com handles no grupo (ordem de criação)
+        self.valores = {}
+
+    def blob(self, coluna, id):
+        """Cria o handle de uma coluna BLOB de uma linha"""
+        self.ids.append(id)
+        self.colunas[coluna] = True
+        return BlobSobDemanda(self, coluna, id)
+
+    def valor(self, coluna, id):
+        if coluna not in self.valores:
+            self._carregar([coluna])
+        return self.valores[coluna].get(id)
+
+    def carregar_pendentes(self):
+        """Lê de uma vez todas as colunas do grupo ainda não carregadas"""
+        colunas = [coluna for coluna in self.colunas if coluna not in self.valores]
+        if colunas:
+            self._carregar(colunas)
+
+    def _carregar(self, colunas):
+        """Lê as colunas para todas as linhas do grupo (uma query por lote de IDs)"""
+        valores = {coluna: {} for coluna in colunas}
+        pendentes = list(dict.fromkeys(self.ids))
+
+        with db_connection() as con:
+            cur = con.cursor()
+            for tabela in self.tabelas:
+                encontrados = set()
+                for inicio in range(0, len(pendentes), TAMANHO_LOTE_IDS):
+                    lote = pendentes[inicio:inicio + TAMANHO_LOTE_IDS]
+                    placeholders = ', '.join('?' for _ in lote)
+                    cur.execute(
+                        f"SELECT {self.primary_key}, {', '.join(colunas)} FROM {tabela} WHERE {self.primary_key} IN ({placeholders})",
+                        lote
+                    )
+                    for id, *linha in cur.fetchall():
+                        encontrados.add(id)
+                        for coluna, valor in zip(colunas, linha):
+                            valores[coluna][id] = texto(valor) if valor is not None else None
+                pendentes = [id for id in pendentes if id not in encontrados]
+                if not pendentes:
+                    break
+
+        self.valores.update(valores)
+
+class BlobSobDemanda:
+    """Handle de uma coluna BLOB lida apenas quando acessada"""
+
+    __slots__ = ('grupo', 'coluna', 'id')
+
+    def __init__(self, grupo, coluna, id):
+        self.grupo = grupo
+        self.coluna = coluna
+        self.id = id
+
+    @property
+    def carregado(self):
+        return self.coluna in self.grupo.valores
+
+    def ler(self):
+        """Retorna o conteúdo como texto (None se a coluna for nula)"""
+        return self.grupo.valor(self.coluna, self.id)
+
+    def valor_json(self):
+        """Valor nas respostas JSON: o mesmo de uma coluna lida no SELECT (objetos JSON decodificados)
+
+        Uma resposta costuma serializar todos os BLOBs das linhas: as colunas pendentes
+        do grupo são lidas juntas, em vez de uma conexão e uma query por coluna.
+        """
+        if not self.carregado:
+            self.grupo.carregar_pendentes()
+        return decodificar_json(self.ler())
+
+    def segmentos(self, tamanho=TAMANHO_SEGMENTO):
+        """Lê o conteúdo em blocos de bytes, sem carregar o BLOB inteiro"""
+        with db_connection() as con:
+            for tabela in self.grupo.tabelas:
+                cur = con.cursor()
+                cur.stream_blobs.append(self.coluna)
+                cur.execute(
+                    f"SELECT {self.coluna} FROM {tabela} WHERE {self.grupo.primary_key} = ?",
+                    (self.id,)
+                )
+                row = cur.fetchone()
+                if row is None:
+                    continue
+                if row[0] is None:
+                    return
+
+                leitor = row[0]
+                try:
+                    yield from descomprimir_segmentos(_blocos(leitor, tamanho))
+                finally:
+                    leitor.close()
+                return
+
+    def __str__(self):
+        valor = self.ler()
+        return '' if valor is None else valor
+
+    def __bool__(self):
+        return bool(self.ler())
+
+    def __eq__(self, outro):
+        if isinstance(outro, BlobSobDemanda):
+            outro = outro.ler()
+        return self.ler() == outro
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"<BlobSobDemanda {self.coluna} ID={self.id}{' carregado' if self.carregado else ''}>"
+
+def _blocos(leitor, tamanho):
+    """Lê um BlobReader em blocos de bytes (BLOBs de texto chegam como str)"""
+    while True:
+        bloco = leitor.read(tamanho)
+        if not bloco:
+            break
+        yield bloco.encode('utf-8') if isinstance(bloco, str) else bloco
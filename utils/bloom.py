@@ -0,0 +1,195 @@
+"""
+Filtro de Bloom dos emails e CPF/CNPJ cadastrados
+
+Responde "com certeza não existe" sem consultar USUARIOS: cadastro e cargas em
+lote só vão ao banco quando o filtro indica que o valor pode existir (a
+restrição UNIQUE de EMAIL/CPF_CNPJ cobre o que o filtro ainda não viu). O login
+não usa o filtro: um falso negativo recusaria um usuário existente.
+O filtro é montado na inicialização, recebe os valores gravados por este
+processo e busca os usuários novos (a partir de config.BLOOM_JANELA_IDS antes
+do último ID visto) a cada config.BLOOM_SINCRONIZACAO_SEGUNDOS. Como não há
+remoção em filtros de Bloom, ele é reconstruído por completo, em segundo plano,
+a cada config.BLOOM_RECONSTRUCAO_SEGUNDOS (alterações de email/CPF feitas por
+outro processo só aparecem depois disso).
+"""
+
+import hashlib
+import math
+import re
+import threading
+import time
+import config
+from database.connection import db_connection
+
+class FiltroBloom:
+    """Conjunto probabilístico: sem falsos negativos, falsos positivos limitados"""
+
+    def __init__(self, capacidade, taxa_falsos_positivos=0.01):
+        self.capacidade = max(int(capacidade), 1)
+        self.bits = max(int(-self.capacidade * math.log(taxa_falsos_positivos) / math.log(2) ** 2), 8)
+        self.num_hashes = max(round(self.bits / self.capacidade * math.log(2)), 1)
+        self.mapa = bytearray((self.bits + 7) // 8)
+        self.total = 0
+
+    def adicionar(self, valor):
+        posicoes = self._posicoes(valor)
+        if all(self.mapa[posicao >> 3] & (1 << (posicao & 7)) for posicao in posicoes):
+            return  # já presente (ex.: relido na janela de sincronização): não conta para a capacidade
+        for posicao in posicoes:
+            self.mapa[posicao >> 3] |= 1 << (posicao & 7)
+        self.total += 1
+
+    def __contains__(self, valor):
+        return all(self.mapa[posicao >> 3] & (1 << (posicao & 7)) for posicao in self._posicoes(valor))
+
+    @property
+    def cheio(self):
+        return self.total > self.capacidade
+
+    def _posicoes(self, valor):
+        # Hashing duplo: k posições a partir de dois hashes de 64 bits
+        resumo = hashlib.blake2b(valor.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(resumo[:8], 'little')
+        h2 = int.from_bytes(resumo[8:], 'little') | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.num_hashes)]
+
+def normalizar_email(email):
+    return (email or '').strip().lower()
+
+def normalizar_documento(cpf_cnpj):
+    """CPF/CNPJ apenas com dígitos"""
+    return re.sub(r'[^0-9]', '', cpf_cnpj or '')
+
+class UsuariosConhecidos:
+    """Filtros de Bloom de emails e CPF/CNPJ dos usuários"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.emails = None
+        self.documentos = None
+        self.ultimo_id = 0
+        self.reconstruido_em = None
+        self.sincronizado_em = None
+        self.reconstruindo = False
+        # Valores registrados enquanto uma reconstrução lê o banco (reaplicados no filtro novo)
+        self.registrados_na_reconstrucao = None
+
+    def email_pode_existir(self, email):
+        """False apenas se o email com certeza não está cadastrado"""
+        email = normalizar_email(email)
+        if not email:
+            return False
+        return self._consultar(lambda: email in self.emails)
+
+    def documento_pode_existir(self, cpf_cnpj):
+        """False apenas se o CPF/CNPJ com certeza não está cadastrado"""
+        documento = normalizar_documento(cpf_cnpj)
+        if not documento:
+            return False
+        return self._consultar(lambda: documento in self.documentos)
+
+    def registrar(self, email=None, cpf_cnpj=None):
+        """Inclui os valores de um usuário gravado por este processo"""
+        with self.lock:
+            if self.registrados_na_reconstrucao is not None:
+                self.registrados_na_reconstrucao.append((email, cpf_cnpj))
+            if self.emails is None:
+                return
+            if normalizar_email(email):
+                self.emails.adicionar(normalizar_email(email))
+            if normalizar_documento(cpf_cnpj):
+                self.documentos.adicionar(normalizar_documento(cpf_cnpj))
+            if self.emails.cheio or self.documentos.cheio:
+                # Acima da capacidade a taxa de falsos positivos cresce: reconstrói na próxima consulta
+                self.reconstruido_em = None
+
+    def reconstruir(self):
+        """Monta os filtros a partir de todos os usuários"""
+        with self.lock:
+            self.registrados_na_reconstrucao = []
+
+        try:
+            with db_connection() as con:
+                cur = con.cursor()
+                cur.execute("SELECT ID, EMAIL, CPF_CNPJ FROM USUARIOS")
+                usuarios = cur.fetchall()
+        except Exception:
+            with self.lock:
+                self.registrados_na_reconstrucao = None
+            raise
+
+        # Folga para os cadastros até a próxima reconstrução
+        capacidade = max(len(usuarios) * 2, config.BLOOM_CAPACIDADE_MINIMA)
+        emails = FiltroBloom(capacidade, config.BLOOM_TAXA_FALSOS_POSITIVOS)
+        documentos = FiltroBloom(capacidade, config.BLOOM_TAXA_FALSOS_POSITIVOS)
+        with self.lock:
+            valores = [(email, cpf_cnpj) for _, email, cpf_cnpj in usuarios] + self.registrados_na_reconstrucao
+            for email, cpf_cnpj in valores:
+                if normalizar_email(email):
+                    emails.adicionar(normalizar_email(email))
+                if normalizar_documento(cpf_cnpj):
+                    documentos.adicionar(normalizar_documento(cpf_cnpj))
+
+            self.registrados_na_reconstrucao = None
+            self.emails, self.documentos = emails, documentos
+            self.ultimo_id = max((row[0] for row in usuarios), default=0)
+            self.reconstruido_em = self.sincronizado_em = time.monotonic()
+        return len(usuarios)
+
+    def sincronizar(self):
+        """Inclui os usuários criados (por qualquer processo) desde a última leitura"""
+        with db_connection() as con:
+            cur = con.cursor()
+            # Relê uma janela abaixo do último ID: um ID menor pode ter sido confirmado depois de um maior
+            cur.execute(
+                "SELECT ID, EMAIL, CPF_CNPJ FROM USUARIOS WHERE ID > ?",
+                (max(self.ultimo_id - config.BLOOM_JANELA_IDS, 0),)
+            )
+            novos = cur.fetchall()
+
+        for _, email, cpf_cnpj in novos:
+            self.registrar(email, cpf_cnpj)
+        with self.lock:
+            self.ultimo_id = max([self.ultimo_id] + [row[0] for row in novos])
+            self.sincronizado_em = time.monotonic()
+
+    def reconstruir_em_segundo_plano(self):
+        """Reconstrói os filtros em uma thread (uma por vez); até terminar vale o filtro atual"""
+        with self.lock:
+            if self.reconstruindo:
+                return
+            self.reconstruindo = True
+
+        def executar():
+            try:
+                total = self.reconstruir()
+                print(f"✅ [BLOOM] Filtro de usuários montado com {total} usuário(s)")
+            except Exception as e:
+                print(f"⚠️ [BLOOM] Montagem do filtro de usuários falhou, será refeita no próximo uso: {e}")
+            finally:
+                with self.lock:
+                    self.reconstruindo = False
+        threading.Thread(target=executar, name='carga-bloom-usuarios', daemon=True).start()
+
+    def _consultar(self, teste):
+        """Executa o teste com filtros atualizados; sem filtro disponível, assume que pode existir"""
+        agora = time.monotonic()
+        if self.reconstruido_em is None or agora - self.reconstruido_em > config.BLOOM_RECONSTRUCAO_SEGUNDOS:
+            # A varredura completa de USUARIOS não roda dentro da requisição
+            self.reconstruir_em_segundo_plano()
+        if self.emails is None:
+            return True
+
+        if agora - self.sincronizado_em > config.BLOOM_SINCRONIZACAO_SEGUNDOS:
+            try:
+                self.sincronizar()
+            except Exception as e:
+                print(f"⚠️ [BLOOM] Filtro de usuários não atualizado: {e}")
+        return teste()
+
+# Instância única por processo
+usuarios_conhecidos = UsuariosConhecidos()
+
+def carregar_em_segundo_plano():
+    """Monta os filtros na inicialização, sem atrasar a primeira requisição"""
+    usuarios_conhecidos.reconstruir_em_segundo_plano()
@@ -0,0 +1,325 @@
+"""
+Busca textual em solicitações e comentários
+
+Mantém um índice invertido (SQLite FTS5, ranking BM25) com o título, a
+descrição e os comentários públicos de cada solicitação, já normalizados por
+utils.normalizacao (sem acentos, radicais em português). O índice é atualizado
+a cada gravação de solicitação/comentário e, para o que escapar disso, por uma
+sincronização incremental baseada em marcas d'água.
+
+Os artigos ativos da base de conhecimento ficam em uma tabela própria do mesmo
+índice (ARTIGOS_BUSCA), usada pelas buscas e sugestões de models.knowledge_base.
+"""
+
+from datetime import datetime
+import json
+from database.connection import db_connection
+from database.busca import busca_connection
+from utils.compressao_blob import texto
+from utils.normalizacao import tokenizar
+
+# Solicitações lidas do Firebird por lote na indexação
+TAMANHO_LOTE = 500
+
+# Pesos do BM25 por coluna: título, descrição, comentários (colunas UNINDEXED não pontuam)
+PESOS_BM25 = (4.0, 1.0, 0.5, 0, 0, 0)
+
+MAXIMO_POR_PAGINA = 100
+
+# Pesos do BM25 dos artigos: título, conteúdo, tags (categoria não pontua)
+PESOS_BM25_ARTIGOS = (3.0, 1.0, 2.0, 0)
+
+class IndiceBusca:
+    """Índice invertido das solicitações"""
+
+    def preparar(self, con):
+        """Cria as tabelas do índice, se ainda não existirem"""
+        con.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS DOCUMENTOS_BUSCA USING fts5(
+                TITULO, DESCRICAO, COMENTARIOS,
+                CODIGO_REFERENCIA UNINDEXED, TITULO_ORIGINAL UNINDEXED, DTHR_CRIACAO UNINDEXED,
+                tokenize = 'unicode61 remove_diacritics 0'
+            )
+        """)
+        con.execute("""
+            CREATE TABLE IF NOT EXISTS MARCAS_BUSCA (
+                CHAVE TEXT PRIMARY KEY,
+                VALOR TEXT
+            )
+        """)
+        con.commit()
+
+    def buscar(self, consulta, pagina=1, por_pagina=20):
+        """Retorna (resultados, total) ordenados por relevância (BM25)"""
+        expressao = self.montar_expressao(consulta)
+        if not expressao:
+            return [], 0
+
+        por_pagina = max(1, min(por_pagina, MAXIMO_POR_PAGINA))
+        pesos = ', '.join(str(peso) for peso in PESOS_BM25)
+
+        with busca_connection() as con:
+            self.preparar(con)
+            cur = con.cursor()
+            cur.execute("SELECT COUNT(*) FROM DOCUMENTOS_BUSCA WHERE DOCUMENTOS_BUSCA MATCH ?", (expressao,))
+            total = cur.fetchone()[0]
+
+            cur.execute(f"""
+                SELECT rowid, CODIGO_REFERENCIA, TITULO_ORIGINAL, DTHR_CRIACAO,
+                       bm25(DOCUMENTOS_BUSCA, {pesos}) AS PONTUACAO
+                FROM DOCUMENTOS_BUSCA
+                WHERE DOCUMENTOS_BUSCA MATCH ?
+                ORDER BY PONTUACAO
+                LIMIT ? OFFSET ?
+            """, (expressao, por_pagina, (max(pagina, 1) - 1) * por_pagina))
+
+            resultados = [
+                {
+                    'ID': id,
+                    'CODIGO_REFERENCIA': codigo,
+                    'TITULO': titulo,
+                    'DTHR_CRIACAO': dthr_criacao,
+                    # O bm25() do SQLite é negativo: quanto menor, mais relevante
+                    'RELEVANCIA': round(-pontuacao, 4),
+                }
+                for id, codigo, titulo, dthr_criacao, pontuacao in cur.fetchall()
+            ]
+
+        return resultados, total
+
+    def montar_expressao(self, consulta):
+        """Converte a consulta do usuário em uma expressão MATCH (todos os termos)"""
+        termos = list(dict.fromkeys(tokenizar(consulta)))
+        if not termos:
+            return None
+
+        # Termos entre aspas: a consulta nunca é interpretada como sintaxe do FTS5
+        return ' '.join(f'"{termo}"' for termo in termos)
+
+    def indexar(self, ids):
+        """Reindexa as solicitações informadas (remove as que não existem mais)"""
+        ids = [id for id in dict.fromkeys(ids) if id is not None]
+        if not ids:
+            return 0
+
+        with db_connection() as origem, busca_connection() as destino:
+            self.preparar(destino)
+            total = 0
+            for inicio in range(0, len(ids), TAMANHO_LOTE):
+                lote = ids[inicio:inicio + TAMANHO_LOTE]
+                documentos = self._carregar_documentos(origem, lote)
+                destino.executemany("DELETE FROM DOCUMENTOS_BUSCA WHERE rowid = ?", [(id,) for id in lote])
+                destino.executemany("""
+                    INSERT INTO DOCUMENTOS_BUSCA (
+                        rowid, TITULO, DESCRICAO, COMENTARIOS, CODIGO_REFERENCIA, TITULO_ORIGINAL, DTHR_CRIACAO
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, documentos)
+                destino.commit()
+                total += len(documentos)
+        return total
+
+    def remover(self, ids):
+        """Remove solicitações do índice (ex.: arquivadas)"""
+        with busca_connection() as con:
+            self.preparar(con)
+            con.executemany("DELETE FROM DOCUMENTOS_BUSCA WHERE rowid = ?", [(id,) for id in ids])
+            con.commit()
+
+    def sincronizar(self):
+        """Indexa o que mudou desde a última sincronização e retorna o total indexado"""
+        with busca_connection() as con:
+            self.preparar(con)
+            marcas = dict(con.execute("SELECT CHAVE, VALOR FROM MARCAS_BUSCA").fetchall())
+
+        marca_data = datetime.fromisoformat(marcas['SOLICITACOES']) if marcas.get('SOLICITACOES') else datetime.min
+        marca_comentario = int(marcas.get('COMENTARIOS') or 0)
+
+        with db_connection() as con:
+            cur = con.cursor()
+            # Solicitações nunca alteradas têm apenas DTHR_CRIACAO
+            cur.execute("""
+                SELECT ID, COALESCE(DTHR_ATUALIZACAO, DTHR_CRIACAO) FROM SOLICITACOES
+                WHERE DTHR_ATUALIZACAO >= ? OR (DTHR_ATUALIZACAO IS NULL AND DTHR_CRIACAO >= ?)
+            """, (marca_data, marca_data))
+            alteradas = cur.fetchall()
+            cur.execute(
+                "SELECT ID, ID_SOLICITACAO FROM COMENTARIOS WHERE ID > ? ORDER BY ID",
+                (marca_comentario,)
+            )
+            comentarios = cur.fetchall()
+
+        ids = [id for id, _ in alteradas] + [id_solicitacao for _, id_solicitacao in comentarios]
+        total = self.indexar(ids)
+
+        # Mesmo timestamp é reprocessado na próxima vez (>=), então nenhuma linha se perde
+        nova_data = max((dthr for _, dthr in alteradas if dthr), default=marca_data)
+        novo_comentario = comentarios[-1][0] if comentarios else marca_comentario
+        self._gravar_marcas(nova_data, novo_comentario)
+        return total
+
+    def reconstruir(self):
+        """Recria o índice inteiro a partir do Firebird"""
+        inicio = datetime.now()
+        with busca_connection() as con:
+            con.execute("DROP TABLE IF EXISTS DOCUMENTOS_BUSCA")
+            con.execute("DROP TABLE IF EXISTS MARCAS_BUSCA")
+            con.commit()
+            self.preparar(con)
+
+        with db_connection() as origem:
+            cur = origem.cursor()
+            cur.execute("SELECT MAX(ID) FROM COMENTARIOS")
+            ultimo_comentario = cur.fetchone()[0] or 0
+            cur.execute("SELECT ID FROM SOLICITACOES ORDER BY ID")
+            ids = [row[0] for row in cur.fetchall()]
+
+        total = self.indexar(ids)
+        # Alterações feitas durante a reconstrução são pegas na próxima sincronização
+        self._gravar_marcas(inicio, ultimo_comentario)
+        with busca_connection() as con:
+            con.execute("INSERT INTO DOCUMENTOS_BUSCA(DOCUMENTOS_BUSCA) VALUES ('optimize')")
+            con.commit()
+        return total
+
+    def _carregar_documentos(self, con, ids):
+        """Lê título, descrição e comentários públicos e monta as linhas do índice"""
+        cur = con.cursor()
+        placeholders = ', '.join('?' for _ in ids)
+
+        cur.execute(f"""
+            SELECT ID_SOLICITACAO, COMENTARIO FROM COMENTARIOS
+            WHERE ID_SOLICITACAO IN ({placeholders}) AND COALESCE(INTERNO, FALSE) = FALSE
+            ORDER BY ID
+        """, ids)
+        comentarios = {}
+        for id_solicitacao, comentario in cur.fetchall():
+            comentarios.setdefault(id_solicitacao, []).extend(tokenizar(texto(comentario)))
+
+        cur.execute(f"""
+            SELECT ID, CODIGO_REFERENCIA, TITULO, DESCRICAO, DTHR_CRIACAO
+            FROM SOLICITACOES WHERE ID IN ({placeholders})
+        """, ids)
+        return [
+            (
+                id,
+                ' '.join(tokenizar(titulo)),
+                ' '.join(tokenizar(texto(descricao))),
+                ' '.join(comentarios.get(id, [])),
+                codigo,
+                titulo,
+                dthr_criacao.isoformat() if dthr_criacao else None,
+            )
+            for id, codigo, titulo, descricao, dthr_criacao in cur.fetchall()
+        ]
+
+    def _gravar_marcas(self, marca_data, marca_comentario):
+        with busca_connection() as con:
+            con.executemany("INSERT OR REPLACE INTO MARCAS_BUSCA (CHAVE, VALOR) VALUES (?, ?)", [
+                ('SOLICITACOES', marca_data.isoformat() if marca_data != datetime.min else None),
+                ('COMENTARIOS', str(marca_comentario)),
+            ])
+            con.commit()
+
+class IndiceArtigos:
+    """Índice invertido dos artigos ativos da base de conhecimento"""
+
+    def preparar(self, con):
+        """Cria a tabela de artigos do índice, se ainda não existir"""
+        con.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS ARTIGOS_BUSCA USING fts5(
+                TITULO, CONTEUDO, TAGS, CATEGORIA UNINDEXED,
+                tokenize = 'unicode61 remove_diacritics 0'
+            )
+        """)
+        con.commit()
+
+    def buscar(self, termos, qualquer_termo=False, categoria=None, ids=None, limite=10):
+        """Retorna [(id, relevância)] dos artigos que casam com os termos já normalizados"""
+        termos = list(dict.fromkeys(termos))
+        if not termos or (ids is not None and not ids):
+            return []
+
+        separador = ' OR ' if qualquer_termo else ' '
+        condicoes = ["ARTIGOS_BUSCA MATCH ?"]
+        params = [separador.join(f'"{termo}"' for termo in termos)]
+        if categoria:
+            condicoes.append("CATEGORIA = ?")
+            params.append(categoria)
+        if ids is not None:
+            condicoes.append(f"rowid IN ({', '.join('?' for _ in ids)})")
+            params.extend(ids)
+
+        pesos = ', '.join(str(peso) for peso in PESOS_BM25_ARTIGOS)
+        with busca_connection() as con:
+            self.preparar(con)
+            cur = con.execute(f"""
+                SELECT rowid, bm25(ARTIGOS_BUSCA, {pesos}) AS PONTUACAO
+                FROM ARTIGOS_BUSCA
+                WHERE {' AND '.join(condicoes)}
+                ORDER BY PONTUACAO
+                LIMIT ?
+            """, (*params, limite))
+            return [(id, -pontuacao) for id, pontuacao in cur.fetchall()]
+
+    def indexar(self, ids):
+        """Reindexa os artigos informados (inativos e removidos saem do índice)"""
+        ids = [id for id in dict.fromkeys(ids) if id is not None]
+        if not ids:
+            return 0
+
+        with db_connection() as origem, busca_connection() as destino:
+            self.preparar(destino)
+            total = 0
+            for inicio in range(0, len(ids), TAMANHO_LOTE):
+                lote = ids[inicio:inicio + TAMANHO_LOTE]
+                documentos = self._carregar_documentos(origem, lote)
+                destino.executemany("DELETE FROM ARTIGOS_BUSCA WHERE rowid = ?", [(id,) for id in lote])
+                destino.executemany(
+                    "INSERT INTO ARTIGOS_BUSCA (rowid, TITULO, CONTEUDO, TAGS, CATEGORIA) VALUES (?, ?, ?, ?, ?)",
+                    documentos
+                )
+                destino.commit()
+                total += len(documentos)
+        return total
+
+    def reconstruir(self):
+        """Recria a tabela de artigos do índice a partir do Firebird"""
+        with busca_connection() as con:
+            con.execute("DROP TABLE IF EXISTS ARTIGOS_BUSCA")
+            con.commit()
+            self.preparar(con)
+
+        with db_connection() as origem:
+            cur = origem.cursor()
+            cur.execute("SELECT ID FROM KNOWLEDGE_BASE WHERE ATIVO = TRUE ORDER BY ID")
+            ids = [row[0] for row in cur.fetchall()]
+
+        return self.indexar(ids)
+
+    def _carregar_documentos(self, con, ids):
+        """Lê os artigos ativos e monta as linhas do índice"""
+        cur = con.cursor()
+        cur.execute(f"""
+            SELECT ID, TITULO, CONTEUDO, TAGS, CATEGORIA FROM KNOWLEDGE_BASE
+            WHERE ID IN ({', '.join('?' for _ in ids)}) AND ATIVO = TRUE
+        """, ids)
+        return [
+            (
+                id,
+                ' '.join(tokenizar(titulo)),
+                ' '.join(tokenizar(texto(conteudo))),
+                ' '.join(tokenizar(' '.join(json.loads(texto(tags) or '[]')))),
+                categoria,
+            )
+            for id, titulo, conteudo, tags, categoria in cur.fetchall()
+        ]
+
+indice_busca = IndiceBusca()
+indice_artigos = IndiceArtigos()
+
+def atualizar_indice_busca(*ids):
+    """Reindexa solicitações após uma gravação sem interromper a operação em caso de erro"""
+    try:
+        indice_busca.indexar(ids)
+    except Exception as e:
+        print(f"⚠️ [BUSCA] Índice não atualizado para {ids} (será corrigido na sincronização): {e}")
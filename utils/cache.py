@@ -0,0 +1,261 @@
+"""
+Caches em memória
+
+CacheLRU guarda até `capacidade` resultados por processo, descartando o usado
+há mais tempo quando cheio. O TTL opcional limita por quanto tempo um resultado
+pode ficar desatualizado em relação a alterações feitas por outros processos,
+que não invalidam o cache local.
+
+CacheRespostas guarda respostas de endpoints de leitura com TTL, invalidação
+por tags (nomes de tabela, disparada pelas gravações dos models), cálculo único
+para acessos simultâneos à mesma chave (single-flight) e uso de respostas
+vencidas, por tempo limitado, quando o banco falha ou está lento.
+
+MapaIdentidade guarda registros lidos por ID: primeiro os já lidos na
+requisição atual (escopo aberto pelo app a cada requisição), depois um LRU do
+processo. As gravações do model removem o registro dos dois níveis.
+"""
+
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from contextvars import ContextVar
+import config
+
+class CacheLRU:
+    """Cache LRU com expiração opcional, seguro entre threads"""
+
+    def __init__(self, capacidade, ttl=None):
+        self.capacidade = capacidade
+        self.ttl = ttl
+        self.itens = OrderedDict()   # chave -> (expira_em, valor)
+        self.lock = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+        self.geracao = 0             # invalidações; evita guardar resultado calculado antes de uma delas
+
+    def obter(self, chave, padrao=None):
+        """Valor em cache (marcado como usado recentemente) ou padrao"""
+        with self.lock:
+            item = self.itens.get(chave)
+            if item is None or (item[0] is not None and item[0] < time.monotonic()):
+                if item is not None:
+                    del self.itens[chave]
+                self.falhas += 1
+                return padrao
+            self.itens.move_to_end(chave)
+            self.acertos += 1
+            return item[1]
+
+    def guardar(self, chave, valor, geracao=None):
+        """Guarda o valor, descartando o item menos usado se necessário
+
+        Com geracao (lida antes de calcular o valor), não guarda se houve invalidação desde então.
+        """
+        expira_em = time.monotonic() + self.ttl if self.ttl else None
+        with self.lock:
+            if geracao is not None and geracao != self.geracao:
+                return
+            self.itens[chave] = (expira_em, valor)
+            self.itens.move_to_end(chave)
+            while len(self.itens) > self.capacidade:
+                self.itens.popitem(last=False)
+
+    def invalidar(self, chave=None):
+        """Remove uma chave ou, sem argumento, todo o cache"""
+        with self.lock:
+            self.geracao += 1
+            if chave is None:
+                self.itens.clear()
+            else:
+                self.itens.pop(chave, None)
+
+    def estatisticas(self):
+        """Tamanho e taxa de acerto do cache"""
+        with self.lock:
+            consultas = self.acertos + self.falhas
+            return {
+                'itens': len(self.itens),
+                'capacidade': self.capacidade,
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'taxa_acerto': round(self.acertos / consultas, 4) if consultas else None,
+            }
+
+class _Entrada:
+    __slots__ = ('valor', 'expira_em', 'tags')
+
+    def __init__(self, valor, expira_em, tags):
+        self.valor = valor
+        self.expira_em = expira_em
+        self.tags = tags
+
+class _Calculo:
+    """Cálculo em andamento de uma chave, aguardado pelos demais acessos"""
+    __slots__ = ('concluido', 'valor', 'erro')
+
+    def __init__(self):
+        self.concluido = threading.Event()
+        self.valor = None
+        self.erro = None
+
+class CacheRespostas:
+    """Cache de respostas com TTL, tags, single-flight e uso de respostas vencidas"""
+
+    def __init__(self, capacidade):
+        self.capacidade = capacidade
+        self.itens = OrderedDict()              # chave -> _Entrada
+        self.calculos = {}                      # chave -> _Calculo em andamento
+        self.geracoes = defaultdict(int)        # tag -> invalidações
+        self.lock = threading.Lock()
+        self.contagem = defaultdict(lambda: defaultdict(int))  # grupo -> evento -> total
+
+    def obter_ou_calcular(self, chave, calcular, ttl, tags=(), grupo=None):
+        """Retorna (valor, situação): HIT, MISS, STALE ou COALESCED"""
+        grupo = grupo or chave[0]
+        agora = time.monotonic()
+
+        with self.lock:
+            entrada = self.itens.get(chave)
+            if entrada is not None and entrada.expira_em > agora:
+                self.itens.move_to_end(chave)
+                self._contar(grupo, 'HIT')
+                return entrada.valor, 'HIT'
+
+            calculo = self.calculos.get(chave)
+            lider = calculo is None
+            if lider:
+                calculo = self.calculos[chave] = _Calculo()
+                geracoes = {tag: self.geracoes[tag] for tag in tags}
+
+        if not lider:
+            # Outro acesso já está calculando: usa a vencida, se houver, ou espera o resultado
+            vencida = self._vencida(entrada, agora)
+            if vencida is not None:
+                self._contar(grupo, 'STALE')
+                return vencida, 'STALE'
+            if calculo.concluido.wait(config.CACHE_RESPOSTAS_ESPERA_SEGUNDOS) and calculo.erro is None:
+                self._contar(grupo, 'COALESCED')
+                return calculo.valor, 'COALESCED'
+            # Líder falhou ou demorou demais: calcula por conta própria
+            self._contar(grupo, 'MISS')
+            return calcular(), 'MISS'
+
+        try:
+            valor = calcular()
+        except Exception as e:
+            calculo.erro = e
+            vencida = self._vencida(entrada, time.monotonic())
+            if vencida is None:
+                self._contar(grupo, 'ERRO')
+                raise
+            print(f"⚠️ [CACHE] Servindo resposta vencida de {grupo}: {e}")
+            self._contar(grupo, 'STALE')
+            return vencida, 'STALE'
+        finally:
+            with self.lock:
+                self.calculos.pop(chave, None)
+            calculo.concluido.set()
+
+        calculo.valor = valor
+        with self.lock:
+            # Uma gravação durante o cálculo invalidou as tags: não guarda o resultado antigo
+            if all(self.geracoes[tag] == geracao for tag, geracao in geracoes.items()):
+                self.itens[chave] = _Entrada(valor, time.monotonic() + ttl, tuple(tags))
+                self.itens.move_to_end(chave)
+                while len(self.itens) > self.capacidade:
+                    self.itens.popitem(last=False)
+            self._contar(grupo, 'MISS')
+        return valor, 'MISS'
+
+    def invalidar_tags(self, *tags):
+        """Remove as respostas que dependem de alguma das tags"""
+        tags = set(tags)
+        with self.lock:
+            for tag in tags:
+                self.geracoes[tag] += 1
+            for chave in [chave for chave, entrada in self.itens.items() if tags.intersection(entrada.tags)]:
+                del self.itens[chave]
+
+    def limpar(self):
+        with self.lock:
+            self.itens.clear()
+
+    def estatisticas(self):
+        """Acertos, falhas e taxa de acerto por endpoint"""
+        with self.lock:
+            grupos = {}
+            for grupo, eventos in self.contagem.items():
+                consultas = sum(eventos.values())
+                atendidas = sum(eventos.get(evento, 0) for evento in ('HIT', 'STALE', 'COALESCED'))
+                grupos[grupo] = dict(eventos, taxa_acerto=round(atendidas / consultas, 4) if consultas else None)
+            return {'itens': len(self.itens), 'capacidade': self.capacidade, 'endpoints': grupos}
+
+    def _vencida(self, entrada, agora):
+        """Valor vencido ainda dentro da janela config.CACHE_RESPOSTAS_VENCIDA_SEGUNDOS"""
+        if entrada is not None and agora - entrada.expira_em <= config.CACHE_RESPOSTAS_VENCIDA_SEGUNDOS:
+            return entrada.valor
+        return None
+
+    def _contar(self, grupo, evento):
+        # Chamado com ou sem o lock: incremento de int em dict é suficiente para estatística
+        self.contagem[grupo][evento] += 1
+
+# Respostas dos endpoints de leitura da API (invalidadas pelas gravações dos models)
+cache_respostas = CacheRespostas(config.CACHE_RESPOSTAS_MAX_ITENS)
+
+def invalidar_respostas(*tabelas):
+    """Descarta as respostas em cache que dependem das tabelas gravadas"""
+    cache_respostas.invalidar_tags(*tabelas)
+
+# Registros lidos na requisição atual: {(tabela, id): {variante: registro}} (None fora de requisição)
+_registros_requisicao = ContextVar('registros_requisicao', default=None)
+
+def iniciar_escopo_requisicao():
+    _registros_requisicao.set({})
+
+def encerrar_escopo_requisicao():
+    _registros_requisicao.set(None)
+
+class MapaIdentidade:
+    """Registros de uma tabela por ID, na requisição e em um LRU do processo"""
+
+    def __init__(self, tabela, capacidade, ttl):
+        self.tabela = tabela
+        self.cache = CacheLRU(capacidade, ttl=ttl)   # id -> {variante: registro}
+        self.geracao = 0                             # invalidações; evita guardar leitura anterior a uma gravação
+        self.lock = threading.Lock()
+
+    def obter(self, id, variante, carregar):
+        """Cópia do registro em cache ou carregar() (registros inexistentes não são guardados)"""
+        registros = _registros_requisicao.get()
+        if registros is not None:
+            registro = registros.get((self.tabela, id), {}).get(variante)
+            if registro is not None:
+                return dict(registro)
+
+        variantes = self.cache.obter(id, {})
+        registro = variantes.get(variante)
+        if registro is None:
+            geracao = self.geracao
+            registro = carregar()
+            if registro is None:
+                return None
+            with self.lock:
+                if geracao == self.geracao:
+                    self.cache.guardar(id, {**variantes, variante: registro})
+
+        if registros is not None:
+            registros.setdefault((self.tabela, id), {})[variante] = registro
+        return dict(registro)
+
+    def invalidar(self, id):
+        with self.lock:
+            self.geracao += 1
+            self.cache.invalidar(id)
+        registros = _registros_requisicao.get()
+        if registros is not None:
+            registros.pop((self.tabela, id), None)
+
+    def estatisticas(self):
+        return self.cache.estatisticas()
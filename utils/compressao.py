@@ -0,0 +1,227 @@
+"""
+Compressão das respostas HTTP (gzip/brotli)
+
+MiddlewareCompressao envolve a aplicação WSGI e comprime as respostas de texto
+(HTML, JSON, CSS, JS, CSV...) acima de config.COMPRESSAO_HTTP_LIMITE_BYTES com o
+melhor algoritmo aceito pelo cliente (Accept-Encoding). Respostas em streaming
+(sem Content-Length, como as exportações) são comprimidas à medida que são
+geradas, sem acumular o corpo. Arquivos de static/ com versão pré-comprimida
+(.br/.gz, gerada por scripts/precomprimir_estaticos.py) são servidos diretamente.
+"""
+
+import gzip
+import mimetypes
+import os
+import zlib
+from datetime import datetime, timezone
+from wsgiref.util import FileWrapper
+from werkzeug.http import http_date, is_resource_modified
+import config
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional, gzip é sempre usado como alternativa
+    brotli = None
+
+# Tipos comprimidos (o restante, como imagens e PDFs, já é comprimido)
+TIPOS_COMPRIMIVEIS = {
+    'text/html', 'text/css', 'text/plain', 'text/csv', 'text/javascript', 'text/xml',
+    'application/javascript', 'application/json', 'application/x-ndjson', 'application/xml',
+    'image/svg+xml',
+}
+
+EXTENSOES = {'br': '.br', 'gzip': '.gz'}
+
+def algoritmos_disponiveis():
+    """Algoritmos na ordem de preferência"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def escolher_algoritmo(accept_encoding):
+    """Melhor algoritmo aceito pelo cliente (respeitando q=0) ou None"""
+    aceitos = {}
+    for parte in (accept_encoding or '').lower().split(','):
+        nome, _, parametros = parte.strip().partition(';')
+        qualidade = 1.0
+        if parametros.strip().startswith('q='):
+            try:
+                qualidade = float(parametros.strip()[2:])
+            except ValueError:
+                qualidade = 0.0
+        aceitos[nome.strip()] = qualidade
+
+    for algoritmo in algoritmos_disponiveis():
+        if aceitos.get(algoritmo, aceitos.get('*', 0)) > 0:
+            return algoritmo
+    return None
+
+def comprimir_arquivo(conteudo, algoritmo):
+    """Compressão máxima, para arquivos pré-comprimidos"""
+    if algoritmo == 'br':
+        return brotli.compress(conteudo, quality=11)
+    return gzip.compress(conteudo, compresslevel=9, mtime=0)
+
+class _Compressor:
+    """Compressão incremental de um corpo de resposta"""
+
+    def __init__(self, algoritmo):
+        self.algoritmo = algoritmo
+        if algoritmo == 'br':
+            self.compressor = brotli.Compressor(quality=config.COMPRESSAO_HTTP_QUALIDADE_BROTLI)
+        else:
+            # wbits 31: formato gzip
+            self.compressor = zlib.compressobj(config.COMPRESSAO_HTTP_NIVEL_GZIP, zlib.DEFLATED, 31)
+
+    def bloco(self, dados):
+        """Comprime um bloco; a saída sai à medida que o buffer interno enche (sem flush por linha)"""
+        if self.algoritmo == 'br':
+            return self.compressor.process(dados)
+        return self.compressor.compress(dados)
+
+    def tudo(self, dados):
+        if self.algoritmo == 'br':
+            return self.compressor.process(dados) + self.compressor.finish()
+        return self.compressor.compress(dados) + self.compressor.flush()
+
+    def fim(self):
+        if self.algoritmo == 'br':
+            return self.compressor.finish()
+        return self.compressor.flush()
+
+class MiddlewareCompressao:
+    """Middleware WSGI de compressão das respostas e dos estáticos pré-comprimidos"""
+
+    def __init__(self, app, pasta_estaticos=None, prefixo_estaticos='/static/'):
+        self.app = app
+        self.pasta_estaticos = pasta_estaticos
+        self.prefixo_estaticos = prefixo_estaticos
+
+    def __call__(self, environ, start_response):
+        algoritmo = escolher_algoritmo(environ.get('HTTP_ACCEPT_ENCODING'))
+        if algoritmo is None or environ.get('REQUEST_METHOD') == 'HEAD':
+            return self.app(environ, start_response)
+
+        if self.pasta_estaticos and environ.get('PATH_INFO', '').startswith(self.prefixo_estaticos):
+            resposta = self._estatico_precomprimido(environ, start_response, algoritmo)
+            if resposta is not None:
+                return resposta
+
+        estado = {}
+
+        def start_response_compressao(status, headers, exc_info=None):
+            estado['comprimir'] = self._deve_comprimir(status, headers)
+            if not estado['comprimir']:
+                return start_response(status, headers, exc_info)
+
+            tamanho = _header(headers, 'Content-Length')
+            estado['streaming'] = tamanho is None
+            estado['status'], estado['exc_info'] = status, exc_info
+            estado['headers'] = [
+                (nome, valor) for nome, valor in headers
+                if nome.lower() not in ('content-length', 'etag', 'vary')
+            ]
+            estado['headers'] += [('Content-Encoding', algoritmo), ('Vary', _vary(headers))]
+            etag = _header(headers, 'ETag')
+            if etag:
+                # Outra representação do mesmo recurso: ETag fraco (If-None-Match compara de forma fraca)
+                estado['headers'].append(('ETag', etag if etag.startswith('W/') else 'W/' + etag))
+            if estado['streaming']:
+                estado['escrever'] = start_response(status, estado['headers'], exc_info)
+                return estado['escrever']
+            # Corpo com tamanho conhecido: start_response é chamado depois, com o novo Content-Length
+            return lambda dados: estado.setdefault('escritos', []).append(dados)
+
+        resposta = self.app(environ, start_response_compressao)
+        if not estado.get('comprimir'):
+            return resposta
+
+        compressor = _Compressor(algoritmo)
+        if estado['streaming']:
+            return self._streaming(resposta, compressor)
+
+        try:
+            corpo = b''.join(estado.get('escritos', [])) + b''.join(resposta)
+        finally:
+            if hasattr(resposta, 'close'):
+                resposta.close()
+        corpo = compressor.tudo(corpo)
+        start_response(estado['status'], estado['headers'] + [('Content-Length', str(len(corpo)))], estado['exc_info'])
+        return [corpo]
+
+    def _deve_comprimir(self, status, headers):
+        if not status.startswith('200') and not status.startswith('201'):
+            return False
+        if _header(headers, 'Content-Encoding') or 'no-transform' in (_header(headers, 'Cache-Control') or ''):
+            return False
+        tipo = (_header(headers, 'Content-Type') or '').split(';')[0].strip().lower()
+        if tipo not in TIPOS_COMPRIMIVEIS:
+            return False
+        tamanho = _header(headers, 'Content-Length')
+        return tamanho is None or int(tamanho) >= config.COMPRESSAO_HTTP_LIMITE_BYTES
+
+    def _streaming(self, resposta, compressor):
+        try:
+            for dados in resposta:
+                comprimido = compressor.bloco(dados) if dados else b''
+                if comprimido:
+                    yield comprimido
+            yield compressor.fim()
+        finally:
+            if hasattr(resposta, 'close'):
+                resposta.close()
+
+    def _estatico_precomprimido(self, environ, start_response, algoritmo):
+        """Serve static/<arquivo>.br|.gz se existir e não for mais antigo que o original"""
+        relativo = environ['PATH_INFO'][len(self.prefixo_estaticos):]
+        original = os.path.realpath(os.path.join(self.pasta_estaticos, relativo))
+        if not original.startswith(os.path.realpath(self.pasta_estaticos) + os.sep):
+            return None
+        comprimido = original + EXTENSOES[algoritmo]
+        try:
+            dados_original = os.stat(original)
+            if os.path.getmtime(comprimido) < dados_original.st_mtime:
+                return None
+        except OSError:
+            return None
+
+        # Validadores do arquivo original (ETag fraco: representação comprimida do mesmo conteúdo)
+        modificado = datetime.fromtimestamp(int(dados_original.st_mtime), timezone.utc)
+        etag = f'"{dados_original.st_mtime_ns:x}-{dados_original.st_size:x}"'
+        cache = (
+            f'public, max-age={config.COMPRESSAO_HTTP_CACHE_ESTATICOS}' if config.COMPRESSAO_HTTP_CACHE_ESTATICOS
+            else 'public, no-cache'
+        )
+        headers = [
+            ('ETag', 'W/' + etag),
+            ('Last-Modified', http_date(modificado)),
+            ('Vary', 'Accept-Encoding'),
+            ('Cache-Control', cache),
+        ]
+        if not is_resource_modified(environ, etag=etag, last_modified=modificado):
+            start_response('304 Not Modified', headers)
+            return []
+
+        try:
+            arquivo = open(comprimido, 'rb')
+        except OSError:
+            return None
+        tipo = mimetypes.guess_type(original)[0] or 'application/octet-stream'
+        if tipo.startswith('text/') or tipo == 'application/javascript':
+            tipo += '; charset=utf-8'
+        start_response('200 OK', [
+            ('Content-Type', tipo),
+            ('Content-Encoding', algoritmo),
+            ('Content-Length', str(os.fstat(arquivo.fileno()).st_size)),
+        ] + headers)
+        return environ.get('wsgi.file_wrapper', FileWrapper)(arquivo)
+
+def _header(headers, nome):
+    nome = nome.lower()
+    return next((valor for chave, valor in headers if chave.lower() == nome), None)
+
+def _vary(headers):
+    atual = _header(headers, 'Vary')
+    if not atual:
+        return 'Accept-Encoding'
+    if 'accept-encoding' in atual.lower():
+        return atual
+    return atual + ', Accept-Encoding'
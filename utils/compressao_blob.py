@@ -0,0 +1,106 @@
+"""
+Compressão transparente de colunas BLOB de texto
+
+Valores acima de config.COMPRESSAO_BLOB_LIMITE_BYTES são gravados comprimidos,
+precedidos por um byte de cabeçalho que identifica o algoritmo. Valores sem
+cabeçalho (gravados antes da compressão ou por triggers) são lidos como estão,
+então linhas antigas e novas convivem na mesma coluna.
+"""
+
+import zlib
+import config
+
+try:
+    import zstandard
+except ImportError:  # zstd é opcional, zlib é sempre usado como alternativa
+    zstandard = None
+
+CABECALHO_ZLIB = b'\x01'
+CABECALHO_ZSTD = b'\x02'
+
+# Colunas comprimidas por tabela (usado pelos models e pelo backfill)
+COLUNAS_COMPRIMIDAS = {
+    'SOLICITACOES': ['DESCRICAO'],
+    'HISTORICO': ['DADOS_ANTERIORES', 'DADOS_NOVOS', 'USER_AGENT'],
+    'COMENTARIOS': ['COMENTARIO'],
+    'TEMPLATES_EMAIL': ['CORPO_HTML'],
+    'KNOWLEDGE_BASE': ['CONTEUDO'],
+}
+
+def comprimir(valor):
+    """Converte o valor em bytes, comprimindo-o se passar do limite"""
+    if valor is None:
+        return None
+    if isinstance(valor, str):
+        valor = valor.encode('utf-8')
+    elif not isinstance(valor, bytes):
+        valor = str(valor).encode('utf-8')
+
+    if len(valor) < config.COMPRESSAO_BLOB_LIMITE_BYTES or esta_comprimido(valor):
+        return valor
+
+    if config.COMPRESSAO_BLOB_ALGORITMO == 'zstd' and zstandard is not None:
+        comprimido = CABECALHO_ZSTD + zstandard.ZstdCompressor(level=config.COMPRESSAO_BLOB_NIVEL).compress(valor)
+    else:
+        comprimido = CABECALHO_ZLIB + zlib.compress(valor, min(config.COMPRESSAO_BLOB_NIVEL, 9))
+
+    # Conteúdo que não comprime (ex.: já compactado) é gravado como está
+    return comprimido if len(comprimido) < len(valor) else valor
+
+def descomprimir(valor):
+    """Retorna os bytes originais de um valor lido do banco"""
+    if hasattr(valor, 'read'):
+        # BLOBs grandes chegam como leitores em streaming
+        leitor = valor
+        try:
+            valor = leitor.read()
+        finally:
+            leitor.close()
+
+    if not isinstance(valor, bytes) or not valor:
+        return valor
+
+    try:
+        if valor[:1] == CABECALHO_ZLIB:
+            return zlib.decompress(valor[1:])
+        if valor[:1] == CABECALHO_ZSTD and zstandard is not None:
+            return zstandard.ZstdDecompressor().decompress(valor[1:])
+    except Exception as e:
+        # Cabeçalho coincidente em dado não comprimido: devolve o valor bruto
+        print(f"⚠️ [COMPRESSAO] Valor com cabeçalho inválido mantido sem descompressão: {e}")
+    return valor
+
+def texto(valor):
+    """Descomprime e decodifica um BLOB de texto (None vira '')"""
+    valor = descomprimir(valor)
+    if valor is None:
+        return ''
+    if isinstance(valor, bytes):
+        return valor.decode('utf-8', errors='replace')
+    return valor
+
+def esta_comprimido(valor):
+    return isinstance(valor, bytes) and valor[:1] in (CABECALHO_ZLIB, CABECALHO_ZSTD)
+
+def descomprimir_segmentos(segmentos):
+    """Descomprime em streaming uma sequência de blocos de bytes de um BLOB"""
+    segmentos = iter(segmentos)
+    primeiro = next(segmentos, b'')
+    cabecalho = primeiro[:1]
+
+    if cabecalho == CABECALHO_ZLIB:
+        descompressor = zlib.decompressobj()
+    elif cabecalho == CABECALHO_ZSTD and zstandard is not None:
+        descompressor = zstandard.ZstdDecompressor().decompressobj()
+    else:
+        # Valor sem compressão: repassa os blocos como estão
+        if primeiro:
+            yield primeiro
+        yield from segmentos
+        return
+
+    yield descompressor.decompress(primeiro[1:])
+    for segmento in segmentos:
+        yield descompressor.decompress(segmento)
+    if hasattr(descompressor, 'flush'):
+        yield descompressor.flush()
@@ -0,0 +1,213 @@
+"""
+Agregação de contadores e datas de último acesso
+
+Incrementos (ex.: KNOWLEDGE_BASE.VISUALIZACOES), avaliações (média) e datas de
+"último acesso" (ex.: USUARIOS.DTHR_ULTIMO_ACESSO) são acumulados em memória e
+gravados a cada config.CONTADORES_INTERVALO_SEGUNDOS com um único UPDATE por
+coluna (CASE ID WHEN ...), em vez de um UPDATE por evento na mesma linha.
+As leituras podem somar os valores ainda pendentes com pendentes()/aplicar();
+caches que guardam esses valores registram em ao_gravar() a invalidação a
+fazer depois de cada gravação da tabela.
+"""
+
+import atexit
+import threading
+from collections import defaultdict
+from decimal import Decimal
+import config
+from database.connection import db_connection
+
+# IDs por UPDATE (cada ID usa dois parâmetros por CASE; mantém o SQL abaixo de 64 KB)
+TAMANHO_LOTE = 200
+
+class AgregadorContadores:
+    """Acumula incrementos, avaliações e últimos acessos por linha"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.lock_gravacao = threading.Lock()
+        self.incrementos = defaultdict(lambda: defaultdict(int))   # (tabela, coluna) -> {id: delta}
+        self.ultimos = defaultdict(dict)                           # (tabela, coluna) -> {id: datetime}
+        self.avaliacoes = defaultdict(lambda: defaultdict(lambda: [0, 0]))  # (tabela, media, total) -> {id: [soma, qtd]}
+        self.parar = threading.Event()
+        self.thread = None
+        self.callbacks = defaultdict(list)  # tabela -> funções chamadas depois de gravá-la
+
+    def ao_gravar(self, tabela, callback):
+        """Registra callback() para depois de cada gravação de contadores da tabela"""
+        self.callbacks[tabela].append(callback)
+
+    def incrementar(self, tabela, coluna, id, delta=1):
+        """Soma delta ao contador da linha"""
+        self._iniciar()
+        with self.lock:
+            self.incrementos[(tabela, coluna)][id] += delta
+
+    def registrar_ultimo(self, tabela, coluna, id, quando):
+        """Guarda a data mais recente de um evento da linha"""
+        self._iniciar()
+        with self.lock:
+            atual = self.ultimos[(tabela, coluna)].get(id)
+            if atual is None or quando > atual:
+                self.ultimos[(tabela, coluna)][id] = quando
+
+    def avaliar(self, tabela, coluna_media, coluna_total, id, nota):
+        """Acumula uma nota para recalcular a média da linha"""
+        self._iniciar()
+        with self.lock:
+            acumulado = self.avaliacoes[(tabela, coluna_media, coluna_total)][id]
+            acumulado[0] += nota
+            acumulado[1] += 1
+
+    def pendentes(self, tabela, id):
+        """Valores ainda não gravados de uma linha: {coluna: delta/data/(soma, qtd)}"""
+        resultado = {}
+        with self.lock:
+            for (tab, coluna), valores in self.incrementos.items():
+                if tab == tabela and id in valores:
+                    resultado[coluna] = valores[id]
+            for (tab, coluna), valores in self.ultimos.items():
+                if tab == tabela and id in valores:
+                    resultado[coluna] = valores[id]
+            for (tab, media, total), valores in self.avaliacoes.items():
+                if tab == tabela and id in valores:
+                    resultado[(media, total)] = tuple(valores[id])
+        return resultado
+
+    def aplicar(self, tabela, registro, primary_key='ID'):
+        """Mescla os valores pendentes em um registro lido do banco (dict)"""
+        if not registro:
+            return registro
+
+        for coluna, valor in self.pendentes(tabela, registro[primary_key]).items():
+            if isinstance(coluna, tuple):
+                media, total = coluna
+                soma, quantidade = valor
+                total_atual = registro.get(total) or 0
+                media_atual = float(registro.get(media) or 0)
+                registro[total] = total_atual + quantidade
+                registro[media] = round((media_atual * total_atual + soma) / registro[total], 2)
+            elif isinstance(valor, int):
+                registro[coluna] = (registro.get(coluna) or 0) + valor
+            else:
+                atual = registro.get(coluna)
+                if atual is None or (valor.isoformat() if isinstance(atual, str) else valor) > atual:
+                    registro[coluna] = valor.isoformat() if isinstance(atual, str) else valor
+        return registro
+
+    def descarregar(self):
+        """Grava tudo o que estiver pendente, um UPDATE por coluna e lote de IDs"""
+        with self.lock_gravacao:
+            with self.lock:
+                incrementos, self.incrementos = self.incrementos, defaultdict(lambda: defaultdict(int))
+                ultimos, self.ultimos = self.ultimos, defaultdict(dict)
+                avaliacoes, self.avaliacoes = self.avaliacoes, defaultdict(lambda: defaultdict(lambda: [0, 0]))
+
+            if not (incrementos or ultimos or avaliacoes):
+                return 0
+
+            try:
+                with db_connection() as con:
+                    cur = con.cursor()
+                    linhas = 0
+                    for (tabela, coluna), valores in incrementos.items():
+                        linhas += self._atualizar(cur, tabela, valores, lambda caso: (
+                            f"{coluna} = COALESCE({coluna}, 0) + {caso('INTEGER', 0)}"
+                        ))
+                    for (tabela, coluna), valores in ultimos.items():
+                        linhas += self._atualizar(cur, tabela, valores, lambda caso: (
+                            f"{coluna} = MAXVALUE(COALESCE({coluna}, {caso('TIMESTAMP', 0)}), {caso('TIMESTAMP', 0)})"
+                        ))
+                    for (tabela, media, total), valores in avaliacoes.items():
+                        # No Firebird todas as expressões do SET enxergam os valores antigos da linha
+                        linhas += self._atualizar(cur, tabela, valores, lambda caso: (
+                            f"{media} = (COALESCE({media}, 0) * COALESCE({total}, 0) + {caso('DOUBLE PRECISION', 0)}) "
+                            f"/ (COALESCE({total}, 0) + {caso('INTEGER', 1)}), "
+                            f"{total} = COALESCE({total}, 0) + {caso('INTEGER', 1)}"
+                        ))
+                    con.commit()
+            except Exception as e:
+                print(f"❌ [CONTADORES] Erro ao gravar contadores, valores devolvidos ao buffer: {e}")
+                self._devolver(incrementos, ultimos, avaliacoes)
+                raise
+
+            # Os pendentes saíram do buffer: valores em cache sem eles ficariam menores
+            tabelas = {chave[0] for chave in (*incrementos, *ultimos, *avaliacoes)}
+            for tabela in tabelas:
+                for callback in self.callbacks.get(tabela, ()):
+                    try:
+                        callback()
+                    except Exception as e:
+                        print(f"⚠️ [CONTADORES] Erro ao invalidar o cache de {tabela}: {e}")
+            return linhas
+
+    def _atualizar(self, cur, tabela, valores, montar_set):
+        """Executa o UPDATE com CASE para cada lote de IDs"""
+        ids = list(valores)
+        total = 0
+        for inicio in range(0, len(ids), TAMANHO_LOTE):
+            lote = ids[inicio:inicio + TAMANHO_LOTE]
+            params = []
+
+            def caso(tipo, indice):
+                # Cada uso do CASE consome seus próprios parâmetros, na ordem do SQL
+                for id in lote:
+                    valor = valores[id]
+                    if isinstance(valor, list):
+                        valor = valor[indice]
+                    params.extend([id, float(valor) if isinstance(valor, Decimal) else valor])
+                whens = ' '.join(f"WHEN ? THEN CAST(? AS {tipo})" for _ in lote)
+                return f"(CASE ID {whens} END)"
+
+            set_clause = montar_set(caso)
+            params.extend(lote)
+            cur.execute(
+                f"UPDATE {tabela} SET {set_clause} WHERE ID IN ({', '.join('?' for _ in lote)})",
+                params
+            )
+            total += len(lote)
+        return total
+
+    def _devolver(self, incrementos, ultimos, avaliacoes):
+        """Recoloca no buffer os valores de uma gravação que falhou"""
+        with self.lock:
+            for chave, valores in incrementos.items():
+                for id, delta in valores.items():
+                    self.incrementos[chave][id] += delta
+            for chave, valores in ultimos.items():
+                for id, quando in valores.items():
+                    atual = self.ultimos[chave].get(id)
+                    if atual is None or quando > atual:
+                        self.ultimos[chave][id] = quando
+            for chave, valores in avaliacoes.items():
+                for id, (soma, quantidade) in valores.items():
+                    acumulado = self.avaliacoes[chave][id]
+                    acumulado[0] += soma
+                    acumulado[1] += quantidade
+
+    def _iniciar(self):
+        if self.thread is not None:
+            return
+        with self.lock:
+            if self.thread is not None:
+                return
+            self.thread = threading.Thread(target=self._executar, name='agregador-contadores', daemon=True)
+            self.thread.start()
+            atexit.register(self._encerrar)
+
+    def _executar(self):
+        while not self.parar.wait(config.CONTADORES_INTERVALO_SEGUNDOS):
+            try:
+                self.descarregar()
+            except Exception:
+                pass
+
+    def _encerrar(self):
+        self.parar.set()
+        try:
+            self.descarregar()
+        except Exception as e:
+            print(f"❌ [CONTADORES] Contadores perdidos no encerramento: {e}")
+
+# Instância única por processo
+contadores = AgregadorContadores()
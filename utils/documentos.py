@@ -0,0 +1,45 @@
+"""
+Validação de CPF/CNPJ em lote
+
+Os dígitos verificadores de todos os documentos de um lote são calculados de
+uma vez com NumPy (matriz de dígitos x pesos), em vez de um laço por documento.
+"""
+
+import re
+import numpy as np
+from utils.bloom import normalizar_documento
+
+PESOS_CPF = (np.arange(10, 1, -1), np.arange(11, 1, -1))
+PESOS_CNPJ = (np.array([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]), np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]))
+
+def _digitos_verificadores_validos(documentos, pesos):
+    """Máscara dos documentos (mesmo tamanho, só dígitos) com os dois dígitos verificadores corretos"""
+    tamanho = len(documentos[0])
+    digitos = (np.frombuffer(''.join(documentos).encode('ascii'), dtype=np.uint8) - ord('0')).reshape(-1, tamanho).astype(np.int64)
+
+    validos = ~(digitos == digitos[:, :1]).all(axis=1)   # todos os dígitos iguais
+    for posicao, peso in zip((tamanho - 2, tamanho - 1), pesos):
+        resto = (digitos[:, :posicao] @ peso) % 11
+        esperado = np.where(resto < 2, 0, 11 - resto)
+        validos &= digitos[:, posicao] == esperado
+    return validos
+
+def validar_documentos(documentos):
+    """Lista de bool: cada valor é um CPF (11 dígitos) ou CNPJ (14 dígitos) válido"""
+    limpos = [normalizar_documento(documento) for documento in documentos]
+    resultado = np.zeros(len(limpos), dtype=bool)
+
+    for tamanho, pesos in ((11, PESOS_CPF), (14, PESOS_CNPJ)):
+        posicoes = [i for i, documento in enumerate(limpos) if len(documento) == tamanho]
+        if posicoes:
+            resultado[posicoes] = _digitos_verificadores_validos([limpos[i] for i in posicoes], pesos)
+    return resultado.tolist()
+
+def formatar_documento(cpf_cnpj):
+    """CPF (000.000.000-00) ou CNPJ (00.000.000/0000-00) formatado; outros valores sem alteração"""
+    documento = normalizar_documento(cpf_cnpj)
+    if len(documento) == 11:
+        return re.sub(r'(\d{3})(\d{3})(\d{3})(\d{2})', r'\1.\2.\3-\4', documento)
+    if len(documento) == 14:
+        return re.sub(r'(\d{2})(\d{3})(\d{3})(\d{4})(\d{2})', r'\1.\2.\3/\4-\5', documento)
+    return cpf_cnpj
@@ -0,0 +1,237 @@
+"""
+Detecção de solicitações duplicadas na abertura
+
+Mantém em memória uma assinatura MinHash (NumPy) do título + descrição de
+cada solicitação em aberto, distribuída em buckets LSH por bandas. Uma nova
+solicitação só é comparada com as que caem em algum bucket em comum, então a
+verificação não depende do total de solicitações abertas. O índice é carregado
+na inicialização e sincronizado em segundo plano pelas alterações em
+DTHR_ATUALIZACAO a cada config.DUPLICATAS_INTERVALO_SEGUNDOS (a marca vem do
+relógio do Firebird, menos config.DUPLICATAS_MARGEM_SEGUNDOS).
+"""
+
+import json
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+import numpy as np
+import config
+from database.connection import db_connection
+from utils.auditoria import registrar_historico
+from utils.compressao_blob import texto
+from utils.normalizacao import tokenizar
+
+# Assinatura de 120 hashes em 40 bandas de 3: um par com similaridade 0,5
+# cai em algum bucket comum com ~99% de chance, um par com 0,1 com ~4%
+NUM_HASHES = 120
+NUM_BANDAS = 40
+
+# Primo acima de 2^32: (a * x + b) não estoura uint64 com a, b, x < 2^32
+PRIMO = np.uint64(4294967311)
+
+_aleatorio = np.random.default_rng(20240601)
+_COEF_A = _aleatorio.integers(1, 2 ** 32, NUM_HASHES, dtype=np.uint64)
+_COEF_B = _aleatorio.integers(0, 2 ** 32, NUM_HASHES, dtype=np.uint64)
+
+# Solicitações lidas do Firebird por lote na carga inicial
+TAMANHO_LOTE = 500
+
+def shingles(titulo, descricao):
+    """Termos e pares de termos consecutivos (radicais) do título e da descrição"""
+    termos = tokenizar(titulo) + tokenizar(descricao)
+    return set(termos) | {f"{a} {b}" for a, b in zip(termos, termos[1:])}
+
+def assinatura(conjunto):
+    """Assinatura MinHash de um conjunto de shingles (None se vazio)"""
+    if not conjunto:
+        return None
+    valores = np.fromiter((zlib.crc32(s.encode('utf-8')) for s in conjunto), dtype=np.uint64, count=len(conjunto))
+    return ((np.outer(_COEF_A, valores) + _COEF_B[:, None]) % PRIMO).min(axis=1)
+
+class IndiceDuplicatas:
+    """Índice MinHash/LSH das solicitações em aberto"""
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.lock_sincronizacao = threading.Lock()
+        self.sincronizando = False
+        self.assinaturas = {}   # id -> assinatura
+        self.dados = {}         # id -> (código, título, id_cliente, dthr_criacao)
+        self.buckets = [dict() for _ in range(NUM_BANDAS)]
+        self.carregado = False
+        self.marca = None
+        self.ultima_sincronizacao = 0
+
+    def candidatos(self, titulo, descricao, id_cliente=None, ignorar_id=None, limite=5):
+        """Solicitações abertas parecidas, da mais para a menos similar (mesmo cliente primeiro)"""
+        sig = assinatura(shingles(titulo, descricao))
+        if sig is None:
+            return []
+
+        self._garantir_atualizado()
+        with self.lock:
+            ids = set()
+            for banda, chave in enumerate(self._bandas(sig)):
+                ids.update(self.buckets[banda].get(chave, ()))
+            ids.discard(ignorar_id)
+
+            resultado = []
+            for id in ids:
+                similaridade = float(np.mean(self.assinaturas[id] == sig))
+                if similaridade < config.DUPLICATAS_LIMIAR:
+                    continue
+                codigo, titulo_existente, cliente, dthr_criacao = self.dados[id]
+                resultado.append({
+                    'ID': id,
+                    'CODIGO_REFERENCIA': codigo,
+                    'TITULO': titulo_existente,
+                    'DTHR_CRIACAO': dthr_criacao,
+                    'MESMO_CLIENTE': id_cliente is not None and cliente == id_cliente,
+                    'SIMILARIDADE': round(similaridade, 3),
+                })
+
+        resultado.sort(key=lambda item: (item['MESMO_CLIENTE'], item['SIMILARIDADE']), reverse=True)
+        return resultado[:limite]
+
+    def adicionar(self, id, codigo, titulo, descricao, id_cliente, dthr_criacao=None):
+        """Inclui (ou atualiza) uma solicitação em aberto no índice"""
+        sig = assinatura(shingles(titulo, descricao))
+        with self.lock:
+            self._remover(id)
+            if sig is None:
+                return
+            self.assinaturas[id] = sig
+            if isinstance(dthr_criacao, datetime):
+                dthr_criacao = dthr_criacao.isoformat()
+            self.dados[id] = (codigo, titulo, id_cliente, dthr_criacao)
+            for banda, chave in enumerate(self._bandas(sig)):
+                self.buckets[banda].setdefault(chave, set()).add(id)
+
+    def remover(self, *ids):
+        """Retira solicitações do índice (ex.: finalizadas)"""
+        with self.lock:
+            for id in ids:
+                self._remover(id)
+
+    def sincronizar(self):
+        """Carrega tudo na primeira vez; depois, só o que mudou desde a última marca
+
+        As consultas rodam sem self.lock: as buscas continuam usando o índice atual
+        e cada solicitação lida é aplicada com adicionar()/remover().
+        """
+        with self.lock_sincronizacao:
+            filtro, params = "WHERE ST.FINALIZADO = FALSE", ()
+            if self.marca is not None:
+                filtro, params = "WHERE S.DTHR_ATUALIZACAO >= ?", (self.marca,)
+
+            with db_connection() as con:
+                cur = con.cursor()
+                # Marca pelo relógio do banco (o mesmo de DTHR_ATUALIZACAO), com a folga relida na próxima vez
+                cur.execute("SELECT LOCALTIMESTAMP FROM RDB$DATABASE")
+                marca = cur.fetchone()[0] - timedelta(seconds=config.DUPLICATAS_MARGEM_SEGUNDOS)
+
+                cur.execute(f"""
+                    SELECT S.ID, S.CODIGO_REFERENCIA, S.TITULO, S.ID_CLIENTE, S.DTHR_CRIACAO, ST.FINALIZADO
+                    FROM SOLICITACOES S
+                    JOIN STATUS ST ON ST.ID = S.ID_STATUS
+                    {filtro}
+                """, params)
+                linhas = cur.fetchall()
+
+                abertas = [linha for linha in linhas if not linha[5]]
+                self.remover(*(linha[0] for linha in linhas if linha[5]))
+
+                for inicio_lote in range(0, len(abertas), TAMANHO_LOTE):
+                    lote = abertas[inicio_lote:inicio_lote + TAMANHO_LOTE]
+                    cur.execute(f"""
+                        SELECT ID, DESCRICAO FROM SOLICITACOES
+                        WHERE ID IN ({', '.join('?' for _ in lote)})
+                    """, [linha[0] for linha in lote])
+                    descricoes = {id: texto(descricao) for id, descricao in cur.fetchall()}
+                    for id, codigo, titulo, id_cliente, dthr_criacao, _ in lote:
+                        self.adicionar(id, codigo, titulo, descricoes.get(id), id_cliente, dthr_criacao)
+
+            self.marca = marca
+            self.carregado = True
+            self.ultima_sincronizacao = time.monotonic()
+            return len(linhas)
+
+    def sincronizar_em_segundo_plano(self):
+        """Sincroniza em uma thread (uma por vez); até terminar vale o índice atual"""
+        with self.lock:
+            if self.sincronizando:
+                return
+            self.sincronizando = True
+        primeira = not self.carregado
+
+        def executar():
+            try:
+                total = self.sincronizar()
+                if primeira:
+                    print(f"✅ [DUPLICATAS] {total} solicitação(ões) em aberto carregada(s)")
+            except Exception as e:
+                print(f"⚠️ [DUPLICATAS] Sincronização falhou, usando o índice atual: {e}")
+            finally:
+                with self.lock:
+                    self.sincronizando = False
+                    self.ultima_sincronizacao = time.monotonic()
+        threading.Thread(target=executar, name='sincronizacao-duplicatas', daemon=True).start()
+
+    def estatisticas(self):
+        """Tamanho do índice (para monitoramento)"""
+        with self.lock:
+            return {
+                'solicitacoes': len(self.assinaturas),
+                'buckets': sum(len(buckets) for buckets in self.buckets),
+                'carregado': self.carregado,
+            }
+
+    def _garantir_atualizado(self):
+        # A consulta ao banco não roda dentro da requisição; antes da carga inicial não há candidatos
+        if time.monotonic() - self.ultima_sincronizacao >= config.DUPLICATAS_INTERVALO_SEGUNDOS:
+            self.sincronizar_em_segundo_plano()
+
+    def _bandas(self, sig):
+        linhas = NUM_HASHES // NUM_BANDAS
+        return [sig[i * linhas:(i + 1) * linhas].tobytes() for i in range(NUM_BANDAS)]
+
+    def _remover(self, id):
+        sig = self.assinaturas.pop(id, None)
+        self.dados.pop(id, None)
+        if sig is None:
+            return
+        for banda, chave in enumerate(self._bandas(sig)):
+            bucket = self.buckets[banda].get(chave)
+            if bucket:
+                bucket.discard(id)
+                if not bucket:
+                    del self.buckets[banda][chave]
+
+# Instância única por processo
+indice_duplicatas = IndiceDuplicatas()
+
+def carregar_em_segundo_plano():
+    """Carrega o índice na inicialização, sem atrasar a primeira abertura de solicitação"""
+    indice_duplicatas.sincronizar_em_segundo_plano()
+
+def verificar_nova_solicitacao(solicitacao_id, codigo, titulo, descricao, id_cliente, usuario_id=None):
+    """Procura duplicatas da solicitação recém-criada, vincula-as no histórico e a inclui no índice"""
+    try:
+        duplicatas = indice_duplicatas.candidatos(titulo, descricao, id_cliente, ignorar_id=solicitacao_id)
+        indice_duplicatas.adicionar(solicitacao_id, codigo, titulo, descricao, id_cliente, datetime.now())
+    except Exception as e:
+        print(f"⚠️ [DUPLICATAS] Verificação não realizada para a solicitação {solicitacao_id}: {e}")
+        return []
+
+    if duplicatas:
+        registrar_historico({
+            'ID_SOLICITACAO': solicitacao_id,
+            'ID_USUARIO': usuario_id or id_cliente,
+            'TIPO_ACAO': 'POSSIVEL_DUPLICATA',
+            'DESCRICAO': 'Possível duplicata de ' + ', '.join(d['CODIGO_REFERENCIA'] or str(d['ID']) for d in duplicatas),
+            'DADOS_NOVOS': json.dumps(
+                [{'ID': d['ID'], 'SIMILARIDADE': d['SIMILARIDADE']} for d in duplicatas]
+            ),
+        })
+    return duplicatas
@@ -7,6 +7,7 @@ import os
 import json
 from datetime import datetime
 from database.connection import db_connection
+from utils.compressao_blob import texto
 from models.base import BaseModel
 
 class EmailService:
@@ -43,7 +44,7 @@ class EmailService:
             if result:
                 return {
                     'assunto': result[0],
-                    'corpo_html': result[1],
+                    'corpo_html': texto(result[1]),
                     'corpo_texto': result[2],
                     'variaveis': json.loads(result[3]) if result[3] else []
                 }
@@ -406,7 +407,9 @@ class EmailService:
             row = cur.fetchone()
             if row:
                 columns = [description[0] for description in cur.description]
-                return dict(zip(columns, row))
+                solicitacao = dict(zip(columns, row))
+                solicitacao['DESCRICAO'] = texto(solicitacao['DESCRICAO'])
+                return solicitacao
             return None
     
     def _get_status(self, status_id):
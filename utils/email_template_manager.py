@@ -9,6 +9,7 @@ import re
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from database.connection import db_connection
+from utils.compressao_blob import comprimir, texto
 from utils.email_service import EmailService
 
 class EmailTemplateManager:
@@ -69,7 +70,7 @@ class EmailTemplateManager:
                         'id': row[0],
                         'nome': row[1],
                         'assunto': row[2],
-                        'corpo_html': row[3].decode('utf-8') if row[3] else '',
+                        'corpo_html': texto(row[3]),
                         'corpo_texto': row[4].decode('utf-8') if row[4] else '',
                         'variaveis': json.loads(row[5]) if row[5] else [],
                         'ativo': row[6]
@@ -97,7 +98,7 @@ class EmailTemplateManager:
                         'id': row[0],
                         'nome': row[1],
                         'assunto': row[2],
-                        'corpo_html': row[3].decode('utf-8') if row[3] else '',
+                        'corpo_html': texto(row[3]),
                         'corpo_texto': row[4].decode('utf-8') if row[4] else '',
                         'variaveis': json.loads(row[5]) if row[5] else [],
                         'ativo': row[6]
@@ -119,7 +120,7 @@ class EmailTemplateManager:
                 """, (
                     dados['nome'],
                     dados['assunto'],
-                    dados['corpo_html'].encode('utf-8'),
+                    comprimir(dados['corpo_html']),
                     dados.get('corpo_texto', '').encode('utf-8'),
                     json.dumps(dados.get('variaveis', [])),
                     dados.get('ativo', True)
@@ -144,7 +145,7 @@ class EmailTemplateManager:
                 """, (
                     dados['nome'],
                     dados['assunto'],
-                    dados['corpo_html'].encode('utf-8'),
+                    comprimir(dados['corpo_html']),
                     dados.get('corpo_texto', '').encode('utf-8'),
                     json.dumps(dados.get('variaveis', [])),
                     dados.get('ativo', True),
@@ -0,0 +1,157 @@
+"""
+Exportação de dados em streaming (CSV, JSON Lines e Parquet)
+
+As linhas são lidas do banco em lotes dentro de uma única transação SNAPSHOT
+e convertidas em blocos de bytes à medida que a resposta HTTP é consumida,
+mantendo o uso de memória constante independentemente do volume exportado.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, date, time
+from decimal import Decimal
+from database.connection import db_snapshot
+from utils.compressao_blob import descomprimir
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet é opcional
+    pa = None
+    pq = None
+
+# Linhas lidas do banco por lote (e por row group no Parquet)
+TAMANHO_LOTE = 5000
+
+FORMATOS = {
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+def formato_disponivel(formato):
+    """Verifica se o formato é suportado neste ambiente"""
+    if formato == 'parquet':
+        return pq is not None
+    return formato in FORMATOS
+
+def exportar(query, params, formato):
+    """Gera os bytes da exportação de uma consulta no formato informado"""
+    escritores = {
+        'csv': _escrever_csv,
+        'jsonl': _escrever_jsonl,
+        'parquet': _escrever_parquet,
+    }
+    escritor = escritores[formato]
+
+    with db_snapshot() as con:
+        cur = con.cursor()
+        cur.execute(query, params or ())
+        colunas = [descricao[0] for descricao in cur.description]
+
+        def lotes():
+            while True:
+                rows = cur.fetchmany(TAMANHO_LOTE)
+                if not rows:
+                    break
+                yield [[_converter(valor) for valor in row] for row in rows]
+
+        yield from escritor(colunas, lotes())
+
+def _escrever_csv(colunas, lotes):
+    """Escreve os lotes como CSV (separador ';', compatível com Excel pt-BR)"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter=';')
+
+    # BOM para o Excel reconhecer UTF-8
+    buffer.write('\ufeff')
+    writer.writerow(colunas)
+
+    for lote in lotes:
+        writer.writerows(lote)
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate(0)
+
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+def _escrever_jsonl(colunas, lotes):
+    """Escreve os lotes como JSON Lines (um objeto por linha)"""
+    for lote in lotes:
+        yield ''.join(
+            json.dumps(dict(zip(colunas, row)), ensure_ascii=False) + '\n'
+            for row in lote
+        ).encode('utf-8')
+
+def _escrever_parquet(colunas, lotes):
+    """Escreve os lotes como Parquet, um row group por lote"""
+    saida = _SaidaStreaming()
+    writer = None
+
+    for lote in lotes:
+        tabela = pa.Table.from_pydict({
+            coluna: [row[i] for row in lote]
+            for i, coluna in enumerate(colunas)
+        })
+
+        if writer is None:
+            # Colunas totalmente nulas no primeiro lote viram texto
+            schema = pa.schema([
+                pa.field(campo.name, pa.string()) if pa.types.is_null(campo.type) else campo
+                for campo in tabela.schema
+            ])
+            writer = pq.ParquetWriter(saida, schema)
+            tabela = tabela.cast(schema)
+        else:
+            tabela = tabela.cast(writer.schema)
+
+        writer.write_table(tabela, row_group_size=len(lote))
+        yield saida.drenar()
+
+    if writer is None:
+        writer = pq.ParquetWriter(saida, pa.schema([(coluna, pa.string()) for coluna in colunas]))
+
+    writer.close()
+    yield saida.drenar()
+
+class _SaidaStreaming:
+    """Arquivo somente escrita que entrega os bytes acumulados a cada drenagem"""
+
+    def __init__(self):
+        self.partes = []
+        self.posicao = 0
+        self.closed = False
+
+    def write(self, dados):
+        self.partes.append(bytes(dados))
+        self.posicao += len(dados)
+        return len(dados)
+
+    def tell(self):
+        return self.posicao
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drenar(self):
+        dados = b''.join(self.partes)
+        self.partes = []
+        return dados
+
+def _converter(valor):
+    """Converte valores do banco para tipos serializáveis"""
+    # Lê leitores de BLOB e desfaz a compressão de colunas comprimidas
+    valor = descomprimir(valor)
+
+    if isinstance(valor, bytes):
+        return valor.decode('utf-8', errors='replace')
+    if isinstance(valor, (datetime, date, time)):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return float(valor)
+    return valor
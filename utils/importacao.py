@@ -0,0 +1,611 @@
+"""
+Importação de solicitações e usuários em lote (CSV, JSON Lines e JSON)
+
+O arquivo é lido linha a linha e as solicitações válidas são gravadas em lotes
+de config.IMPORTACAO_TAMANHO_LOTE (executemany + histórico na mesma transação,
+um commit por lote), então o uso de memória não depende do tamanho do arquivo.
+Categorias, prioridades e status são lidos uma vez por importação; clientes e
+técnicos são buscados por lote. Os emails de abertura não são enviados, a menos
+que notificar=True (nesse caso vão para a fila de notificações).
+
+Usuários seguem o mesmo fluxo: CPF/CNPJ validados com NumPy para o lote
+inteiro (utils/documentos.py) e emails/documentos já cadastrados descobertos
+com o filtro de Bloom e uma consulta por lote.
+
+importar() e importar_usuarios() geram eventos para acompanhamento: 'erro'
+(linha rejeitada), 'progresso' (a cada lote gravado) e 'resumo' (ao final).
+"""
+
+import codecs
+import csv
+import json
+import re
+from datetime import datetime, timedelta
+import config
+from database.connection import db_connection
+from models.solicitacao import STATUS_FECHADO
+from utils.auditoria import inserir_historico
+from utils.autocompletar import autocompletar
+from utils.busca import atualizar_indice_busca
+from utils.bloom import normalizar_documento, normalizar_email, usuarios_conhecidos
+from utils.cache import invalidar_respostas
+from utils.compressao_blob import COLUNAS_COMPRIMIDAS, comprimir
+from utils.documentos import formatar_documento, validar_documentos
+from utils.normalizacao import remover_acentos
+from utils.notificacoes import fila_notificacoes
+
+FORMATOS = ('csv', 'jsonl')
+
+# Usuários também aceitam uma lista JSON (lida inteira: cargas de milhares de linhas)
+FORMATOS_USUARIOS = ('csv', 'jsonl', 'json')
+
+# Itens por lista IN (o Firebird aceita até 1500)
+TAMANHO_IN = 1000
+
+COLUNAS_INSERT = [
+    'CODIGO_REFERENCIA', 'TITULO', 'DESCRICAO', 'ID_CLIENTE', 'ID_CATEGORIA', 'ID_PRIORIDADE',
+    'ID_STATUS', 'ID_TECNICO_RESPONSAVEL', 'ID_TECNICO_CRIADOR', 'SISTEMA', 'MODULO',
+    'PRAZO_RESOLUCAO', 'PRAZO_ESCALONAMENTO', 'DTHR_CRIACAO', 'DTHR_RESOLUCAO', 'DTHR_FECHAMENTO',
+    'URGENTE', 'CONFIDENCIAL'
+]
+
+INSERT_SOLICITACAO = (
+    f"INSERT INTO SOLICITACOES ({', '.join(COLUNAS_INSERT)}) "
+    f"VALUES ({', '.join('?' for _ in COLUNAS_INSERT)})"
+)
+
+# Status das solicitações importadas sem status informado ("Aberto")
+STATUS_INICIAL = 1
+
+# Códigos gerados para as importadas: IM + data + sequência (o formato OS é das abertas pelo sistema)
+PREFIXO_CODIGO = 'IM'
+
+VALORES_VERDADEIROS = {'1', 'true', 'sim', 's', 'yes', 'y', 'x'}
+
+COLUNAS_USUARIO = ['NOME', 'EMAIL', 'CPF_CNPJ', 'TELEFONE', 'TIPO_USUARIO', 'EMPRESA', 'DEPARTAMENTO', 'CARGO']
+
+INSERT_USUARIO = (
+    f"INSERT INTO USUARIOS ({', '.join(COLUNAS_USUARIO)}, ATIVO) "
+    f"VALUES ({', '.join('?' for _ in COLUNAS_USUARIO)}, TRUE)"
+)
+
+TIPOS_USUARIO = ('CLIENTE', 'TECNICO', 'ADMIN')
+
+PADRAO_EMAIL = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+$')
+
+def ler_linhas(arquivo, formato, separador=';'):
+    """Gera (número da linha, dicionário com chaves em minúsculas) de um arquivo binário"""
+    texto_arquivo = codecs.getreader('utf-8-sig')(arquivo, errors='replace')
+
+    if formato == 'csv':
+        leitor = csv.DictReader(texto_arquivo, delimiter=separador)
+        leitor.fieldnames = [(campo or '').strip().lower() for campo in leitor.fieldnames or []]
+        for registro in leitor:
+            # Linha do arquivo (o cabeçalho é a linha 1; campos com quebra de linha contam como várias)
+            yield leitor.line_num, registro
+        return
+
+    if formato == 'json':
+        registros = json.load(texto_arquivo)
+        if not isinstance(registros, list):
+            raise ValueError("O arquivo JSON deve conter uma lista de objetos")
+        for numero, registro in enumerate(registros, start=1):
+            if not isinstance(registro, dict):
+                yield numero, ValueError("Cada item deve ser um objeto JSON")
+                continue
+            yield numero, {str(chave).strip().lower(): valor for chave, valor in registro.items()}
+        return
+
+    for numero, linha in enumerate(texto_arquivo, start=1):
+        if not linha.strip():
+            continue
+        try:
+            registro = json.loads(linha)
+        except ValueError as e:
+            yield numero, ValueError(f"JSON inválido: {e}")
+            continue
+        if not isinstance(registro, dict):
+            yield numero, ValueError("Cada linha deve ser um objeto JSON")
+            continue
+        yield numero, {str(chave).strip().lower(): valor for chave, valor in registro.items()}
+
+def _em_partes(valores):
+    """Divide os valores em listas aceitas em um IN"""
+    valores = list(valores)
+    for inicio in range(0, len(valores), TAMANHO_IN):
+        yield valores[inicio:inicio + TAMANHO_IN]
+
+def _marcadores(valores):
+    return ', '.join('?' for _ in valores)
+
+def _nome(valor):
+    return ' '.join(remover_acentos(str(valor)).lower().split())
+
+def _preenchido(valor):
+    return valor is not None and str(valor).strip() != ''
+
+def _inteiro(valor, campo):
+    try:
+        return int(str(valor).strip())
+    except ValueError:
+        raise ValueError(f"{campo} inválido: {valor}")
+
+def _booleano(valor):
+    if isinstance(valor, bool):
+        return valor
+    return str(valor or '').strip().lower() in VALORES_VERDADEIROS
+
+def _data_hora(valor, campo):
+    if isinstance(valor, datetime):
+        return valor
+    try:
+        return datetime.fromisoformat(str(valor).strip())
+    except ValueError:
+        raise ValueError(f"{campo} inválido (use AAAA-MM-DD HH:MM:SS): {valor}")
+
+class _Referencias:
+    """Cadastros usados na validação, lidos uma vez por importação"""
+
+    def __init__(self, cur):
+        cur.execute("SELECT ID, NOME FROM CATEGORIAS WHERE ATIVO = TRUE")
+        self.categorias = self._indexar(cur.fetchall())
+        cur.execute("SELECT ID, NOME, PRAZO_HORAS, ESCALONAMENTO_HORAS FROM PRIORIDADES WHERE ATIVO = TRUE")
+        prioridades = cur.fetchall()
+        self.prioridades = self._indexar(prioridades)
+        self.prazos = {id: (prazo or 72, escalonamento or 48) for id, _, prazo, escalonamento in prioridades}
+        cur.execute("SELECT ID, NOME, FINALIZADO FROM STATUS WHERE ATIVO = TRUE")
+        status = cur.fetchall()
+        self.status = self._indexar(status)
+        self.finalizados = {id for id, _, finalizado in status if finalizado}
+
+    def _indexar(self, linhas):
+        """{id: id, nome normalizado: id} para aceitar o ID ou o nome no arquivo"""
+        indice = {}
+        for linha in linhas:
+            indice[linha[0]] = linha[0]
+            indice.setdefault(_nome(linha[1]), linha[0])
+        return indice
+
+    def resolver(self, cadastro, registro, campo):
+        """ID do cadastro informado por id_<campo> ou pelo nome em <campo>"""
+        indice = getattr(self, cadastro)
+        if _preenchido(registro.get(f'id_{campo}')):
+            chave = _inteiro(registro[f'id_{campo}'], f'id_{campo}')
+        elif _preenchido(registro.get(campo)):
+            chave = _nome(registro[campo])
+        else:
+            return None
+        if chave not in indice:
+            raise ValueError(f"{campo} não cadastrado(a) ou inativo(a): {chave}")
+        return indice[chave]
+
+class _ImportadorLotes:
+    """Leitura em lotes, gravação com um commit por lote e eventos de acompanhamento"""
+
+    # Nome dos registros nas mensagens de log
+    descricao = 'registro(s)'
+
+    def __init__(self, tamanho_lote=None):
+        self.tamanho_lote = tamanho_lote or config.IMPORTACAO_TAMANHO_LOTE
+        self.lidas = self.importadas = self.erros = 0
+
+    def importar(self, linhas):
+        """Gera eventos de erro, progresso e o resumo ao final"""
+        with db_connection() as con:
+            cur = con.cursor()
+            self._preparar(cur)
+            con.commit()
+
+            lote = []
+            for numero, registro in linhas:
+                self.lidas += 1
+                lote.append((numero, registro))
+                if len(lote) >= self.tamanho_lote:
+                    yield from self._processar_lote(con, lote)
+                    lote = []
+            if lote:
+                yield from self._processar_lote(con, lote)
+
+        yield {'tipo': 'resumo', **self._contagem()}
+
+    def _preparar(self, cur):
+        """Leituras feitas uma vez por importação"""
+
+    def _processar_lote(self, con, lote):
+        raise NotImplementedError
+
+    def _gravar_lote(self, con, validas):
+        """Grava as linhas válidas do lote em uma transação; em caso de falha, todas são rejeitadas"""
+        if validas:
+            registros = [registro for _, registro in validas]
+            try:
+                ids = self._gravar(con.cursor(), registros)
+                con.commit()
+            except Exception as e:
+                con.rollback()
+                print(f"❌ [IMPORTACAO] Lote de {len(validas)} {self.descricao} não gravado: {e}")
+                for numero, _ in validas:
+                    yield from self._erro(numero, f"Lote não gravado: {e}")
+            else:
+                self.importadas += len(ids)
+                self._apos_gravar(ids, registros)
+
+        yield {'tipo': 'progresso', **self._contagem()}
+
+    def _contagem(self):
+        return {'lidas': self.lidas, 'importadas': self.importadas, 'erros': self.erros}
+
+    def _erro(self, numero, mensagem):
+        """Contabiliza a linha rejeitada; só as primeiras config.IMPORTACAO_MAXIMO_ERROS são detalhadas"""
+        self.erros += 1
+        if self.erros <= config.IMPORTACAO_MAXIMO_ERROS:
+            yield {'tipo': 'erro', 'linha': numero, 'erro': mensagem}
+
+class ImportadorSolicitacoes(_ImportadorLotes):
+    """Validação e gravação em lotes das linhas de um arquivo de solicitações"""
+
+    descricao = 'solicitação(ões)'
+
+    def __init__(self, usuario_id=None, notificar=False, tamanho_lote=None):
+        super().__init__(tamanho_lote)
+        self.usuario_id = usuario_id
+        self.notificar = notificar
+        self.referencias = None
+        self.usuarios = {}      # id / email -> (id, tipo), limitado a config.IMPORTACAO_CACHE_USUARIOS
+
+    def _preparar(self, cur):
+        self.referencias = _Referencias(cur)
+
+    def _processar_lote(self, con, lote):
+        cur = con.cursor()
+        self._carregar_usuarios(cur, [registro for _, registro in lote if isinstance(registro, dict)])
+
+        validas, codigos = [], set()
+        for numero, registro in lote:
+            try:
+                if isinstance(registro, Exception):
+                    raise registro
+                solicitacao = self._validar(registro)
+                codigo = solicitacao['CODIGO_REFERENCIA']
+                if codigo:
+                    if codigo in codigos:
+                        raise ValueError(f"codigo_referencia repetido no arquivo: {codigo}")
+                    codigos.add(codigo)
+                validas.append((numero, solicitacao))
+            except ValueError as e:
+                yield from self._erro(numero, str(e))
+
+        validas = yield from self._descartar_codigos_existentes(cur, validas, codigos)
+        yield from self._gravar_lote(con, validas)
+
+    def _validar(self, registro):
+        """Converte uma linha do arquivo em colunas de SOLICITACOES (ValueError se inválida)"""
+        titulo = str(registro.get('titulo') or '').strip()
+        descricao = str(registro.get('descricao') or '').strip()
+        if not titulo or not descricao:
+            raise ValueError("titulo e descricao são obrigatórios")
+        if len(titulo) > 200:
+            raise ValueError("titulo excede 200 caracteres")
+
+        referencias = self.referencias
+        id_categoria = referencias.resolver('categorias', registro, 'categoria')
+        id_prioridade = referencias.resolver('prioridades', registro, 'prioridade')
+        if id_categoria is None or id_prioridade is None:
+            raise ValueError("categoria e prioridade são obrigatórias (ID ou nome)")
+        id_status = referencias.resolver('status', registro, 'status') or STATUS_INICIAL
+
+        id_cliente = self._usuario(registro, 'cliente', obrigatorio=True)
+        id_tecnico = self._usuario(registro, 'tecnico_responsavel', tipos=('TECNICO', 'ADMIN'))
+
+        criacao = _data_hora(registro['dthr_criacao'], 'dthr_criacao') if _preenchido(registro.get('dthr_criacao')) else datetime.now()
+        resolucao, fechamento = self._datas_finalizacao(registro, id_status, criacao)
+        prazo_horas, escalonamento_horas = referencias.prazos[id_prioridade]
+
+        codigo = str(registro.get('codigo_referencia') or '').strip() or None
+        if codigo and len(codigo) > 20:
+            raise ValueError("codigo_referencia excede 20 caracteres")
+
+        return {
+            'CODIGO_REFERENCIA': codigo,
+            'TITULO': titulo,
+            'DESCRICAO': descricao,
+            'ID_CLIENTE': id_cliente,
+            'ID_CATEGORIA': id_categoria,
+            'ID_PRIORIDADE': id_prioridade,
+            'ID_STATUS': id_status,
+            'ID_TECNICO_RESPONSAVEL': id_tecnico,
+            'ID_TECNICO_CRIADOR': self.usuario_id,
+            'SISTEMA': str(registro['sistema']).strip()[:100] if _preenchido(registro.get('sistema')) else None,
+            'MODULO': str(registro['modulo']).strip()[:100] if _preenchido(registro.get('modulo')) else None,
+            'PRAZO_RESOLUCAO': criacao + timedelta(hours=prazo_horas),
+            'PRAZO_ESCALONAMENTO': criacao + timedelta(hours=escalonamento_horas),
+            'DTHR_CRIACAO': criacao,
+            'DTHR_RESOLUCAO': resolucao,
+            'DTHR_FECHAMENTO': fechamento,
+            'URGENTE': _booleano(registro.get('urgente')),
+            'CONFIDENCIAL': _booleano(registro.get('confidencial')),
+        }
+
+    def _datas_finalizacao(self, registro, id_status, criacao):
+        """DTHR_RESOLUCAO e DTHR_FECHAMENTO informadas ou, para status finalizados, preenchidas como na mudança de status"""
+        resolucao = _data_hora(registro['dthr_resolucao'], 'dthr_resolucao') if _preenchido(registro.get('dthr_resolucao')) else None
+        fechamento = _data_hora(registro['dthr_fechamento'], 'dthr_fechamento') if _preenchido(registro.get('dthr_fechamento')) else None
+
+        if id_status in self.referencias.finalizados:
+            # Sem as datas, a solicitação finalizada ficaria fora das métricas de resolução
+            resolucao = resolucao or fechamento or criacao
+            if id_status == STATUS_FECHADO:
+                fechamento = fechamento or resolucao
+
+        if resolucao and resolucao < criacao:
+            raise ValueError("dthr_resolucao anterior a dthr_criacao")
+        if fechamento and fechamento < (resolucao or criacao):
+            raise ValueError("dthr_fechamento anterior à resolução/criação")
+        return resolucao, fechamento
+
+    def _usuario(self, registro, papel, obrigatorio=False, tipos=None):
+        """ID do usuário informado por id_<papel> ou email_<papel> (já carregado por _carregar_usuarios)"""
+        if _preenchido(registro.get(f'id_{papel}')):
+            chave = _inteiro(registro[f'id_{papel}'], f'id_{papel}')
+        elif _preenchido(registro.get(f'email_{papel}')):
+            chave = str(registro[f'email_{papel}']).strip().lower()
+        elif obrigatorio:
+            raise ValueError(f"id_{papel} ou email_{papel} é obrigatório")
+        else:
+            return None
+
+        usuario = self.usuarios.get(chave)
+        if usuario is None:
+            raise ValueError(f"{papel.replace('_', ' ').capitalize()} não encontrado ou inativo: {chave}")
+        if tipos and usuario[1] not in tipos:
+            raise ValueError(f"Usuário {chave} não é técnico")
+        return usuario[0]
+
+    def _carregar_usuarios(self, cur, registros):
+        """Busca de uma vez os usuários ativos citados no lote que ainda não estão em memória"""
+        ids, emails = set(), set()
+        for registro in registros:
+            for papel in ('cliente', 'tecnico_responsavel'):
+                try:
+                    if _preenchido(registro.get(f'id_{papel}')):
+                        ids.add(_inteiro(registro[f'id_{papel}'], papel))
+                    elif _preenchido(registro.get(f'email_{papel}')):
+                        emails.add(str(registro[f'email_{papel}']).strip().lower())
+                except ValueError:
+                    pass   # reportado na validação da linha
+        ids -= self.usuarios.keys()
+        emails -= self.usuarios.keys()
+        if not ids and not emails:
+            return
+
+        if len(self.usuarios) + len(ids) + len(emails) > config.IMPORTACAO_CACHE_USUARIOS:
+            self.usuarios.clear()
+
+        for coluna, valores in (('ID', ids), ('LOWER(EMAIL)', emails)):
+            for parte in _em_partes(valores):
+                cur.execute(f"""
+                    SELECT ID, LOWER(EMAIL), TIPO_USUARIO FROM USUARIOS
+                    WHERE ATIVO = TRUE AND {coluna} IN ({_marcadores(parte)})
+                """, parte)
+                for id, email, tipo in cur.fetchall():
+                    self.usuarios[id] = self.usuarios[email] = (id, tipo)
+
+    def _descartar_codigos_existentes(self, cur, validas, codigos):
+        """Rejeita as linhas cujo codigo_referencia já está cadastrado"""
+        if not codigos:
+            return validas
+        existentes = set()
+        for parte in _em_partes(codigos):
+            cur.execute(
+                f"SELECT CODIGO_REFERENCIA FROM SOLICITACOES WHERE CODIGO_REFERENCIA IN ({_marcadores(parte)})", parte
+            )
+            existentes.update(row[0] for row in cur.fetchall())
+
+        restantes = []
+        for numero, solicitacao in validas:
+            if solicitacao['CODIGO_REFERENCIA'] in existentes:
+                yield from self._erro(numero, f"codigo_referencia já cadastrado: {solicitacao['CODIGO_REFERENCIA']}")
+            else:
+                restantes.append((numero, solicitacao))
+        return restantes
+
+    def _gravar(self, cur, solicitacoes):
+        """INSERT em lote, leitura dos IDs pelos códigos e histórico de criação (sem commit)"""
+        sem_codigo = [solicitacao for solicitacao in solicitacoes if not solicitacao['CODIGO_REFERENCIA']]
+        informados = {solicitacao['CODIGO_REFERENCIA'] for solicitacao in solicitacoes} - {None, ''}
+        for solicitacao, codigo in zip(sem_codigo, self._gerar_codigos(cur, len(sem_codigo), informados)):
+            solicitacao['CODIGO_REFERENCIA'] = codigo
+
+        comprimidas = COLUNAS_COMPRIMIDAS.get('SOLICITACOES', ())
+        cur.executemany(INSERT_SOLICITACAO, [
+            [comprimir(solicitacao[coluna]) if coluna in comprimidas else solicitacao[coluna] for coluna in COLUNAS_INSERT]
+            for solicitacao in solicitacoes
+        ])
+
+        codigos = [solicitacao['CODIGO_REFERENCIA'] for solicitacao in solicitacoes]
+        ids = {}
+        for parte in _em_partes(codigos):
+            cur.execute(
+                f"SELECT CODIGO_REFERENCIA, ID FROM SOLICITACOES WHERE CODIGO_REFERENCIA IN ({_marcadores(parte)})", parte
+            )
+            ids.update(cur.fetchall())
+
+        inserir_historico(cur, [{
+            'ID_SOLICITACAO': ids[solicitacao['CODIGO_REFERENCIA']],
+            'ID_USUARIO': self.usuario_id or solicitacao['ID_CLIENTE'],
+            'TIPO_ACAO': 'CRIACAO',
+            'DESCRICAO': 'Solicitação importada',
+            'DTHR_ACAO': solicitacao['DTHR_CRIACAO'],
+        } for solicitacao in solicitacoes])
+        return [ids[codigo] for codigo in codigos]
+
+    def _gerar_codigos(self, cur, quantidade, informados=()):
+        """Códigos IMAAAAMMDDNNNNNN com números reservados de uma vez em SEQ_CODIGO_IMPORTACAO
+
+        A sequence é única entre processos e transações; números que repetem um código
+        já cadastrado ou informado no lote (gerado antes da sequence ou após dar a volta
+        em NNNNNN) são pulados.
+        """
+        prefixo = f"{PREFIXO_CODIGO}{datetime.now().strftime('%Y%m%d')}"
+        codigos = []
+        while len(codigos) < quantidade:
+            faltam = quantidade - len(codigos)
+            cur.execute(f"SELECT GEN_ID(SEQ_CODIGO_IMPORTACAO, {int(faltam)}) FROM RDB$DATABASE")
+            ultimo = cur.fetchone()[0]
+            candidatos = [f"{prefixo}{str(numero % 1000000).zfill(6)}" for numero in range(ultimo - faltam + 1, ultimo + 1)]
+
+            existentes = set(informados)
+            for parte in _em_partes(candidatos):
+                cur.execute(
+                    f"SELECT CODIGO_REFERENCIA FROM SOLICITACOES WHERE CODIGO_REFERENCIA IN ({_marcadores(parte)})", parte
+                )
+                existentes.update(row[0] for row in cur.fetchall())
+            codigos.extend(codigo for codigo in candidatos if codigo not in existentes)
+        return codigos
+
+    def _apos_gravar(self, ids, solicitacoes):
+        """Índices, caches e notificações das solicitações gravadas no lote"""
+        invalidar_respostas('SOLICITACOES')
+        atualizar_indice_busca(*ids)
+        for id, solicitacao in zip(ids, solicitacoes):
+            autocompletar.registrar_valor('SISTEMA', solicitacao['SISTEMA'])
+            autocompletar.registrar_valor('MODULO', solicitacao['MODULO'])
+            if self.notificar and solicitacao['ID_STATUS'] not in self.referencias.finalizados:
+                fila_notificacoes.enfileirar('enviar_confirmacao_abertura', id)
+        # O índice de duplicatas inclui as abertas na próxima sincronização (DTHR_ATUALIZACAO)
+
+class ImportadorUsuarios(_ImportadorLotes):
+    """Validação (CPF/CNPJ vetorizado), deduplicação e gravação em lotes de usuários"""
+
+    descricao = 'usuário(s)'
+
+    def __init__(self, tipo_usuario='CLIENTE', empresa=None, tamanho_lote=None):
+        super().__init__(tamanho_lote)
+        self.tipo_usuario = tipo_usuario
+        self.empresa = empresa
+
+    def _processar_lote(self, con, lote):
+        candidatos, emails, documentos = [], set(), set()
+        for numero, registro in lote:
+            try:
+                if isinstance(registro, Exception):
+                    raise registro
+                usuario = self._validar(registro)
+                email, documento = normalizar_email(usuario['EMAIL']), normalizar_documento(usuario['CPF_CNPJ'])
+                if email in emails:
+                    raise ValueError(f"email repetido no arquivo: {usuario['EMAIL']}")
+                if documento and documento in documentos:
+                    raise ValueError(f"CPF/CNPJ repetido no arquivo: {usuario['CPF_CNPJ']}")
+                emails.add(email)
+                if documento:
+                    documentos.add(documento)
+                candidatos.append((numero, usuario))
+            except ValueError as e:
+                yield from self._erro(numero, str(e))
+
+        # Dígitos verificadores de todos os documentos do lote de uma vez
+        com_documento = [(numero, usuario) for numero, usuario in candidatos if usuario['CPF_CNPJ']]
+        invalidos = {
+            numero for (numero, _), valido in zip(com_documento, validar_documentos([u['CPF_CNPJ'] for _, u in com_documento]))
+            if not valido
+        }
+
+        emails_existentes, documentos_existentes = self._cadastrados(con.cursor(), [
+            usuario for numero, usuario in candidatos if numero not in invalidos
+        ])
+
+        validas = []
+        for numero, usuario in candidatos:
+            if numero in invalidos:
+                yield from self._erro(numero, f"CPF/CNPJ inválido: {usuario['CPF_CNPJ']}")
+            elif normalizar_email(usuario['EMAIL']) in emails_existentes:
+                yield from self._erro(numero, f"Email já cadastrado: {usuario['EMAIL']}")
+            elif usuario['CPF_CNPJ'] and normalizar_documento(usuario['CPF_CNPJ']) in documentos_existentes:
+                yield from self._erro(numero, f"CPF/CNPJ já cadastrado: {usuario['CPF_CNPJ']}")
+            else:
+                validas.append((numero, usuario))
+
+        yield from self._gravar_lote(con, validas)
+
+    def _validar(self, registro):
+        """Converte uma linha do arquivo em colunas de USUARIOS (ValueError se inválida)"""
+        nome = str(registro.get('nome') or '').strip()
+        email = str(registro.get('email') or '').strip()
+        if not nome or not email:
+            raise ValueError("nome e email são obrigatórios")
+        if len(nome) > 100 or len(email) > 100:
+            raise ValueError("nome e email devem ter até 100 caracteres")
+        if not PADRAO_EMAIL.match(email):
+            raise ValueError(f"Email inválido: {email}")
+
+        tipo_usuario = str(registro.get('tipo_usuario') or self.tipo_usuario).strip().upper()
+        if tipo_usuario not in TIPOS_USUARIO:
+            raise ValueError(f"tipo_usuario inválido: {tipo_usuario} (use {', '.join(TIPOS_USUARIO)})")
+
+        def opcional(campo, tamanho, padrao=None):
+            valor = str(registro[campo]).strip() if _preenchido(registro.get(campo)) else padrao
+            if valor and len(valor) > tamanho:
+                raise ValueError(f"{campo} deve ter até {tamanho} caracteres")
+            return valor
+
+        return {
+            'NOME': nome,
+            'EMAIL': email,
+            'CPF_CNPJ': opcional('cpf_cnpj', 18),
+            'TELEFONE': opcional('telefone', 20),
+            'TIPO_USUARIO': tipo_usuario,
+            'EMPRESA': opcional('empresa', 100, self.empresa),
+            'DEPARTAMENTO': opcional('departamento', 50),
+            'CARGO': opcional('cargo', 50),
+        }
+
+    def _cadastrados(self, cur, usuarios):
+        """Emails e documentos do lote que já existem, consultando só os que o filtro de Bloom não descarta"""
+        emails = {
+            normalizar_email(usuario['EMAIL']) for usuario in usuarios
+            if usuarios_conhecidos.email_pode_existir(usuario['EMAIL'])
+        }
+        # CPF_CNPJ é gravado como digitado: procura as formas com e sem pontuação
+        documentos = {
+            variante for usuario in usuarios
+            if usuario['CPF_CNPJ'] and usuarios_conhecidos.documento_pode_existir(usuario['CPF_CNPJ'])
+            for variante in (usuario['CPF_CNPJ'], normalizar_documento(usuario['CPF_CNPJ']), formatar_documento(usuario['CPF_CNPJ']))
+        }
+
+        emails_existentes, documentos_existentes = set(), set()
+        for coluna, valores in (('LOWER(EMAIL)', emails), ('CPF_CNPJ', documentos)):
+            for parte in _em_partes(valores):
+                cur.execute(f"SELECT LOWER(EMAIL), CPF_CNPJ FROM USUARIOS WHERE {coluna} IN ({_marcadores(parte)})", parte)
+                for email, documento in cur.fetchall():
+                    emails_existentes.add(email)
+                    if documento:
+                        documentos_existentes.add(normalizar_documento(documento))
+        return emails_existentes, documentos_existentes
+
+    def _gravar(self, cur, usuarios):
+        """INSERT em lote e leitura dos IDs pelos emails (sem commit)"""
+        cur.executemany(INSERT_USUARIO, [[usuario[coluna] for coluna in COLUNAS_USUARIO] for usuario in usuarios])
+
+        emails = [usuario['EMAIL'] for usuario in usuarios]
+        ids = {}
+        for parte in _em_partes(emails):
+            cur.execute(f"SELECT EMAIL, ID FROM USUARIOS WHERE EMAIL IN ({_marcadores(parte)})", parte)
+            ids.update(cur.fetchall())
+        return [ids[email] for email in emails]
+
+    def _apos_gravar(self, ids, usuarios):
+        """Filtro de Bloom, autocompletar e caches dos usuários gravados no lote"""
+        invalidar_respostas('USUARIOS')
+        for id, usuario in zip(ids, usuarios):
+            usuarios_conhecidos.registrar(usuario['EMAIL'], usuario['CPF_CNPJ'])
+            autocompletar.atualizar_usuario(id, usuario['NOME'], usuario['EMAIL'], usuario['TIPO_USUARIO'])
+
+def importar(arquivo, formato, separador=';', usuario_id=None, notificar=False):
+    """Importa as solicitações de um arquivo binário (csv ou jsonl), gerando os eventos da importação"""
+    importador = ImportadorSolicitacoes(usuario_id=usuario_id, notificar=notificar)
+    return importador.importar(ler_linhas(arquivo, formato, separador))
+
+def importar_usuarios(arquivo, formato, separador=';', tipo_usuario='CLIENTE', empresa=None):
+    """Importa usuários de um arquivo binário (csv, jsonl ou json), gerando os eventos da importação"""
+    importador = ImportadorUsuarios(tipo_usuario=tipo_usuario, empresa=empresa)
+    return importador.importar(ler_linhas(arquivo, formato, separador))
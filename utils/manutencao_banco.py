@@ -0,0 +1,116 @@
+"""
+Manutenção do banco Firebird: estatísticas de índices e sweep
+
+Recalcula a seletividade (SET STATISTICS INDEX) de todos os índices declarados
+no schema.sql, coleta indicadores de versões de registro/lixo nas tabelas de
+monitoramento (MON$) e dispara um sweep quando os limites configurados são
+ultrapassados.
+"""
+
+import time
+import firebird.driver as fbd
+import config
+from database.connection import db_connection, DSN, USUARIO, SENHA
+from utils.planos_consulta import carregar_indices_schema
+
+def atualizar_estatisticas_indices(indices=None):
+    """Executa SET STATISTICS INDEX e retorna [(indice, antes, depois, segundos)]"""
+    indices = indices or [nome for nome, _, _, _ in carregar_indices_schema()]
+    resultado = []
+
+    with db_connection() as con:
+        cur = con.cursor()
+        for indice in indices:
+            antes = _seletividade(cur, indice)
+            inicio = time.perf_counter()
+            try:
+                cur.execute(f"SET STATISTICS INDEX {indice}")
+                con.commit()
+            except Exception as e:
+                con.rollback()
+                print(f"❌ [MANUTENCAO] Erro ao atualizar {indice}: {e}")
+                continue
+            duracao = time.perf_counter() - inicio
+            depois = _seletividade(cur, indice)
+            con.commit()
+            resultado.append((indice, antes, depois, duracao))
+
+    return resultado
+
+def _seletividade(cur, indice):
+    cur.execute("SELECT RDB$STATISTICS FROM RDB$INDICES WHERE RDB$INDEX_NAME = ?", (indice,))
+    result = cur.fetchone()
+    return result[0] if result else None
+
+def coletar_indicadores(tabelas=None):
+    """Lê contadores de transações e de versões de registro do monitoramento"""
+    tabelas = tabelas or sorted({tabela for _, tabela, _, _ in carregar_indices_schema()})
+
+    with db_connection() as con:
+        cur = con.cursor()
+        cur.execute("""
+            SELECT MON$OLDEST_TRANSACTION, MON$OLDEST_ACTIVE, MON$OLDEST_SNAPSHOT,
+                   MON$NEXT_TRANSACTION, MON$SWEEP_INTERVAL
+            FROM MON$DATABASE
+        """)
+        oit, oat, ost, proxima, intervalo_sweep = cur.fetchone()
+
+        placeholders = ', '.join('?' for _ in tabelas)
+        cur.execute(f"""
+            SELECT TRIM(T.MON$TABLE_NAME), R.MON$RECORD_SEQ_READS, R.MON$RECORD_IDX_READS,
+                   R.MON$BACKVERSION_READS, R.MON$RECORD_BACKOUTS, R.MON$RECORD_PURGES,
+                   R.MON$RECORD_EXPUNGES
+            FROM MON$TABLE_STATS T
+            JOIN MON$RECORD_STATS R ON R.MON$STAT_ID = T.MON$RECORD_STAT_ID
+            WHERE T.MON$STAT_GROUP = 0 AND T.MON$TABLE_NAME IN ({placeholders})
+        """, tabelas)
+
+        por_tabela = {}
+        for tabela, seq, idx, versoes, backouts, purges, expunges in cur.fetchall():
+            leituras = (seq or 0) + (idx or 0)
+            por_tabela[tabela] = {
+                'leituras': leituras,
+                'leituras_versoes': versoes or 0,
+                'proporcao_versoes': round((versoes or 0) / leituras, 4) if leituras else 0.0,
+                'backouts': backouts or 0,
+                'purges': purges or 0,
+                'expunges': expunges or 0,
+            }
+
+    return {
+        'oit': oit,
+        'oat': oat,
+        'ost': ost,
+        'proxima_transacao': proxima,
+        'intervalo_sweep': intervalo_sweep,
+        # Transações entre a mais antiga "interessante" e o snapshot mais antigo:
+        # quanto maior, mais versões antigas o servidor ainda precisa manter.
+        'gap_oit_ost': ost - oit,
+        'gap_oat_proxima': proxima - oat,
+        'tabelas': por_tabela,
+    }
+
+def precisa_sweep(indicadores):
+    """Retorna os motivos pelos quais um sweep é recomendado (lista vazia = não)"""
+    motivos = []
+    if indicadores['gap_oit_ost'] >= config.MANUTENCAO_LIMITE_GAP_TRANSACOES:
+        motivos.append(
+            f"gap OIT/OST de {indicadores['gap_oit_ost']} transações "
+            f"(limite {config.MANUTENCAO_LIMITE_GAP_TRANSACOES})"
+        )
+
+    for tabela, dados in indicadores['tabelas'].items():
+        if dados['proporcao_versoes'] >= config.MANUTENCAO_LIMITE_PROPORCAO_VERSOES:
+            motivos.append(
+                f"{tabela}: {dados['proporcao_versoes']:.0%} das leituras em versões antigas "
+                f"(limite {config.MANUTENCAO_LIMITE_PROPORCAO_VERSOES:.0%})"
+            )
+    return motivos
+
+def executar_sweep():
+    """Dispara o sweep pelo Services API e retorna a duração em segundos"""
+    servidor, caminho = DSN.split(':', 1)
+    inicio = time.perf_counter()
+    with fbd.connect_server(servidor, user=USUARIO, password=SENHA) as srv:
+        srv.database.sweep(database=caminho)
+    return time.perf_counter() - inicio
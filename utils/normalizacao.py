@@ -0,0 +1,69 @@
+"""
+Normalização de texto em português para busca
+
+Remove acentos, separa palavras, descarta stopwords e reduz cada palavra a um
+radical simples (plural, gênero, sufixos nominais e verbais comuns), de modo
+que "configurações", "configuração" e "configurar" caiam no mesmo termo.
+"""
+
+import re
+import unicodedata
+
+PADRAO_PALAVRA = re.compile(r'[a-z0-9]+')
+
+STOPWORDS = frozenset("""
+a ao aos as ate com como da das de dela dele deles do dos e ela ele eles em
+entre era essa esse esta este eu foi for ha isso isto ja la mais mas me mesmo
+meu minha muito na nao nas nem no nos nossa nosso num numa o os ou para pela
+pelas pelo pelos por qual quando que quem se sem ser seu sua so sao tambem te
+tem tinha tu um uma umas uns voce voces vai esta estao estava foram sido ter
+""".split())
+
+# Sufixos removidos (texto já sem acentos); o mais longo que couber é aplicado
+SUFIXOS = tuple(sorted((
+    'amentos', 'imentos', 'amento', 'imento', 'adoras', 'adores', 'acoes', 'icoes',
+    'mente', 'idade', 'idades', 'adora', 'ador', 'acao', 'icao', 'ante', 'antes',
+    'ancia', 'encia', 'avel', 'ivel', 'ismo', 'ista', 'istas',
+    'ando', 'endo', 'indo', 'ados', 'idos', 'adas', 'idas', 'ado', 'ido', 'ada', 'ida',
+    'aram', 'eram', 'iram', 'ava', 'avam', 'ou', 'ar', 'er', 'ir', 'am', 'em',
+    'oes', 'aes', 'ais', 'eis', 'ois', 'res', 'ao', 'ns',
+    'os', 'as', 'es', 'o', 'a', 'e', 's',
+), key=len, reverse=True))
+
+# Tamanho mínimo do radical após a remoção de um sufixo
+TAMANHO_MINIMO_RADICAL = 3
+
+def remover_acentos(texto):
+    """Remove acentos e cedilha, mantendo as letras base"""
+    decomposto = unicodedata.normalize('NFKD', texto)
+    return ''.join(c for c in decomposto if not unicodedata.combining(c))
+
+def radical(palavra):
+    """Reduz uma palavra sem acentos ao seu radical"""
+    if palavra.isdigit():
+        return palavra
+    for sufixo in SUFIXOS:
+        if palavra.endswith(sufixo) and len(palavra) - len(sufixo) >= TAMANHO_MINIMO_RADICAL:
+            palavra = palavra[:-len(sufixo)]
+            break
+    # Vogal temática que sobra de sufixos como -mente ("lentamente" -> "lenta")
+    if palavra[-1] in 'aeo' and len(palavra) > TAMANHO_MINIMO_RADICAL:
+        palavra = palavra[:-1]
+    return palavra
+
+def palavras(texto):
+    """Palavras do texto em minúsculas e sem acentos (sem stopwords)"""
+    if not texto:
+        return []
+    return [
+        palavra for palavra in PADRAO_PALAVRA.findall(remover_acentos(str(texto)).lower())
+        if palavra not in STOPWORDS
+    ]
+
+def tokenizar(texto):
+    """Termos de busca (radicais) do texto, na ordem em que aparecem"""
+    return [radical(palavra) for palavra in palavras(texto)]
+
+def normalizar_tag(tag):
+    """Tag em minúsculas, sem acentos e com espaços simples ("Rede  Wi-Fi" -> "rede wi-fi")"""
+    return ' '.join(remover_acentos(str(tag)).lower().split())
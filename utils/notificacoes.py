@@ -0,0 +1,71 @@
+"""
+Fila de notificações por email em segundo plano
+
+Operações em lote (ex.: mudança de status de várias solicitações) enfileiram
+os emails em vez de enviá-los durante a requisição. Uma thread por processo
+envia a fila em ordem; a falha de um envio é registrada no log e não impede os
+demais. No encerramento do processo a fila é enviada por até
+config.NOTIFICACOES_ESPERA_ENCERRAMENTO segundos.
+"""
+
+import atexit
+import queue
+import threading
+import time
+import config
+
+class FilaNotificacoes:
+    """Envio assíncrono dos emails do EmailService"""
+
+    def __init__(self):
+        self.fila = queue.Queue()
+        self.lock = threading.Lock()
+        self.thread = None
+        self.email_service = None
+        self.enviados = 0
+        self.falhas = 0
+
+    def enfileirar(self, metodo, *args):
+        """Agenda email_service.<metodo>(*args) (ex.: 'enviar_atualizacao_status')"""
+        self._iniciar()
+        self.fila.put((metodo, args))
+
+    def estatisticas(self):
+        return {'pendentes': self.fila.qsize(), 'enviados': self.enviados, 'falhas': self.falhas}
+
+    def _iniciar(self):
+        if self.thread is not None:
+            return
+        with self.lock:
+            if self.thread is not None:
+                return
+            self.thread = threading.Thread(target=self._executar, name='fila-notificacoes', daemon=True)
+            self.thread.start()
+            atexit.register(self._encerrar)
+
+    def _executar(self):
+        while True:
+            metodo, args = self.fila.get()
+            try:
+                if self.email_service is None:
+                    # Import tardio: EmailService lê a configuração no banco ao ser criado
+                    from utils.email_service import EmailService
+                    self.email_service = EmailService()
+                getattr(self.email_service, metodo)(*args)
+                self.enviados += 1
+            except Exception as e:
+                self.falhas += 1
+                print(f"❌ [NOTIFICACOES] Falha em {metodo}{args}: {e}")
+            finally:
+                self.fila.task_done()
+
+    def _encerrar(self):
+        """Aguarda (por tempo limitado) o envio do que ainda está na fila"""
+        limite = time.monotonic() + config.NOTIFICACOES_ESPERA_ENCERRAMENTO
+        while self.fila.unfinished_tasks and time.monotonic() < limite:
+            time.sleep(0.1)
+        if self.fila.unfinished_tasks:
+            print(f"⚠️ [NOTIFICACOES] {self.fila.unfinished_tasks} email(s) não enviado(s) no encerramento")
+
+# Instância única por processo
+fila_notificacoes = FilaNotificacoes()
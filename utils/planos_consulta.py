@@ -0,0 +1,293 @@
+"""
+Auditoria de planos de execução das consultas do SAOS
+
+Coleta estaticamente (via AST) as instruções SQL usadas pelos models, rotas e
+utilitários, pede ao Firebird o PLAN de cada uma, aponta leituras NATURAL e
+ordenações sem índice e sugere índices compostos/descendentes. Os planos podem
+ser gravados em um snapshot versionado para detectar regressões.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import re
+from database.connection import db_connection
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Pastas cujos módulos são varridos em busca de SQL
+PASTAS_AUDITADAS = ['models', 'routes', 'utils']
+
+ARQUIVO_SNAPSHOT = os.path.join(BASE_DIR, 'database', 'planos_consulta.json')
+ARQUIVO_SCHEMA = os.path.join(BASE_DIR, 'database', 'schema.sql')
+
+PALAVRAS_RESERVADAS = {
+    'WHERE', 'LEFT', 'RIGHT', 'INNER', 'OUTER', 'JOIN', 'ON', 'ORDER', 'GROUP',
+    'ROWS', 'UNION', 'AS', 'HAVING', 'FULL', 'CROSS', 'PLAN'
+}
+
+PADRAO_TABELAS = re.compile(r'\b(?:FROM|JOIN|INTO|UPDATE)\s+([A-Z_][A-Z0-9_$]*)(?:\s+(?:AS\s+)?([A-Z_][A-Z0-9_]*))?', re.I)
+PADRAO_NATURAL = re.compile(r'\b([A-Z_][A-Z0-9_$]*)\s+NATURAL\b', re.I)
+PADRAO_PREDICADO = re.compile(
+    r'(?:\b([A-Z_][A-Z0-9_]*)\.)?\b([A-Z_][A-Z0-9_]*)\s*(=|<=|>=|<|>|\bBETWEEN\b|\bLIKE\b)\s*\?', re.I
+)
+PADRAO_ORDER_BY = re.compile(r'\bORDER\s+BY\s+(.+?)(?:\bROWS\b|\bFIRST\b|$)', re.I | re.S)
+PADRAO_INDICE_SCHEMA = re.compile(
+    r'CREATE\s+(?:UNIQUE\s+)?(DESC(?:ENDING)?\s+)?INDEX\s+(\w+)\s+ON\s+(\w+)\s*\(([^)]+)\)', re.I
+)
+
+# =====================================================
+# COLETA DAS CONSULTAS
+# =====================================================
+
+def coletar_consultas(pastas=None):
+    """Retorna {chave: sql} com as consultas estáticas encontradas no código"""
+    consultas = {}
+    for pasta in pastas or PASTAS_AUDITADAS:
+        caminho_pasta = os.path.join(BASE_DIR, pasta)
+        for nome in sorted(os.listdir(caminho_pasta)):
+            if not nome.endswith('.py') or nome == os.path.basename(__file__):
+                continue
+            caminho = os.path.join(caminho_pasta, nome)
+            with open(caminho, encoding='utf-8') as arquivo:
+                arvore = ast.parse(arquivo.read(), filename=caminho)
+            modulo = f"{pasta}.{nome[:-3]}"
+            consultas.update(_ColetorSQL(modulo).coletar(arvore))
+    return consultas
+
+class _ColetorSQL(ast.NodeVisitor):
+    """Visita um módulo e extrai execute() literais e chamadas get_all/count"""
+
+    def __init__(self, modulo):
+        self.modulo = modulo
+        self.consultas = {}
+        self.tabela_classe = None
+        self.tabelas_locais = {}
+        self.funcao = '<modulo>'
+
+    def coletar(self, arvore):
+        self.visit(arvore)
+        return self.consultas
+
+    def visit_ClassDef(self, node):
+        anterior = self.tabela_classe
+        self.tabela_classe = self._tabela_atribuida(node, 'self')
+        self.generic_visit(node)
+        self.tabela_classe = anterior
+
+    def visit_FunctionDef(self, node):
+        anterior = (self.funcao, self.tabelas_locais)
+        self.funcao = node.name
+        self.tabelas_locais = {
+            alvo.value.id: valor
+            for alvo, valor in self._atribuicoes_table_name(node)
+            if isinstance(alvo.value, ast.Name) and alvo.value.id != 'self'
+        }
+        self.generic_visit(node)
+        self.funcao, self.tabelas_locais = anterior
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Attribute):
+            metodo = node.func.attr
+            if metodo in ('execute', 'executemany') and node.args:
+                sql = self._literal(node.args[0])
+                if sql:
+                    self._registrar(sql)
+            elif metodo in ('get_all', 'count'):
+                tabela = self._tabela_do_receptor(node.func.value)
+                if tabela:
+                    sql = self._montar_sql_model(metodo, tabela, node.keywords)
+                    if sql:
+                        self._registrar(sql)
+        self.generic_visit(node)
+
+    def _registrar(self, sql):
+        # Chave pelo conteúdo: incluir ou remover outra consulta na função não renomeia esta
+        sql = ' '.join(sql.split())
+        chave = f"{self.modulo}:{self.funcao}:{hashlib.sha1(sql.encode('utf-8')).hexdigest()[:8]}"
+        self.consultas[chave] = sql
+
+    def _montar_sql_model(self, metodo, tabela, keywords):
+        """Reconstrói o SQL gerado por BaseModel.get_all/count"""
+        argumentos = {}
+        for keyword in keywords:
+            valor = self._literal(keyword.value)
+            if keyword.arg in ('where', 'order_by'):
+                if valor is None and not (isinstance(keyword.value, ast.Constant) and keyword.value.value is None):
+                    return None  # filtro dinâmico, não é possível reconstruir
+                argumentos[keyword.arg] = valor
+
+        sql = f"SELECT {'COUNT(*)' if metodo == 'count' else '*'} FROM {tabela}"
+        if argumentos.get('where'):
+            sql += f" WHERE {argumentos['where']}"
+        if metodo == 'get_all' and argumentos.get('order_by'):
+            sql += f" ORDER BY {argumentos['order_by']}"
+        return sql
+
+    def _tabela_do_receptor(self, receptor):
+        if isinstance(receptor, ast.Name):
+            if receptor.id == 'self':
+                return self.tabela_classe
+            return self.tabelas_locais.get(receptor.id)
+        return None
+
+    def _tabela_atribuida(self, node, nome):
+        for alvo, valor in self._atribuicoes_table_name(node):
+            if isinstance(alvo.value, ast.Name) and alvo.value.id == nome:
+                return valor
+        return None
+
+    def _atribuicoes_table_name(self, node):
+        for filho in ast.walk(node):
+            if isinstance(filho, ast.Assign) and isinstance(filho.value, ast.Constant) \
+                    and isinstance(filho.value.value, str):
+                for alvo in filho.targets:
+                    if isinstance(alvo, ast.Attribute) and alvo.attr == 'table_name':
+                        yield alvo, filho.value.value
+
+    def _literal(self, node):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            return node.value
+        return None
+
+# =====================================================
+# ANÁLISE DOS PLANOS
+# =====================================================
+
+def obter_planos(consultas):
+    """Prepara cada consulta no Firebird e retorna {chave: plano ou erro}"""
+    planos = {}
+    with db_connection() as con:
+        cur = con.cursor()
+        for chave, sql in consultas.items():
+            try:
+                planos[chave] = ' '.join((cur.prepare(sql).plan or '').split())
+            except Exception as e:
+                planos[chave] = f"ERRO: {e}"
+    return planos
+
+def carregar_indices_schema(caminho=ARQUIVO_SCHEMA):
+    """Lê os índices declarados no schema.sql: [(nome, tabela, colunas, descendente)]"""
+    with open(caminho, encoding='utf-8') as arquivo:
+        conteudo = arquivo.read()
+    return [
+        (nome.upper(), tabela.upper(), [c.strip().upper() for c in colunas.split(',')], bool(descendente))
+        for descendente, nome, tabela, colunas in PADRAO_INDICE_SCHEMA.findall(conteudo)
+    ]
+
+def analisar(sql, plano, indices):
+    """Aponta problemas do plano e sugere índices para a consulta"""
+    problemas = []
+    sugestoes = []
+    if plano.startswith('ERRO'):
+        return [plano], sugestoes
+
+    apelidos = {}
+    for tabela, apelido in PADRAO_TABELAS.findall(sql):
+        tabela = tabela.upper()
+        apelidos[tabela] = tabela
+        if apelido and apelido.upper() not in PALAVRAS_RESERVADAS:
+            apelidos[apelido.upper()] = tabela
+
+    naturais = {apelidos.get(nome.upper(), nome.upper()) for nome in PADRAO_NATURAL.findall(plano)}
+    for tabela in sorted(naturais):
+        problemas.append(f"Leitura NATURAL (varredura completa) em {tabela}")
+
+    ordenacao_sem_indice = 'SORT' in plano.upper() and PADRAO_ORDER_BY.search(sql)
+    if ordenacao_sem_indice:
+        problemas.append("ORDER BY resolvido com SORT em memória/disco")
+
+    for tabela in sorted(set(apelidos.values())):
+        if tabela not in naturais and not ordenacao_sem_indice:
+            continue
+        sugestao = _sugerir_indice(sql, tabela, apelidos, indices)
+        if sugestao:
+            sugestoes.append(sugestao)
+
+    return problemas, sugestoes
+
+def _sugerir_indice(sql, tabela, apelidos, indices):
+    """Monta um CREATE INDEX com igualdades, depois faixa/ordenação"""
+    igualdades, faixas = [], []
+    for prefixo, coluna, operador in PADRAO_PREDICADO.findall(sql):
+        if prefixo and apelidos.get(prefixo.upper()) != tabela:
+            continue
+        coluna = coluna.upper()
+        destino = igualdades if operador == '=' else faixas
+        if coluna not in igualdades and coluna not in destino:
+            destino.append(coluna)
+
+    colunas_ordem, descendente = [], False
+    ordem = PADRAO_ORDER_BY.search(sql)
+    if ordem:
+        for item in ordem.group(1).split(','):
+            partes = item.strip().split()
+            if not partes:
+                continue
+            prefixo, _, coluna = partes[0].upper().rpartition('.')
+            if prefixo and apelidos.get(prefixo) != tabela:
+                continue
+            colunas_ordem.append(coluna)
+            descendente = descendente or (len(partes) > 1 and partes[1].upper().startswith('DESC'))
+
+    # Após uma condição de faixa o Firebird não usa os segmentos seguintes
+    if faixas:
+        colunas = igualdades + faixas[:1]
+        descendente = descendente and colunas_ordem[:1] == faixas[:1]
+    else:
+        colunas = igualdades + [c for c in colunas_ordem if c not in igualdades]
+
+    if not colunas:
+        return None
+
+    for _, tabela_indice, colunas_indice, desc_indice in indices:
+        if tabela_indice == tabela and colunas_indice[:len(colunas)] == colunas \
+                and (desc_indice == descendente or not colunas_ordem):
+            return None
+
+    nome = f"IDX_{tabela}_{'_'.join(colunas)}"[:31]
+    tipo = 'DESCENDING INDEX' if descendente else 'INDEX'
+    return f"CREATE {tipo} {nome} ON {tabela} ({', '.join(colunas)});"
+
+# =====================================================
+# SNAPSHOT DE PLANOS
+# =====================================================
+
+def carregar_snapshot(caminho=ARQUIVO_SNAPSHOT):
+    if not os.path.exists(caminho):
+        return {}
+    with open(caminho, encoding='utf-8') as arquivo:
+        return json.load(arquivo)
+
+def gravar_snapshot(consultas, planos, caminho=ARQUIVO_SNAPSHOT):
+    snapshot = {
+        chave: {'sql': consultas[chave], 'plano': planos[chave]}
+        for chave in sorted(planos)
+    }
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(snapshot, arquivo, indent=2, ensure_ascii=False)
+        arquivo.write('\n')
+
+def comparar_snapshot(consultas, planos, snapshot):
+    """Retorna a lista de divergências entre os planos atuais e o snapshot"""
+    divergencias = []
+    for chave in sorted(set(planos) | set(snapshot)):
+        # A chave inclui o hash do SQL: um SQL alterado aparece como consulta removida + nova
+        if chave not in snapshot:
+            divergencias.append(f"{chave}: consulta nova sem plano registrado\n      SQL: {consultas[chave]}")
+        elif chave not in planos:
+            divergencias.append(f"{chave}: consulta removida do código\n      SQL: {snapshot[chave]['sql']}")
+        elif snapshot[chave]['plano'] != planos[chave]:
+            divergencias.append(
+                f"{chave}: plano alterado\n      antes: {snapshot[chave]['plano']}\n      agora: {planos[chave]}"
+            )
+    return divergencias
+
+def verificar_snapshot(caminho=ARQUIVO_SNAPSHOT):
+    """Compara os planos atuais com o snapshot; snapshot inexistente também é divergência"""
+    snapshot = carregar_snapshot(caminho)
+    if not snapshot:
+        return [f"Snapshot inexistente. Gere com scripts/auditar_planos.py --atualizar: {caminho}"]
+    consultas = coletar_consultas()
+    return comparar_snapshot(consultas, obter_planos(consultas), snapshot)
@@ -0,0 +1,183 @@
+"""
+Snapshot incremental do Firebird para a base analítica local
+
+Copia SOLICITACOES, HISTORICO, COMENTARIOS e as tabelas de referência para o
+SQLite configurado em config.BASE_ANALITICA, para que relatórios pesados não
+concorram com a abertura de solicitações no banco de produção.
+"""
+
+from datetime import datetime, date, timedelta
+from decimal import Decimal
+import config
+from database.connection import db_connection
+from database.analitico import analitico_connection
+
+# Quantidade de linhas copiadas por transação na base analítica
+TAMANHO_LOTE = 2000
+
+# Colunas copiadas por tabela e a marca d'água usada na cópia incremental:
+#   'DTHR_ATUALIZACAO' -> linhas alteradas desde a última cópia (upsert por ID)
+#   'ID'               -> apenas linhas novas (tabelas só de inserção)
+#   None               -> cópia completa (tabelas de referência, pequenas)
+# Campos BLOB de texto livre ficam de fora: não são usados em análises.
+TABELAS_SNAPSHOT = {
+    'SOLICITACOES': {
+        'marca': 'DTHR_ATUALIZACAO',
+        'colunas': [
+            'ID', 'CODIGO_REFERENCIA', 'TITULO', 'ID_CLIENTE', 'ID_CATEGORIA', 'ID_PRIORIDADE',
+            'ID_STATUS', 'ID_TECNICO_RESPONSAVEL', 'ID_TECNICO_CRIADOR', 'SISTEMA', 'MODULO',
+            'PRAZO_RESOLUCAO', 'PRAZO_ESCALONAMENTO', 'DTHR_CRIACAO', 'DTHR_ATUALIZACAO',
+            'DTHR_RESOLUCAO', 'DTHR_FECHAMENTO', 'AVALIACAO_CLIENTE', 'URGENTE', 'CONFIDENCIAL'
+        ]
+    },
+    'HISTORICO': {
+        'marca': 'ID',
+        'colunas': ['ID', 'ID_SOLICITACAO', 'ID_USUARIO', 'TIPO_ACAO', 'DTHR_ACAO', 'IP_ADDRESS']
+    },
+    'COMENTARIOS': {
+        'marca': 'ID',
+        'colunas': ['ID', 'ID_SOLICITACAO', 'ID_USUARIO', 'INTERNO', 'DTHR_CRIACAO', 'DTHR_EDICAO']
+    },
+    'CATEGORIAS': {
+        'marca': None,
+        'colunas': ['ID', 'NOME', 'COR', 'ATIVO']
+    },
+    'PRIORIDADES': {
+        'marca': None,
+        'colunas': ['ID', 'NOME', 'COR', 'PRAZO_HORAS', 'ESCALONAMENTO_HORAS', 'ORDEM', 'ATIVO']
+    },
+    'STATUS': {
+        'marca': None,
+        'colunas': ['ID', 'NOME', 'COR', 'FINALIZADO', 'ORDEM', 'ATIVO']
+    },
+    'USUARIOS': {
+        'marca': None,
+        'colunas': ['ID', 'NOME', 'EMAIL', 'TIPO_USUARIO', 'EMPRESA', 'DEPARTAMENTO', 'ATIVO', 'DTHR_CRIACAO']
+    },
+}
+
+class SnapshotAnalitico:
+    """Exportador incremental para a base analítica"""
+
+    def executar(self):
+        """Executa um ciclo de snapshot e retorna as linhas copiadas por tabela"""
+        resumo = {}
+
+        with analitico_connection() as destino:
+            self._preparar_destino(destino)
+
+            # Uma única conexão (transação SNAPSHOT) garante uma visão consistente
+            # entre as tabelas copiadas no mesmo ciclo.
+            with db_connection() as origem:
+                for tabela, definicao in TABELAS_SNAPSHOT.items():
+                    resumo[tabela] = self._copiar_tabela(origem, destino, tabela, definicao)
+
+        return resumo
+
+    def _preparar_destino(self, destino):
+        """Cria as tabelas da base analítica, se ainda não existirem"""
+        for tabela, definicao in TABELAS_SNAPSHOT.items():
+            colunas = ', '.join(
+                'ID INTEGER PRIMARY KEY' if coluna == 'ID' else coluna
+                for coluna in definicao['colunas']
+            )
+            destino.execute(f"CREATE TABLE IF NOT EXISTS {tabela} ({colunas})")
+
+        destino.execute("""
+            CREATE TABLE IF NOT EXISTS MARCAS_SNAPSHOT (
+                TABELA TEXT PRIMARY KEY,
+                MARCA_DATA TEXT,
+                MARCA_ID INTEGER,
+                DTHR_SNAPSHOT TEXT
+            )
+        """)
+        destino.commit()
+
+    def _copiar_tabela(self, origem, destino, tabela, definicao):
+        """Copia as linhas novas/alteradas de uma tabela em lotes"""
+        colunas = definicao['colunas']
+        marca = definicao['marca']
+        lista_colunas = ', '.join(colunas)
+        marca_data, marca_id = self._ler_marca(destino, tabela)
+
+        cur = origem.cursor()
+        if marca is None:
+            cur.execute(f"SELECT {lista_colunas} FROM {tabela}")
+            destino.execute(f"DELETE FROM {tabela}")
+        elif marca == 'ID':
+            # Relê a folga atrás da marca: o INSERT OR REPLACE torna a releitura idempotente
+            cur.execute(
+                f"SELECT {lista_colunas} FROM {tabela} WHERE ID > ? ORDER BY ID",
+                (max((marca_id or 0) - config.SNAPSHOT_MARGEM_IDS, 0),)
+            )
+        elif marca_data:
+            # Relê a folga atrás da marca: linhas confirmadas depois de outras mais novas
+            cur.execute(f"""
+                SELECT {lista_colunas} FROM {tabela}
+                WHERE {marca} >= ?
+                ORDER BY {marca}, ID
+            """, (marca_data - timedelta(seconds=config.SNAPSHOT_MARGEM_SEGUNDOS),))
+        else:
+            cur.execute(f"SELECT {lista_colunas} FROM {tabela} ORDER BY {marca}, ID")
+
+        insert = f"INSERT OR REPLACE INTO {tabela} ({lista_colunas}) VALUES ({', '.join('?' for _ in colunas)})"
+        indice_id = colunas.index('ID')
+        indice_marca = colunas.index(marca) if marca and marca != 'ID' else None
+        total = 0
+
+        while True:
+            rows = cur.fetchmany(TAMANHO_LOTE)
+            if not rows:
+                break
+
+            destino.executemany(insert, [tuple(self._converter(valor) for valor in row) for row in rows])
+
+            # A marca só avança (a releitura da folga pode terminar antes dela)
+            ultima = rows[-1]
+            if indice_marca is None:
+                marca_id = max(marca_id or 0, ultima[indice_id])
+            elif marca_data is None or (ultima[indice_marca], ultima[indice_id]) > (marca_data, marca_id or 0):
+                marca_data, marca_id = ultima[indice_marca], ultima[indice_id]
+
+            self._gravar_marca(destino, tabela, marca_data, marca_id)
+            destino.commit()
+            total += len(rows)
+
+        if marca is None:
+            self._gravar_marca(destino, tabela, None, None)
+            destino.commit()
+
+        return total
+
+    def _ler_marca(self, destino, tabela):
+        """Lê a marca d'água da última cópia de uma tabela"""
+        cur = destino.cursor()
+        cur.execute("SELECT MARCA_DATA, MARCA_ID FROM MARCAS_SNAPSHOT WHERE TABELA = ?", (tabela,))
+        result = cur.fetchone()
+        if not result:
+            return None, None
+
+        marca_data, marca_id = result
+        return (datetime.fromisoformat(marca_data) if marca_data else None), marca_id
+
+    def _gravar_marca(self, destino, tabela, marca_data, marca_id):
+        """Registra a marca d'água após a cópia de um lote"""
+        destino.execute("""
+            INSERT OR REPLACE INTO MARCAS_SNAPSHOT (TABELA, MARCA_DATA, MARCA_ID, DTHR_SNAPSHOT)
+            VALUES (?, ?, ?, ?)
+        """, (
+            tabela,
+            marca_data.isoformat() if marca_data else None,
+            marca_id,
+            datetime.now().isoformat(sep=' ', timespec='seconds')
+        ))
+
+    def _converter(self, valor):
+        """Converte valores do Firebird para tipos aceitos pelo SQLite"""
+        if isinstance(valor, datetime):
+            return valor.isoformat(sep=' ')
+        if isinstance(valor, date):
+            return valor.isoformat()
+        if isinstance(valor, Decimal):
+            return float(valor)
+        return valor